@@ -51,6 +51,12 @@ class Settings(BaseSettings):
     max_retries: int = Field(3, env="MAX_RETRIES")
     retry_delay: int = Field(5, env="RETRY_DELAY")
 
+    # Database connection pool (ignored for SQLite)
+    db_pool_size: int = Field(10, env="DB_POOL_SIZE")
+    db_max_overflow: int = Field(5, env="DB_MAX_OVERFLOW")
+    db_pool_recycle: int = Field(1800, env="DB_POOL_RECYCLE")
+    db_pool_timeout: int = Field(30, env="DB_POOL_TIMEOUT")
+
     # Health check
     health_check_enabled: bool = Field(True, env="HEALTH_CHECK_ENABLED")
     health_check_port: int = Field(8080, env="HEALTH_CHECK_PORT")
@@ -258,7 +258,7 @@ async def handle_admin_callback(
             # Get vendor's orders from context
             orders = context.bot_data.get('orders')
             if orders:
-                vendor_orders = orders.list_orders_by_vendor(vendor.id)
+                vendor_orders = orders.list_orders_by_vendor(vendor.id, limit=10)
                 if vendor_orders:
                     await query.edit_message_text(
                         "*My Orders*\n\n"
@@ -860,7 +860,7 @@ async def handle_super_admin_callback(
         )
 
     elif action == "pending" and payout:
-        pending = payout.get_pending_payouts()
+        pending = payout.get_pending_payouts(limit=10)
         if not pending:
             await query.edit_message_text(
                 "*Pending Payouts*\n\nNo pending payouts.",
@@ -869,7 +869,7 @@ async def handle_super_admin_callback(
             )
         else:
             lines = []
-            for p in pending[:10]:
+            for p in pending:
                 lines.append(f"Order #{p.order_id}: {p.amount_xmr:.6f} XMR")
             await query.edit_message_text(
                 f"*Pending Payouts*\n\n" + "\n".join(lines),
@@ -156,7 +156,7 @@ async def order(update: Update, context: ContextTypes.DEFAULT_TYPE, orders: Orde
     addr = " ".join(args[2:])
 
     # Create order
-    order_data = orders.create_order(prod_id, qty, addr)
+    order_data = await orders.create_order(prod_id, qty, addr)
 
     # Send payment instructions with buttons
     payment_msg = (
@@ -773,7 +773,7 @@ async def handle_order_callback(update: Update, context: ContextTypes.DEFAULT_TY
         # Get the vendor's postage options
         product = catalog.get_product(product_id)
         if product:
-            postage_types = postage.list_by_vendor(product.vendor_id, active_only=True)
+            postage_types = postage.list_active_for_menu(product.vendor_id)
             if postage_types:
                 await query.edit_message_text(
                     f"*Quantity: {quantity}*\n\n"
@@ -829,7 +829,7 @@ async def handle_order_callback(update: Update, context: ContextTypes.DEFAULT_TY
         if orders and product_id and delivery_address:
             try:
                 # Create order with selected payment currency
-                order_data = orders.create_order(
+                order_data = await orders.create_order(
                     product_id,
                     quantity,
                     delivery_address,
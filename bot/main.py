@@ -21,6 +21,7 @@ from .services.payments import PaymentService
 from .services.vendors import VendorService
 from .services.postage import PostageService
 from .services.payout import PayoutService
+from .services.payment_factory import PaymentServiceFactory
 from .handlers import admin, user
 from .logging_config import setup_logging
 from .error_handler import error_handler
@@ -39,7 +40,13 @@ def build_app() -> Application:
     logger.info(f"Starting bot in {settings.environment} environment")
 
     # Initialize database
-    db = Database(settings.database_url)
+    db = Database(
+        settings.database_url,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_recycle=settings.db_pool_recycle,
+        pool_timeout=settings.db_pool_timeout,
+    )
 
     # Initialize services
     vendors = VendorService(db)
@@ -161,6 +168,9 @@ async def post_init(application: Application) -> None:
     db = application.bot_data["db"]
     asyncio.create_task(start_background_tasks(db))
 
+    # Start payment service background work, e.g. the ETH block watcher
+    await PaymentServiceFactory.start_all()
+
     logger.info("Bot initialization complete")
 
 
@@ -172,6 +182,9 @@ async def post_shutdown(application: Application) -> None:
     health_server = application.bot_data["health_server"]
     await health_server.stop()
 
+    # Close pooled HTTP sessions held by payment services
+    await PaymentServiceFactory.close_all()
+
     logger.info("Bot shutdown complete")
 
 
@@ -3,11 +3,13 @@
 from __future__ import annotations
 
 from decimal import Decimal
-from sqlalchemy import Column, Numeric, BigInteger
-from sqlmodel import Field, SQLModel, create_engine, Session, select
+from sqlalchemy import Column, Index, Numeric, BigInteger
+from sqlalchemy.orm import relationship
+from sqlmodel import Field, Relationship, SQLModel, create_engine, Session, select
 from typing import Optional, List
 from datetime import datetime
 import base64
+from functools import lru_cache
 from nacl import secret
 
 
@@ -23,6 +25,10 @@ class PlatformSettings(SQLModel, table=True):
 class Payout(SQLModel, table=True):
     """Track payouts to vendors."""
 
+    __table_args__ = (
+        Index("ix_payout_status", "status"),  # Pending payout scans, stats
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
     order_id: int = Field(foreign_key="order.id")
     vendor_id: int = Field(foreign_key="vendor.id")
@@ -38,6 +44,10 @@ class Payout(SQLModel, table=True):
 class PostageType(SQLModel, table=True):
     """Postage/shipping option for vendors."""
 
+    __table_args__ = (
+        Index("ix_postage_vendor_active", "vendor_id", "is_active"),  # Checkout postage menus
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
     vendor_id: int = Field(foreign_key="vendor.id")
     name: str  # e.g., "Standard", "Express", "Next Day"
@@ -85,6 +95,12 @@ class Vendor(SQLModel, table=True):
 class Order(SQLModel, table=True):
     """Customer order."""
 
+    __table_args__ = (
+        Index("ix_orders_state_created", "state", "created_at"),  # Pending scans, state filters
+        Index("ix_orders_vendor_created", "vendor_id", "created_at"),  # Vendor order lists
+        Index("ix_orders_created", "created_at"),  # Retention purge, unfiltered order lists
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
     product_id: int = Field(foreign_key="product.id")
     vendor_id: int = Field(foreign_key="vendor.id")
@@ -107,12 +123,34 @@ class Order(SQLModel, table=True):
     shipping_note: Optional[str] = None  # Vendor note when marking shipped
     created_at: datetime = Field(default_factory=datetime.utcnow)
 
+    # Relationships, for eager loading alongside the order
+    product: Optional[Product] = Relationship(sa_relationship=relationship(Product))
+    vendor: Optional[Vendor] = Relationship(sa_relationship=relationship(Vendor))
+
 
 class Database:
     """Database wrapper."""
 
-    def __init__(self, url: str = "sqlite:///db.sqlite3") -> None:
-        self.engine = create_engine(url, echo=False)
+    def __init__(
+        self,
+        url: str = "sqlite:///db.sqlite3",
+        pool_size: int = 10,
+        max_overflow: int = 5,
+        pool_recycle: int = 1800,
+        pool_timeout: int = 30,
+    ) -> None:
+        pool_options = {}
+        if not url.startswith("sqlite"):
+            # Server databases get a sized connection pool; SQLite keeps
+            # SQLAlchemy's per-file defaults
+            pool_options = {
+                "pool_size": pool_size,
+                "max_overflow": max_overflow,
+                "pool_recycle": pool_recycle,
+                "pool_timeout": pool_timeout,
+                "pool_pre_ping": False,
+            }
+        self.engine = create_engine(url, echo=False, **pool_options)
         SQLModel.metadata.create_all(self.engine)
         self._run_migrations()
 
@@ -190,20 +228,33 @@ class Database:
                         pass  # Column may already exist
                 conn.commit()
 
+        # create_all() skips indexes on tables that already existed
+        for model in (Order, PostageType, Payout):
+            for index in model.__table__.indexes:
+                index.create(self.engine, checkfirst=True)
+
     def session(self) -> Session:
-        """Create a new session."""
-        return Session(self.engine)
+        """Create a new session.
+
+        Objects keep their loaded attributes after commit, so services can
+        return them once the session has closed.
+        """
+        return Session(self.engine, expire_on_commit=False)
+
+
+@lru_cache(maxsize=16)
+def _get_box(key: str) -> secret.SecretBox:
+    """Get the SecretBox for a base64 key."""
+    return secret.SecretBox(base64.b64decode(key))
 
 
 def encrypt(plain: str, key: str) -> str:
     """Encrypt text with base64 key."""
-    box = secret.SecretBox(base64.b64decode(key))
-    encrypted = box.encrypt(plain.encode())
+    encrypted = _get_box(key).encrypt(plain.encode())
     return base64.b64encode(encrypted).decode()
 
 
 def decrypt(ciphertext: str, key: str) -> str:
     """Decrypt text with base64 key."""
-    box = secret.SecretBox(base64.b64decode(key))
-    decrypted = box.decrypt(base64.b64decode(ciphertext))
+    decrypted = _get_box(key).decrypt(base64.b64decode(ciphertext))
     return decrypted.decode()
@@ -7,6 +7,7 @@ from enum import Enum
 from typing import Optional
 from uuid import uuid4
 
+from sqlalchemy import Index
 from sqlmodel import SQLModel, Field, Relationship
 
 
@@ -102,6 +103,10 @@ class TenantProduct(SQLModel, table=True):
 class TenantOrder(SQLModel, table=True):
     """Order scoped to a tenant with multi-crypto support."""
     __tablename__ = "tenant_orders"
+    __table_args__ = (
+        Index("ix_tenant_orders_state_created", "state", "created_at"),  # Pending swap scans
+        Index("ix_tenant_order_state_swap", "tenant_id", "state", "swap_id"),  # Tenant lookups
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
     tenant_id: str = Field(foreign_key="tenants.id", index=True)
@@ -203,6 +208,9 @@ class MultiTenantDatabase:
     def __init__(self, database_url: str = "sqlite:///darkpool.db"):
         self.engine = create_engine(database_url)
         SQLModel.metadata.create_all(self.engine)
+        # create_all() skips indexes on tables that already existed
+        for index in TenantOrder.__table__.indexes:
+            index.create(self.engine, checkfirst=True)
 
     def get_session(self) -> Session:
         """Get a new database session."""
@@ -476,6 +484,40 @@ class MultiTenantDatabase:
             session.refresh(order)
             return order
 
+    def cancel_order(self, order_id: int, tenant_id: str) -> Optional[TenantOrder]:
+        """
+        Cancel an order and restore its product inventory in one transaction.
+
+        Inventory is only restored by the call that actually moves the order
+        to CANCELLED, so repeated or concurrent cancels restock once.
+        """
+        from sqlmodel import select, update
+        with self.get_session() as session:
+            result = session.execute(
+                update(TenantOrder).where(
+                    TenantOrder.id == order_id,
+                    TenantOrder.tenant_id == tenant_id,
+                    TenantOrder.state != OrderState.CANCELLED
+                ).values(state=OrderState.CANCELLED)
+            )
+            statement = select(TenantOrder).where(
+                TenantOrder.id == order_id,
+                TenantOrder.tenant_id == tenant_id
+            )
+            order = session.exec(statement).first()
+            if not order:
+                return None
+            if result.rowcount == 1 and order.product_id:
+                session.execute(
+                    update(TenantProduct).where(
+                        TenantProduct.id == order.product_id,
+                        TenantProduct.tenant_id == tenant_id
+                    ).values(inventory=TenantProduct.inventory + order.quantity)
+                )
+            session.commit()
+            session.refresh(order)
+            return order
+
     def update_order_swap_status(
         self,
         order_id: int,
@@ -497,6 +539,40 @@ class MultiTenantDatabase:
             session.refresh(order)
             return order
 
+    def bulk_update_swap_status(
+        self,
+        updates: list[tuple[int, SwapState]]
+    ) -> int:
+        """
+        Update swap status for many orders in one transaction.
+
+        Issues one UPDATE per distinct status, applying the same order
+        state changes as update_order_swap_status. Returns rows updated.
+        """
+        from sqlmodel import update
+
+        by_status: dict[SwapState, list[int]] = {}
+        for order_id, swap_status in updates:
+            by_status.setdefault(swap_status, []).append(order_id)
+        if not by_status:
+            return 0
+
+        now = datetime.utcnow()
+        updated = 0
+        with self.get_session() as session:
+            for swap_status, order_ids in by_status.items():
+                values = {"swap_status": swap_status}
+                if swap_status == SwapState.COMPLETE:
+                    values.update(state=OrderState.PAID, paid_at=now)
+                elif swap_status in [SwapState.FAILED, SwapState.EXPIRED]:
+                    values["state"] = OrderState.CANCELLED
+                statement = update(TenantOrder).where(
+                    TenantOrder.id.in_(order_ids)
+                ).values(**values)
+                updated += session.execute(statement).rowcount
+            session.commit()
+        return updated
+
     # Commission operations
     def create_commission_invoice(
         self,
@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-import uuid
+import secrets
 import logging
 import re
 from typing import Tuple, Optional
@@ -82,7 +82,7 @@ class BitcoinPaymentService:
         if not vendor_wallet:
             if self.settings.environment == "development":
                 # Mock address for testing
-                payment_id = uuid.uuid4().hex[:16]
+                payment_id = secrets.token_hex(8)
                 mock_address = f"1{payment_id}MockBitcoinAddr"
                 logger.warning("Using mock BTC address (development mode)")
                 return mock_address, payment_id
@@ -93,7 +93,7 @@ class BitcoinPaymentService:
             raise InvalidAddressError(f"Invalid Bitcoin address: {vendor_wallet}")
 
         # Generate unique payment ID for tracking
-        payment_id = uuid.uuid4().hex[:16]
+        payment_id = secrets.token_hex(8)
 
         logger.info(f"Created BTC payment address: {vendor_wallet} (ID: {payment_id})")
         return vendor_wallet, payment_id
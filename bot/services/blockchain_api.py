@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import time
 from decimal import Decimal
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional
@@ -54,17 +55,15 @@ class BlockchainAPI:
 
     def __init__(self, api_key: Optional[str] = None):
         self.api_key = api_key
-        self._last_request_time = None
+        self._last_request_time: float = float("-inf")  # monotonic seconds
 
     async def _wait_for_rate_limit(self):
         """Enforce rate limiting."""
-        if self._last_request_time:
-            elapsed = (datetime.utcnow() - self._last_request_time).total_seconds()
-            if elapsed < self.RATE_LIMIT_DELAY:
-                wait_time = self.RATE_LIMIT_DELAY - elapsed
-                logger.debug(f"Rate limit: waiting {wait_time:.1f}s")
-                await asyncio.sleep(wait_time)
-        self._last_request_time = datetime.utcnow()
+        wait_time = self.RATE_LIMIT_DELAY - (time.monotonic() - self._last_request_time)
+        if wait_time > 0:
+            logger.debug(f"Rate limit: waiting {wait_time:.1f}s")
+            await asyncio.sleep(wait_time)
+        self._last_request_time = time.monotonic()
 
     async def get_address_transactions(
         self,
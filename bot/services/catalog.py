@@ -18,7 +18,6 @@ class CatalogService:
         with self.db.session() as session:
             session.add(product)
             session.commit()
-            session.refresh(product)
             return product
 
     def get_product(self, product_id: int) -> Product | None:
@@ -35,7 +34,6 @@ class CatalogService:
             if isinstance(product_or_id, Product):
                 session.add(product_or_id)
                 session.commit()
-                session.refresh(product_or_id)
                 return product_or_id
             else:
                 # product_id with kwargs
@@ -44,7 +42,6 @@ class CatalogService:
                     for key, value in kwargs.items():
                         setattr(product, key, value)
                     session.commit()
-                    session.refresh(product)
                     return product
                 return None
 
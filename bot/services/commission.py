@@ -1,5 +1,6 @@
 """Commission tracking and invoicing service."""
 
+import json
 import logging
 import secrets
 from datetime import datetime, date, timedelta
@@ -98,7 +99,7 @@ class CommissionService:
         self.db.log_action(
             action="invoice_generated",
             tenant_id=tenant_id,
-            details=f'{{"invoice_id": {invoice.id}, "amount": "{commission_due}"}}'
+            details=json.dumps({"invoice_id": invoice.id, "amount": str(commission_due)})
         )
 
         return invoice
@@ -139,7 +140,7 @@ class CommissionService:
             self.db.log_action(
                 action="invoice_paid",
                 tenant_id=invoice.tenant_id,
-                details=f'{{"invoice_id": {invoice_id}, "amount": "{received_amount}"}}'
+                details=json.dumps({"invoice_id": invoice_id, "amount": str(received_amount)})
             )
             logger.info(f"Invoice {invoice_id} marked as paid")
             return True
@@ -176,7 +177,7 @@ class CommissionService:
                 self.db.log_action(
                     action="tenant_terminated_nonpayment",
                     tenant_id=invoice.tenant_id,
-                    details=f'{{"invoice_id": {invoice.id}, "days_overdue": {days_overdue}}}'
+                    details=json.dumps({"invoice_id": invoice.id, "days_overdue": days_overdue})
                 )
                 logger.error(
                     f"Tenant {invoice.tenant_id} terminated for non-payment"
@@ -189,7 +190,7 @@ class CommissionService:
                 self.db.log_action(
                     action="tenant_suspended_nonpayment",
                     tenant_id=invoice.tenant_id,
-                    details=f'{{"invoice_id": {invoice.id}, "days_overdue": {days_overdue}}}'
+                    details=json.dumps({"invoice_id": invoice.id, "days_overdue": days_overdue})
                 )
                 logger.warning(
                     f"Tenant {invoice.tenant_id} suspended for non-payment"
@@ -211,7 +212,7 @@ class CommissionService:
             self.db.log_action(
                 action="invoice_waived",
                 tenant_id=invoice.tenant_id,
-                details=f'{{"invoice_id": {invoice_id}, "reason": "{reason}"}}'
+                details=json.dumps({"invoice_id": invoice_id, "reason": reason})
             )
             logger.info(f"Invoice {invoice_id} waived: {reason}")
             return True
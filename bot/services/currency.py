@@ -1,7 +1,8 @@
 """Currency conversion service for fiat to crypto.
 
 Uses CoinGecko API for accurate real-time exchange rates.
-Critical: All order conversions use fresh rates, not cached.
+Critical: Order conversions use rates at most ORDER_RATE_TTL old,
+never the longer-lived display cache.
 Uses Decimal for precision - never use float for money.
 """
 
@@ -9,10 +10,14 @@ from __future__ import annotations
 
 import asyncio
 import aiohttp
+import json
 import logging
 from decimal import Decimal, ROUND_DOWN, ROUND_HALF_UP
-from datetime import datetime, timedelta
-from typing import Optional, Union
+import time
+from datetime import timedelta
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Mapping, Optional, Union
 
 logger = logging.getLogger(__name__)
 
@@ -29,16 +34,101 @@ CRYPTO_PRECISION = {
     "ETH": Decimal("0.000001"),  # Use 6 decimals for ETH (more practical)
 }
 
-# Cache for display purposes only (not for order conversion)
-_display_cache: dict = {}
-_display_cache_time: Optional[datetime] = None
-DISPLAY_CACHE_DURATION = timedelta(minutes=5)
+# Currency codes accepted by the conversion functions
+_SUPPORTED_FIAT = frozenset({"USD", "GBP", "EUR"})
+_SUPPORTED_CRYPTO = frozenset({"XMR", "BTC", "ETH"})
+
+# Decimal places per crypto, precomputed from CRYPTO_PRECISION for the hot path
+XMR_PLACES = -XMR_PRECISION.as_tuple().exponent
+CRYPTO_PLACES = {
+    code: -precision.as_tuple().exponent for code, precision in CRYPTO_PRECISION.items()
+}
+
+
+def _divide_down(amount: Decimal, price: Decimal, places: int) -> Decimal:
+    """Divide amount by price, truncated to the given decimal places, using integer math.
+
+    Equivalent to (amount / price).quantize(Decimal(10) ** -places, rounding=ROUND_DOWN)
+    but exact and without going through a Decimal division.
+    """
+    amount_num, amount_den = amount.as_integer_ratio()
+    price_num, price_den = price.as_integer_ratio()
+    atomic = (amount_num * price_den * 10 ** places) // (amount_den * price_num)
+    return Decimal(atomic).scaleb(-places)
+
+
+BPS_PLACES = 4  # Commission rates are stored with 4 decimal places (basis points)
+BPS_SCALE = 10 ** BPS_PLACES
+
+
+def to_atomic(amount: Decimal, places: int) -> int:
+    """Convert an amount to integer atomic units, truncated to the given decimal places.
+
+    Args:
+        amount: Non-negative amount to convert
+        places: Decimal places of one atomic unit (8 for XMR as stored)
+
+    Returns:
+        Amount as an integer count of atomic units
+    """
+    num, den = amount.as_integer_ratio()
+    return (num * 10 ** places) // den
+
+
+def from_atomic(units: int, places: int) -> Decimal:
+    """Convert integer atomic units back to a Decimal amount."""
+    return Decimal(units).scaleb(-places)
+
+
+def apply_rate_atomic(units: int, rate_bps: int) -> int:
+    """Apply a basis-point rate to an atomic amount, rounding down."""
+    return units * rate_bps // BPS_SCALE
+
+
+# CoinGecko ids and fiat keys mapped to our currency codes
+_COINGECKO_IDS = (("monero", "XMR"), ("bitcoin", "BTC"), ("ethereum", "ETH"))
+_FIAT = (("usd", "USD"), ("gbp", "GBP"), ("eur", "EUR"))
+
+# CoinGecko request timeout; sock_read bounds a slow upstream separately
+COINGECKO_TIMEOUT = aiohttp.ClientTimeout(total=15, sock_connect=5, sock_read=10)
 
 
-async def fetch_xmr_rates() -> dict[str, Decimal]:
+def _parse_fiat_rates(coin_data: dict) -> Mapping[str, Decimal]:
+    """Parse one coin's CoinGecko prices into read-only Decimal rates keyed by fiat code."""
+    return MappingProxyType(
+        {fiat_code: Decimal(str(coin_data[fiat_cg])) for fiat_cg, fiat_code in _FIAT}
+    )
+
+
+# Cache for display purposes only (not for order conversion)
+_display_cache: Mapping[str, Decimal] = {}
+_display_cache_time: float = 0.0  # time.monotonic() of last update, 0.0 if never
+DISPLAY_CACHE_DURATION = timedelta(minutes=5)
+# Stale rates are still served (while refreshing in background) up to this age
+DISPLAY_CACHE_STALE_MAX = timedelta(minutes=30)
+_display_refresh_task: Optional[asyncio.Task] = None
+# Guards against concurrent refreshes hitting CoinGecko at the same time
+DISPLAY_CACHE_MIN_REFRESH = timedelta(seconds=30)
+_display_cache_lock = asyncio.Lock()
+# TTLs in seconds, compared against time.monotonic()
+_DISPLAY_CACHE_DURATION_S = DISPLAY_CACHE_DURATION.total_seconds()
+_DISPLAY_CACHE_STALE_MAX_S = DISPLAY_CACHE_STALE_MAX.total_seconds()
+_DISPLAY_CACHE_MIN_REFRESH_S = DISPLAY_CACHE_MIN_REFRESH.total_seconds()
+
+# Rates for order conversion, shared by the conversions of one order and
+# by orders placed close together so each doesn't hit CoinGecko
+ORDER_RATE_TTL = timedelta(seconds=60)
+_ORDER_RATE_TTL_S = ORDER_RATE_TTL.total_seconds()
+_order_rates: Optional[Mapping[str, Mapping[str, Decimal]]] = None
+_order_rates_time: float = 0.0  # time.monotonic() of last fetch
+# Concurrent conversions that miss the cache share a single fetch
+_order_rates_lock = asyncio.Lock()
+
+
+async def fetch_xmr_rates() -> Mapping[str, Decimal]:
     """Fetch current XMR exchange rates from CoinGecko.
 
-    Returns dict with rates: {"USD": Decimal("150.0"), ...}
+    Returns a read-only mapping with rates: {"USD": Decimal("150.0"), ...}
     Raises ValueError if rates cannot be fetched.
     """
     try:
@@ -49,17 +139,16 @@ async def fetch_xmr_rates() -> dict[str, Decimal]:
                 "vs_currencies": "usd,gbp,eur",
                 "precision": 8
             }
-            async with session.get(url, params=params, timeout=15) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    if "monero" in data:
-                        # Use Decimal for precise rate storage
-                        return {
-                            "USD": Decimal(str(data["monero"]["usd"])),
-                            "GBP": Decimal(str(data["monero"]["gbp"])),
-                            "EUR": Decimal(str(data["monero"]["eur"])),
-                        }
+            async with session.get(url, params=params, timeout=COINGECKO_TIMEOUT) as response:
+                response.raise_for_status()
+                data = json.loads(await response.read())
+                if "monero" in data:
+                    # Use Decimal for precise rate storage
+                    return _parse_fiat_rates(data["monero"])
                 raise ValueError(f"Invalid response from CoinGecko: {response.status}")
+    except aiohttp.ClientResponseError as e:
+        logger.error(f"CoinGecko returned HTTP {e.status} for XMR rates")
+        raise ValueError(f"Invalid response from CoinGecko: {e.status}")
     except aiohttp.ClientError as e:
         logger.error(f"Network error fetching XMR rates: {e}")
         raise ValueError(f"Failed to fetch exchange rates: {e}")
@@ -68,10 +157,10 @@ async def fetch_xmr_rates() -> dict[str, Decimal]:
         raise ValueError(f"Failed to fetch exchange rates: {e}")
 
 
-async def fetch_crypto_rates() -> dict[str, dict[str, Decimal]]:
+async def fetch_crypto_rates() -> Mapping[str, Mapping[str, Decimal]]:
     """Fetch current exchange rates for all supported cryptocurrencies from CoinGecko.
 
-    Returns dict with structure:
+    Returns a read-only mapping (safe to share between callers) with structure:
     {
         "XMR": {"USD": Decimal("150.0"), "GBP": Decimal("118.5"), "EUR": Decimal("138.0")},
         "BTC": {"USD": Decimal("45000.0"), ...},
@@ -84,43 +173,27 @@ async def fetch_crypto_rates() -> dict[str, dict[str, Decimal]]:
         async with aiohttp.ClientSession() as session:
             url = "https://api.coingecko.com/api/v3/simple/price"
             params = {
-                "ids": "monero,bitcoin,ethereum",
-                "vs_currencies": "usd,gbp,eur",
+                "ids": ",".join(cg for cg, _ in _COINGECKO_IDS),
+                "vs_currencies": ",".join(fiat_cg for fiat_cg, _ in _FIAT),
                 "precision": 8
             }
-            async with session.get(url, params=params, timeout=15) as response:
-                if response.status == 200:
-                    data = await response.json()
-
-                    rates = {}
-
-                    if "monero" in data:
-                        rates["XMR"] = {
-                            "USD": Decimal(str(data["monero"]["usd"])),
-                            "GBP": Decimal(str(data["monero"]["gbp"])),
-                            "EUR": Decimal(str(data["monero"]["eur"])),
-                        }
-
-                    if "bitcoin" in data:
-                        rates["BTC"] = {
-                            "USD": Decimal(str(data["bitcoin"]["usd"])),
-                            "GBP": Decimal(str(data["bitcoin"]["gbp"])),
-                            "EUR": Decimal(str(data["bitcoin"]["eur"])),
-                        }
-
-                    if "ethereum" in data:
-                        rates["ETH"] = {
-                            "USD": Decimal(str(data["ethereum"]["usd"])),
-                            "GBP": Decimal(str(data["ethereum"]["gbp"])),
-                            "EUR": Decimal(str(data["ethereum"]["eur"])),
-                        }
-
-                    if len(rates) != 3:
-                        raise ValueError(f"Incomplete rates data: {list(rates.keys())}")
-
-                    return rates
-
-                raise ValueError(f"Invalid response from CoinGecko: {response.status}")
+            async with session.get(url, params=params, timeout=COINGECKO_TIMEOUT) as response:
+                response.raise_for_status()
+                data = json.loads(await response.read())
+
+                rates = {
+                    code: _parse_fiat_rates(data[cg])
+                    for cg, code in _COINGECKO_IDS
+                    if cg in data
+                }
+
+                if len(rates) != len(_COINGECKO_IDS):
+                    raise ValueError(f"Incomplete rates data: {list(rates.keys())}")
+
+                return MappingProxyType(rates)
+    except aiohttp.ClientResponseError as e:
+        logger.error(f"CoinGecko returned HTTP {e.status} for crypto rates")
+        raise ValueError(f"Invalid response from CoinGecko: {e.status}")
     except aiohttp.ClientError as e:
         logger.error(f"Network error fetching crypto rates: {e}")
         raise ValueError(f"Failed to fetch exchange rates: {e}")
@@ -129,6 +202,33 @@ async def fetch_crypto_rates() -> dict[str, dict[str, Decimal]]:
         raise ValueError(f"Failed to fetch exchange rates: {e}")
 
 
+async def get_order_rates() -> Mapping[str, Mapping[str, Decimal]]:
+    """Get crypto rates for order conversion, refetching once ORDER_RATE_TTL has passed.
+
+    Concurrent callers that miss the cache wait for one shared fetch.
+    Failed fetches are not cached.
+    Raises ValueError if rates cannot be fetched.
+    """
+    global _order_rates, _order_rates_time
+    if _order_rates is not None and time.monotonic() - _order_rates_time < _ORDER_RATE_TTL_S:
+        return _order_rates
+
+    async with _order_rates_lock:
+        # Another caller may have fetched while we waited for the lock
+        if _order_rates is not None and time.monotonic() - _order_rates_time < _ORDER_RATE_TTL_S:
+            return _order_rates
+
+        rates = await fetch_crypto_rates()
+        _order_rates, _order_rates_time = rates, time.monotonic()
+        return rates
+
+
+def clear_order_rate_cache() -> None:
+    """Drop cached order rates so the next conversion fetches fresh ones."""
+    global _order_rates, _order_rates_time
+    _order_rates, _order_rates_time = None, 0.0
+
+
 async def get_xmr_price(currency: str) -> Decimal:
     """Get current XMR price in specified fiat currency.
 
@@ -165,42 +265,8 @@ async def fiat_to_xmr_accurate(amount: Union[float, Decimal, str], currency: str
     if xmr_price <= 0:
         raise ValueError("Invalid exchange rate")
 
-    xmr_amount = amount_decimal / xmr_price
     # Round down to 8 decimal places (XMR precision) - always round in favor of platform
-    return xmr_amount.quantize(XMR_PRECISION, rounding=ROUND_DOWN)
-
-
-def fiat_to_xmr_sync(amount: Union[float, Decimal, str], currency: str) -> Decimal:
-    """Synchronous wrapper for fiat_to_xmr_accurate.
-
-    Uses cached rate if available, otherwise runs async conversion.
-    For use in non-async contexts where accuracy is still needed.
-    """
-    # Try cached first
-    cached = fiat_to_xmr_cached(amount, currency)
-    if cached is not None:
-        return cached
-
-    # Fall back to running the async function
-    try:
-        loop = asyncio.get_event_loop()
-        if loop.is_running():
-            # We're in an async context, create a task
-            # For now, use a default rate if cache unavailable
-            amount_decimal = Decimal(str(amount)) if not isinstance(amount, Decimal) else amount
-            if currency == "XMR":
-                return amount_decimal.quantize(XMR_PRECISION, rounding=ROUND_DOWN)
-            # Use a reasonable default XMR price (will be updated when cache refreshes)
-            default_xmr_price = Decimal("150")  # Approximate USD price
-            rate_multipliers = {"USD": Decimal("1"), "GBP": Decimal("0.79"), "EUR": Decimal("0.92")}
-            multiplier = rate_multipliers.get(currency, Decimal("1"))
-            estimated_rate = default_xmr_price * multiplier
-            return (amount_decimal / estimated_rate).quantize(XMR_PRECISION, rounding=ROUND_DOWN)
-        else:
-            return loop.run_until_complete(fiat_to_xmr_accurate(amount, currency))
-    except RuntimeError:
-        # No event loop, create one
-        return asyncio.run(fiat_to_xmr_accurate(amount, currency))
+    return _divide_down(amount_decimal, xmr_price, XMR_PLACES)
 
 
 async def xmr_to_fiat_accurate(amount: Union[float, Decimal, str], currency: str) -> Decimal:
@@ -230,9 +296,9 @@ async def fiat_to_crypto(
     fiat_currency: str,
     crypto_currency: str
 ) -> Decimal:
-    """Convert fiat amount to any supported cryptocurrency with fresh exchange rate.
+    """Convert fiat amount to any supported cryptocurrency with a current exchange rate.
 
-    CRITICAL: Use this for order creation - fetches live rates.
+    CRITICAL: Use this for order creation - rates are at most ORDER_RATE_TTL old.
     Supports BTC, ETH, and XMR.
     Uses Decimal for precision - no floating point errors.
     Raises ValueError if conversion fails.
@@ -257,17 +323,17 @@ async def fiat_to_crypto(
     crypto_currency = crypto_currency.upper()
 
     # Validate currencies
-    if fiat_currency not in ["USD", "GBP", "EUR"]:
+    if fiat_currency not in _SUPPORTED_FIAT:
         raise ValueError(f"Unsupported fiat currency: {fiat_currency}")
 
-    if crypto_currency not in ["XMR", "BTC", "ETH"]:
+    if crypto_currency not in _SUPPORTED_CRYPTO:
         raise ValueError(f"Unsupported crypto currency: {crypto_currency}")
 
     if amount_decimal <= 0:
         raise ValueError("Amount must be positive")
 
-    # Fetch all crypto rates
-    rates = await fetch_crypto_rates()
+    # Crypto rates, shared across conversions within ORDER_RATE_TTL
+    rates = await get_order_rates()
 
     if crypto_currency not in rates:
         raise ValueError(f"Rates not available for {crypto_currency}")
@@ -280,14 +346,8 @@ async def fiat_to_crypto(
     if crypto_price <= 0:
         raise ValueError("Invalid exchange rate")
 
-    # Calculate crypto amount
-    crypto_amount = amount_decimal / crypto_price
-
-    # Get appropriate precision for this crypto
-    precision = CRYPTO_PRECISION.get(crypto_currency, XMR_PRECISION)
-
-    # Round down to appropriate precision (always round in favor of platform)
-    return crypto_amount.quantize(precision, rounding=ROUND_DOWN)
+    # Round down to this crypto's precision (always round in favor of platform)
+    return _divide_down(amount_decimal, crypto_price, CRYPTO_PLACES[crypto_currency])
 
 
 async def crypto_to_fiat(
@@ -322,10 +382,10 @@ async def crypto_to_fiat(
     fiat_currency = fiat_currency.upper()
 
     # Validate currencies
-    if crypto_currency not in ["XMR", "BTC", "ETH"]:
+    if crypto_currency not in _SUPPORTED_CRYPTO:
         raise ValueError(f"Unsupported crypto currency: {crypto_currency}")
 
-    if fiat_currency not in ["USD", "GBP", "EUR"]:
+    if fiat_currency not in _SUPPORTED_FIAT:
         raise ValueError(f"Unsupported fiat currency: {fiat_currency}")
 
     if amount_decimal <= 0:
@@ -347,30 +407,52 @@ async def crypto_to_fiat(
 
 
 async def update_display_cache() -> None:
-    """Update the display cache with fresh rates."""
+    """Update the display cache with fresh rates.
+
+    Concurrent refreshes are serialised and skipped if the cache was
+    updated within DISPLAY_CACHE_MIN_REFRESH.
+    """
     global _display_cache, _display_cache_time
+    async with _display_cache_lock:
+        if _display_cache_time and time.monotonic() - _display_cache_time < _DISPLAY_CACHE_MIN_REFRESH_S:
+            return
+        try:
+            rates = await fetch_xmr_rates()
+            _display_cache = rates
+            _display_cache_time = time.monotonic()
+            logger.info(f"Updated exchange rate cache: {rates}")
+        except Exception as e:
+            logger.warning(f"Failed to update display cache: {e}")
+
+
+def _schedule_display_refresh() -> None:
+    """Refresh the display cache in the background, at most one refresh at a time."""
+    global _display_refresh_task
+    if _display_refresh_task is not None and not _display_refresh_task.done():
+        return
     try:
-        rates = await fetch_xmr_rates()
-        _display_cache = rates
-        _display_cache_time = datetime.utcnow()
-        logger.info(f"Updated exchange rate cache: {rates}")
-    except Exception as e:
-        logger.warning(f"Failed to update display cache: {e}")
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return
+    _display_refresh_task = loop.create_task(update_display_cache())
 
 
 def get_cached_rate(currency: str) -> Optional[Decimal]:
     """Get cached rate for display purposes only.
 
     WARNING: Do NOT use for order conversion - use fiat_to_xmr_accurate instead.
-    Returns None if no cache available.
+    Serves a stale rate while a background refresh runs once the cache is
+    older than DISPLAY_CACHE_DURATION. Returns None if no usable cache.
     """
     if currency == "XMR":
         return Decimal("1")
 
-    # Check if cache is still valid
-    if _display_cache_time:
-        age = datetime.utcnow() - _display_cache_time
-        if age < DISPLAY_CACHE_DURATION and currency in _display_cache:
+    if _display_cache_time and currency in _display_cache:
+        age = time.monotonic() - _display_cache_time
+        if age < _DISPLAY_CACHE_DURATION_S:
+            return _display_cache[currency]
+        if age < _DISPLAY_CACHE_STALE_MAX_S:
+            _schedule_display_refresh()
             return _display_cache[currency]
 
     return None
@@ -391,7 +473,7 @@ def fiat_to_xmr_cached(amount: Union[float, Decimal, str], currency: str) -> Opt
     if rate is None:
         return None
 
-    return (amount_decimal / rate).quantize(XMR_PRECISION, rounding=ROUND_DOWN)
+    return _divide_down(amount_decimal, rate, XMR_PLACES)
 
 
 def get_currency_symbol(currency: str) -> str:
@@ -409,8 +491,13 @@ def get_currency_symbol(currency: str) -> str:
 
 def format_price(amount: Union[float, Decimal, str], currency: str) -> str:
     """Format price with currency symbol."""
+    return _format_price_cached(amount if isinstance(amount, str) else str(amount), currency)
+
+
+@lru_cache(maxsize=2048)
+def _format_price_cached(amount_str: str, currency: str) -> str:
     # Convert to Decimal for consistent formatting
-    amount_decimal = Decimal(str(amount)) if not isinstance(amount, Decimal) else amount
+    amount_decimal = Decimal(amount_str)
     symbol = get_currency_symbol(currency)
 
     # Crypto currencies need different formatting
@@ -433,12 +520,17 @@ def format_price(amount: Union[float, Decimal, str], currency: str) -> str:
 
 def format_price_simple(amount: Union[float, Decimal, str], currency: str) -> str:
     """Format price simply for display."""
+    return _format_price_simple_cached(amount if isinstance(amount, str) else str(amount), currency)
+
+
+@lru_cache(maxsize=2048)
+def _format_price_simple_cached(amount_str: str, currency: str) -> str:
     # Convert to Decimal for consistent formatting
-    amount_decimal = Decimal(str(amount)) if not isinstance(amount, Decimal) else amount
+    amount_decimal = Decimal(amount_str)
     symbol = get_currency_symbol(currency)
 
     # Crypto currencies
-    if currency in ["XMR", "BTC", "ETH"]:
+    if currency in _SUPPORTED_CRYPTO:
         return f"{amount_decimal} {symbol}"
 
     # Fiat currencies
@@ -2,12 +2,14 @@
 
 from __future__ import annotations
 
-import uuid
+import time
+import secrets
 import logging
-import re
-from typing import Tuple, Optional
+from typing import Dict, Tuple, Optional
 from decimal import Decimal
-from datetime import datetime
+from datetime import datetime, timedelta
+
+from monero.keccak import keccak_256
 
 from ..config import get_settings
 from .payment_protocol import (
@@ -16,10 +18,12 @@ from .payment_protocol import (
     InvalidAddressError,
     PaymentError
 )
-from .etherscan_api import EtherscanAPI, EtherscanAPIError
+from .etherscan_api import AMOUNT_TOLERANCE_WEI, EtherscanAPI, EtherscanAPIError
 
 logger = logging.getLogger(__name__)
 
+_HEX_DIGITS = frozenset("0123456789abcdefABCDEF")
+
 
 class EthereumPaymentService:
     """
@@ -32,8 +36,14 @@ class EthereumPaymentService:
     # Confirmation threshold for considering payment complete
     CONFIRMATION_THRESHOLD = 12
 
-    # Amount tolerance for matching (0.001 ETH ~= $3 at $3k/ETH)
-    AMOUNT_TOLERANCE = Decimal("0.001")
+    # Amount tolerance for matching in Wei (0.001 ETH ~= $3 at $3k/ETH)
+    AMOUNT_TOLERANCE_WEI = AMOUNT_TOLERANCE_WEI
+
+    # Seconds a batched confirmations lookup is reused by other payments
+    CONFIRMATIONS_CACHE_TTL = 5.0
+
+    # Found payments older than this are dropped from the payment cache
+    PAYMENT_CACHE_MAX_AGE = timedelta(hours=48)
 
     def __init__(self):
         self.settings = get_settings()
@@ -46,6 +56,7 @@ class EthereumPaymentService:
             infura_project_id=self.settings.infura_project_id
         )
         self._payment_cache = {}  # Cache {payment_id: (address, amount, created_at, tx)}
+        self._confirmations: Dict[str, Tuple[float, int]] = {}  # {tx_hash: (monotonic, confs)}
 
     @staticmethod
     def validate_address(address: str) -> bool:
@@ -59,10 +70,11 @@ class EthereumPaymentService:
             True if valid format
         """
         # Basic format check (0x followed by 40 hex characters)
-        if not re.match(r'^0x[a-fA-F0-9]{40}$', address):
-            return False
-
-        return True
+        return (
+            len(address) == 42
+            and address.startswith("0x")
+            and _HEX_DIGITS.issuperset(address[2:])
+        )
 
     @staticmethod
     def to_checksum_address(address: str) -> str:
@@ -76,13 +88,17 @@ class EthereumPaymentService:
             Checksummed address
 
         Note:
-            Simplified implementation. For production, use web3.py's toChecksumAddress
+            Keccak-256 comes from the monero package's C-backed implementation
+            (pycryptodomex).
         """
-        address = address.lower().replace('0x', '')
+        address = address.lower().removeprefix('0x')
+        digest = keccak_256(address.encode('ascii')).digest()
 
-        # Simple checksum (not full EIP-55 implementation)
-        # For full implementation, would need to use web3.py or implement keccak256
-        return '0x' + address
+        # Uppercase each letter whose matching hash nibble is >= 8
+        return '0x' + ''.join(
+            c.upper() if (digest[i >> 1] >> (0 if i & 1 else 4)) & 0x8 else c
+            for i, c in enumerate(address)
+        )
 
     def create_address(self, vendor_wallet: Optional[str] = None) -> Tuple[str, str]:
         """
@@ -100,7 +116,7 @@ class EthereumPaymentService:
         if not vendor_wallet:
             if self.settings.environment == "development":
                 # Mock address for testing
-                payment_id = uuid.uuid4().hex[:16]
+                payment_id = secrets.token_hex(8)
                 mock_address = f"0x{payment_id}{'0' * 24}"
                 logger.warning("Using mock ETH address (development mode)")
                 return mock_address, payment_id
@@ -114,7 +130,7 @@ class EthereumPaymentService:
         checksummed = self.to_checksum_address(vendor_wallet)
 
         # Generate unique payment ID for tracking
-        payment_id = uuid.uuid4().hex[:16]
+        payment_id = secrets.token_hex(8)
 
         logger.info(f"Created ETH payment address: {checksummed} (ID: {payment_id})")
         return checksummed, payment_id
@@ -146,6 +162,8 @@ class EthereumPaymentService:
             logger.error(f"ETH payment check requires address and expected_amount")
             return False
 
+        self._purge_payment_cache()
+
         # Use provided created_at or fallback to cached value
         if not created_at:
             cached = self._payment_cache.get(payment_id)
@@ -162,7 +180,7 @@ class EthereumPaymentService:
                 cached_addr, cached_amount, cached_time, cached_tx = cached
                 if cached_tx:
                     # Re-check confirmations
-                    confirmations = await self.api.get_transaction_confirmations(cached_tx.hash)
+                    confirmations = await self._get_tx_confirmations(cached_tx.hash)
                     if confirmations >= self.CONFIRMATION_THRESHOLD:
                         logger.info(f"ETH payment {payment_id} confirmed ({confirmations} confs)")
                         return True
@@ -173,7 +191,7 @@ class EthereumPaymentService:
                 address=address,
                 expected_amount=expected_amount,
                 created_at=created_at,
-                tolerance=self.AMOUNT_TOLERANCE
+                tolerance_wei=self.AMOUNT_TOLERANCE_WEI
             )
 
             if tx:
@@ -204,28 +222,47 @@ class EthereumPaymentService:
             logger.error(f"Unexpected error checking ETH payment {payment_id}: {e}")
             return False
 
-    def check_paid_sync(
-        self,
-        payment_id: str,
-        expected_amount: Optional[Decimal] = None,
-        address: Optional[str] = None,
-        created_at: Optional[datetime] = None
-    ) -> bool:
+    async def _get_tx_confirmations(self, tx_hash: str) -> int:
         """
-        Synchronous wrapper for check_paid (for compatibility).
+        Get confirmations, following new blocks over WebSocket when possible.
 
-        Note: This creates a new event loop. Prefer async version when possible.
+        When several found payments are still below the threshold, all of
+        them are looked up in one batch and the results are reused briefly
+        by the other payments' checks.
         """
-        import asyncio
-        try:
-            loop = asyncio.get_event_loop()
-        except RuntimeError:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
+        now = time.monotonic()
+        cached = self._confirmations.get(tx_hash)
+        if cached and now - cached[0] < self.CONFIRMATIONS_CACHE_TTL:
+            return cached[1]
+
+        unconfirmed = {
+            tx.hash: tx for _, _, _, tx in self._payment_cache.values()
+            if tx and tx.confirmations < self.CONFIRMATION_THRESHOLD
+        }
+        pending = {tx_hash, *unconfirmed}
+        if len(pending) < 2:
+            return await self.api.get_transaction_confirmations(
+                tx_hash, verify_at=self.CONFIRMATION_THRESHOLD
+            )
 
-        return loop.run_until_complete(
-            self.check_paid(payment_id, expected_amount, address, created_at)
+        results = await self.api.get_many_confirmations(
+            list(pending), verify_at=self.CONFIRMATION_THRESHOLD
         )
+        # Confirmed transactions drop out of later batches
+        for h, tx in unconfirmed.items():
+            tx.confirmations = results.get(h, tx.confirmations)
+        self._confirmations = {h: (now, confs) for h, confs in results.items()}
+        return results.get(tx_hash, 0)
+
+    def _purge_payment_cache(self) -> None:
+        """Drop cached payments created more than PAYMENT_CACHE_MAX_AGE ago."""
+        cutoff = datetime.utcnow() - self.PAYMENT_CACHE_MAX_AGE
+        stale = [
+            pid for pid, (_, _, created_at, _) in self._payment_cache.items()
+            if created_at < cutoff
+        ]
+        for pid in stale:
+            del self._payment_cache[pid]
 
     async def get_confirmations(
         self,
@@ -250,9 +287,12 @@ class EthereumPaymentService:
             cached_addr, cached_amount, cached_time, cached_tx = cached
             if cached_tx:
                 try:
-                    confirmations = await self.api.get_transaction_confirmations(cached_tx.hash)
-                    # Update cache
-                    cached_tx.confirmations = confirmations
+                    confirmations = await self._get_tx_confirmations(cached_tx.hash)
+                    if confirmations >= self.CONFIRMATION_THRESHOLD:
+                        # The order is marked paid now, so stop tracking it
+                        self._payment_cache.pop(payment_id, None)
+                    else:
+                        cached_tx.confirmations = confirmations
                     return confirmations
                 except Exception as e:
                     logger.error(f"Error getting confirmations: {e}")
@@ -264,6 +304,14 @@ class EthereumPaymentService:
         )
         return 0
 
+    async def start(self) -> None:
+        """Start following new blocks over Infura's WebSocket API, if configured."""
+        self.api.start_block_watcher()
+
+    async def close(self) -> None:
+        """Release the Etherscan HTTP connection pool."""
+        await self.api.close()
+
     def get_balance(self) -> Decimal:
         """
         Get the current wallet balance.
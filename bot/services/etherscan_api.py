@@ -3,14 +3,20 @@
 from __future__ import annotations
 
 import asyncio
+import json
 import logging
+import time
+from collections import OrderedDict
 from decimal import Decimal
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 import aiohttp
 
 logger = logging.getLogger(__name__)
 
+# Default payment matching tolerance: 0.001 ETH in Wei
+AMOUNT_TOLERANCE_WEI = 1_000_000_000_000_000
+
 
 class EtherscanAPIError(Exception):
     """Base exception for Etherscan API errors."""
@@ -22,6 +28,26 @@ class RateLimitError(EtherscanAPIError):
     pass
 
 
+class _TokenBucket:
+    """Async token bucket allowing `rate` requests per second, bursting up to `rate`."""
+
+    def __init__(self, rate: int):
+        self._rate = rate
+        self._tokens = float(rate)
+        self._updated = time.monotonic()
+
+    async def acquire(self) -> None:
+        """Wait until a request token is available and consume it."""
+        while True:
+            now = time.monotonic()
+            self._tokens = min(self._rate, self._tokens + (now - self._updated) * self._rate)
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return
+            await asyncio.sleep((1 - self._tokens) / self._rate)
+
+
 class EthereumTransaction:
     """Represents an Ethereum transaction."""
 
@@ -32,12 +58,21 @@ class EthereumTransaction:
         self.hash = data.get("hash", "")
         self.from_address = data.get("from", "").lower()
         self.to_address = data.get("to", "").lower()
-        self.value_wei = Decimal(data.get("value", "0"))
-        self.value_eth = self.value_wei / self.WEI_TO_ETH
-        self.timestamp = datetime.fromtimestamp(int(data.get("timeStamp", 0)))
+        self.value_wei = int(data.get("value", "0"))
+        self.timestamp_ts = int(data.get("timeStamp", 0))
         self.confirmations = int(data.get("confirmations", 0))
         self.is_error = data.get("isError", "0") == "1"
 
+    @property
+    def timestamp(self) -> datetime:
+        """Block timestamp as a local datetime."""
+        return datetime.fromtimestamp(self.timestamp_ts)
+
+    @property
+    def value_eth(self) -> Decimal:
+        """Transaction value in ETH."""
+        return Decimal(self.value_wei) / self.WEI_TO_ETH
+
     def __repr__(self):
         return (
             f"<EthereumTransaction {self.hash[:8]}... "
@@ -56,7 +91,14 @@ class EtherscanAPI:
 
     ETHERSCAN_URL = "https://api.etherscan.io/api"
     INFURA_URL = "https://mainnet.infura.io/v3"
-    RATE_LIMIT_DELAY = 0.2  # seconds (5 req/s)
+    INFURA_WS_URL = "wss://mainnet.infura.io/ws/v3"
+    RATE_LIMIT_PER_SECOND = 5  # Etherscan free tier
+    TX_CACHE_TTL = 10  # seconds to reuse an address's transaction list
+    START_BLOCK_MARGIN = 300  # blocks (~1 hour) subtracted from the block at `since`
+    BLOCK_WATCHER_STALE_AFTER = 60  # seconds without a new head before polling again
+    BLOCK_WATCHER_RETRY_DELAY = 10  # seconds between WebSocket reconnect attempts
+    BLOCK_CACHE_SIZE = 1024  # minute -> block lookups kept, least recently used evicted
+    TX_BLOCK_CACHE_SIZE = 4096  # tx hash -> block entries kept, least recently used evicted
 
     def __init__(self, api_key: str, infura_project_id: Optional[str] = None):
         if not api_key:
@@ -64,16 +106,54 @@ class EtherscanAPI:
 
         self.api_key = api_key
         self.infura_project_id = infura_project_id
-        self._last_request_time = None
+        self._rate_limiter = _TokenBucket(self.RATE_LIMIT_PER_SECOND)
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._tx_cache: Dict[
+            str, Tuple[float, Optional[datetime], List[EthereumTransaction]]
+        ] = {}
+        self._inflight: Dict[str, Tuple[Optional[datetime], asyncio.Future]] = {}
+        self._block_cache: OrderedDict[int, int] = OrderedDict()
+        self._tx_blocks: OrderedDict[str, int] = OrderedDict()
+        # Blocks re-read from a receipt at the confirmation threshold
+        self._verified_blocks: OrderedDict[str, int] = OrderedDict()
+        self._current_block: Optional[int] = None
+        self._current_block_seen = 0.0
+        self._watcher_task: Optional[asyncio.Task] = None
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Return the shared keep-alive HTTP session, creating it on first use."""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=10,
+                    limit_per_host=5,
+                    keepalive_timeout=60,
+                    ttl_dns_cache=300
+                ),
+                timeout=aiohttp.ClientTimeout(total=30)
+            )
+        return self._session
 
-    async def _wait_for_rate_limit(self):
-        """Enforce rate limiting."""
-        if self._last_request_time:
-            elapsed = (datetime.utcnow() - self._last_request_time).total_seconds()
-            if elapsed < self.RATE_LIMIT_DELAY:
-                wait_time = self.RATE_LIMIT_DELAY - elapsed
-                await asyncio.sleep(wait_time)
-        self._last_request_time = datetime.utcnow()
+    @staticmethod
+    def _remember(cache: OrderedDict, key, value, size: int) -> None:
+        """Store a value in a bounded cache, evicting the least recently used entry."""
+        cache[key] = value
+        cache.move_to_end(key)
+        if len(cache) > size:
+            cache.popitem(last=False)
+
+    async def close(self) -> None:
+        """Stop the block watcher and close the shared HTTP session."""
+        if self._watcher_task is not None:
+            self._watcher_task.cancel()
+            try:
+                await self._watcher_task
+            except asyncio.CancelledError:
+                pass
+            self._watcher_task = None
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
 
     async def get_address_transactions(
         self,
@@ -83,6 +163,11 @@ class EtherscanAPI:
         """
         Get transactions for an Ethereum address.
 
+        Results are cached per address for TX_CACHE_TTL seconds, and
+        concurrent lookups for the same address share one request. A
+        cached or in-flight lookup is reused when it reaches back at least
+        as far as `since`.
+
         Args:
             address: Ethereum address to query (0x...)
             since: Optional datetime to filter transactions after this time
@@ -93,19 +178,109 @@ class EtherscanAPI:
         Raises:
             EtherscanAPIError: If API request fails
         """
-        await self._wait_for_rate_limit()
+        key = address.lower()
+        cached = self._tx_cache.get(key)
+        if (
+            cached
+            and time.monotonic() - cached[0] < self.TX_CACHE_TTL
+            and self._covers(cached[1], since)
+        ):
+            transactions = cached[2]
+        else:
+            inflight = self._inflight.get(key)
+            if inflight and self._covers(inflight[0], since):
+                task = inflight[1]
+            else:
+                task = asyncio.ensure_future(self._fetch_address_transactions(address, since))
+                self._inflight[key] = (since, task)
+                task.add_done_callback(lambda t: self._discard_inflight(key, t))
+            transactions = await asyncio.shield(task)
+
+        if since:
+            since_ts = since.timestamp()
+            return [tx for tx in transactions if tx.timestamp_ts >= since_ts]
+        return list(transactions)
+
+    @staticmethod
+    def _covers(fetched_since: Optional[datetime], since: Optional[datetime]) -> bool:
+        """Return True if a lookup made from `fetched_since` includes `since`."""
+        return fetched_since is None or (since is not None and fetched_since <= since)
 
+    def _discard_inflight(self, key: str, task: asyncio.Future) -> None:
+        """Forget a finished lookup unless a newer one has replaced it."""
+        inflight = self._inflight.get(key)
+        if inflight and inflight[1] is task:
+            del self._inflight[key]
+
+    async def _fetch_address_transactions(
+        self,
+        address: str,
+        since: Optional[datetime] = None
+    ) -> List[EthereumTransaction]:
+        """Fetch recent transactions for an address and cache them."""
         try:
-            return await self._get_from_etherscan(address, since)
+            transactions = await self._get_from_etherscan(address, since)
         except Exception as e:
             logger.warning(f"Etherscan API failed: {e}")
             if self.infura_project_id:
                 logger.info("Trying Infura fallback")
                 try:
-                    return await self._get_from_infura(address, since)
+                    transactions = await self._get_from_infura(address)
                 except Exception as e2:
                     logger.error(f"Infura also failed: {e2}")
-            raise EtherscanAPIError(f"All Ethereum APIs failed: etherscan={e}")
+                    raise EtherscanAPIError(f"All Ethereum APIs failed: etherscan={e}")
+            else:
+                raise EtherscanAPIError(f"All Ethereum APIs failed: etherscan={e}")
+
+        self._tx_cache[address.lower()] = (time.monotonic(), since, transactions)
+        return transactions
+
+    async def _block_at_time(self, ts: datetime) -> int:
+        """
+        Get the last block mined at or before a point in time.
+
+        Results are cached per minute, so lookups for orders created close
+        together resolve to one request.
+
+        Args:
+            ts: Point in time to resolve
+
+        Returns:
+            Block number
+
+        Raises:
+            EtherscanAPIError: If the block cannot be determined
+        """
+        minute = int(ts.timestamp()) // 60
+        block = self._block_cache.get(minute)
+        if block is not None:
+            self._block_cache.move_to_end(minute)
+            return block
+
+        data = await self._etherscan_proxy({
+            "module": "block",
+            "action": "getblocknobytime",
+            "timestamp": minute * 60,
+            "closest": "before",
+            "apikey": self.api_key
+        })
+        if not data or data.get("status") != "1":
+            raise EtherscanAPIError("Could not resolve block number by time")
+
+        block = int(data["result"])
+        self._remember(self._block_cache, minute, block, self.BLOCK_CACHE_SIZE)
+        return block
+
+    async def _start_block(self, since: Optional[datetime]) -> int:
+        """Return the block to start a transaction scan from, 0 if unknown."""
+        if since is None:
+            return 0
+        try:
+            block = await self._block_at_time(since)
+        except Exception as e:
+            logger.warning(f"Falling back to full scan, block lookup failed: {e}")
+            return 0
+        return max(0, block - self.START_BLOCK_MARGIN)
 
     async def _get_from_etherscan(
         self,
@@ -117,7 +292,7 @@ class EtherscanAPI:
             "module": "account",
             "action": "txlist",
             "address": address,
-            "startblock": 0,
+            "startblock": await self._start_block(since),
             "endblock": 99999999,
             "page": 1,
             "offset": 100,  # Last 100 transactions
@@ -125,41 +300,41 @@ class EtherscanAPI:
             "apikey": self.api_key
         }
 
-        async with aiohttp.ClientSession() as session:
-            async with session.get(
-                self.ETHERSCAN_URL,
-                params=params,
-                timeout=aiohttp.ClientTimeout(total=30)
-            ) as response:
-                if response.status == 429:
-                    raise RateLimitError("Etherscan rate limit exceeded")
-                elif response.status != 200:
-                    raise EtherscanAPIError(f"Etherscan returned status {response.status}")
-
-                data = await response.json()
+        session = await self._get_session()
+        await self._rate_limiter.acquire()
+        async with session.get(self.ETHERSCAN_URL, params=params) as response:
+            if response.status == 429:
+                raise RateLimitError("Etherscan rate limit exceeded")
+            elif response.status != 200:
+                raise EtherscanAPIError(f"Etherscan returned status {response.status}")
 
-                if data.get("status") != "1":
-                    error_msg = data.get("message", "Unknown error")
-                    raise EtherscanAPIError(f"Etherscan error: {error_msg}")
+            data = json.loads(await response.read())
 
-                transactions = []
+        if data.get("status") != "1":
+            error_msg = data.get("message", "Unknown error")
+            # An address with no transactions in range is not an error
+            if data.get("result") == [] or error_msg == "No transactions found":
+                return []
+            raise EtherscanAPIError(f"Etherscan error: {error_msg}")
 
-                for tx_data in data.get("result", []):
-                    tx = EthereumTransaction(tx_data)
+        transactions = []
+        since_ts = since.timestamp() if since else None
+        target = address.lower()
 
-                    # Skip error transactions
-                    if tx.is_error:
-                        continue
+        for tx_data in data.get("result", []):
+            # Results are newest first, so everything after this is older too
+            if since_ts is not None and int(tx_data.get("timeStamp", 0)) < since_ts:
+                break
 
-                    # Filter by time if specified
-                    if since and tx.timestamp < since:
-                        continue
+            # Skip error transactions
+            if tx_data.get("isError", "0") == "1":
+                continue
 
-                    # Only include incoming transactions
-                    if tx.to_address.lower() == address.lower():
-                        transactions.append(tx)
+            # Only include incoming transactions
+            if tx_data.get("to", "").lower() == target:
+                transactions.append(EthereumTransaction(tx_data))
 
-                return transactions
+        return transactions
 
     async def _get_from_infura(
         self,
@@ -178,7 +353,7 @@ class EtherscanAPI:
         address: str,
         expected_amount: Decimal,
         created_at: datetime,
-        tolerance: Decimal = Decimal("0.001")
+        tolerance_wei: int = AMOUNT_TOLERANCE_WEI
     ) -> Optional[EthereumTransaction]:
         """
         Find a payment to an address within a time window.
@@ -187,26 +362,27 @@ class EtherscanAPI:
             address: Ethereum address to check (0x...)
             expected_amount: Expected ETH amount
             created_at: Order creation time
-            tolerance: Amount matching tolerance (default 0.001 ETH)
+            tolerance_wei: Amount matching tolerance in Wei (default 0.001 ETH)
 
         Returns:
             EthereumTransaction if found, None otherwise
         """
         # Search 24-hour window
         since = created_at
-        until = created_at + timedelta(hours=24)
+        since_ts = since.timestamp()
+        until_ts = (created_at + timedelta(hours=24)).timestamp()
+        expected_wei = self.eth_to_wei(expected_amount)
 
         try:
             transactions = await self.get_address_transactions(address, since=since)
 
             for tx in transactions:
                 # Check if transaction is within time window
-                if tx.timestamp < since or tx.timestamp > until:
+                if tx.timestamp_ts < since_ts or tx.timestamp_ts > until_ts:
                     continue
 
-                # Check if amount matches (within tolerance)
-                amount_diff = abs(tx.value_eth - expected_amount)
-                if amount_diff <= tolerance:
+                # Check if amount matches (within tolerance), in integer Wei
+                if abs(tx.value_wei - expected_wei) <= tolerance_wei:
                     logger.info(
                         f"Found matching ETH payment: {tx.hash} "
                         f"({tx.value_eth} ETH, {tx.confirmations} confs)"
@@ -220,68 +396,299 @@ class EtherscanAPI:
             logger.error(f"Error finding payment: {e}")
             raise
 
-    async def get_transaction_confirmations(self, tx_hash: str) -> int:
+    def start_block_watcher(self) -> bool:
+        """
+        Follow new block headers over Infura's WebSocket API.
+
+        While the subscription is live, confirmations for transactions whose
+        block is already known are computed without any HTTP requests.
+
+        Returns:
+            True if the watcher is running, False if Infura is not configured
+        """
+        if not self.infura_project_id:
+            return False
+        if self._watcher_task is None or self._watcher_task.done():
+            self._watcher_task = asyncio.get_running_loop().create_task(
+                self._watch_new_heads()
+            )
+        return True
+
+    async def _watch_new_heads(self) -> None:
+        """Keep an eth_subscribe newHeads stream open, reconnecting on failure."""
+        url = f"{self.INFURA_WS_URL}/{self.infura_project_id}"
+        subscribe = {"jsonrpc": "2.0", "id": 1, "method": "eth_subscribe", "params": ["newHeads"]}
+        while True:
+            try:
+                session = await self._get_session()
+                async with session.ws_connect(url, heartbeat=30) as ws:
+                    await ws.send_json(subscribe)
+                    async for msg in ws:
+                        if msg.type != aiohttp.WSMsgType.TEXT:
+                            break
+                        head = json.loads(msg.data).get("params", {}).get("result")
+                        if isinstance(head, dict) and head.get("number"):
+                            self._current_block = int(head["number"], 16)
+                            self._current_block_seen = time.monotonic()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Block watcher disconnected: {e}")
+            await asyncio.sleep(self.BLOCK_WATCHER_RETRY_DELAY)
+
+    def _watched_block(self) -> Optional[int]:
+        """Return the latest block from the watcher, or None if it is stale."""
+        if time.monotonic() - self._current_block_seen > self.BLOCK_WATCHER_STALE_AFTER:
+            return None
+        return self._current_block
+
+    async def get_transaction_confirmations(
+        self,
+        tx_hash: str,
+        verify_at: Optional[int] = None
+    ) -> int:
         """
         Get the number of confirmations for a transaction.
 
+        Uses the block watcher's latest head when it is live and the
+        transaction's block is known, otherwise polls the receipt and
+        current block number.
+
         Args:
             tx_hash: Transaction hash (0x...)
+            verify_at: Confirmation count at which a cached block is
+                re-checked once against the receipt, in case of a reorg
 
         Returns:
             Number of confirmations
         """
-        await self._wait_for_rate_limit()
+        try:
+            tx_block = self._tx_blocks.get(tx_hash)
+            current_block = self._watched_block()
 
-        params = {
-            "module": "proxy",
-            "action": "eth_getTransactionReceipt",
-            "txhash": tx_hash,
-            "apikey": self.api_key
-        }
+            if (
+                tx_block is None
+                or current_block is None
+                or self._needs_verify(tx_hash, current_block, verify_at)
+            ):
+                self._forget_block(tx_hash)
+                receipt, current_block_hex = await self._get_receipt_and_block(tx_hash)
 
-        try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    self.ETHERSCAN_URL,
-                    params=params,
-                    timeout=aiohttp.ClientTimeout(total=30)
-                ) as response:
-                    if response.status != 200:
-                        logger.warning(f"Failed to get tx confirmations: status {response.status}")
-                        return 0
-
-                    data = await response.json()
-                    receipt = data.get("result")
-
-                    if not receipt or not receipt.get("blockNumber"):
-                        return 0
-
-                    # Get current block number
-                    block_params = {
-                        "module": "proxy",
-                        "action": "eth_blockNumber",
-                        "apikey": self.api_key
-                    }
-
-                    async with session.get(
-                        self.ETHERSCAN_URL,
-                        params=block_params,
-                        timeout=aiohttp.ClientTimeout(total=30)
-                    ) as block_response:
-                        if block_response.status != 200:
-                            return 0
-
-                        block_data = await block_response.json()
-                        current_block = int(block_data.get("result", "0"), 16)
-                        tx_block = int(receipt.get("blockNumber", "0"), 16)
-
-                        confirmations = current_block - tx_block + 1
-                        return max(0, confirmations)
+                if not receipt or not receipt.get("blockNumber") or not current_block_hex:
+                    return 0
+
+                current_block = int(current_block_hex, 16)
+                tx_block = int(receipt.get("blockNumber", "0"), 16)
+                self._store_block(tx_hash, tx_block, current_block, verify_at)
+
+            confirmations = current_block - tx_block + 1
+            return max(0, confirmations)
 
         except Exception as e:
             logger.error(f"Error getting transaction confirmations: {e}")
             return 0
 
+    async def get_many_confirmations(
+        self,
+        tx_hashes: List[str],
+        verify_at: Optional[int] = None
+    ) -> Dict[str, int]:
+        """
+        Get confirmations for several transactions at once.
+
+        Receipts are only fetched for transactions whose block is not yet
+        known, or whose cached block first reaches ``verify_at``
+        confirmations, together with the current block number, in one
+        Infura JSON-RPC batch when configured.
+
+        Args:
+            tx_hashes: Transaction hashes (0x...)
+            verify_at: Confirmation count at which a cached block is
+                re-checked once against the receipt, in case of a reorg
+
+        Returns:
+            Dict mapping each hash to its number of confirmations
+        """
+        try:
+            current_block = self._watched_block()
+            unknown = [
+                h for h in tx_hashes
+                if h not in self._tx_blocks
+                or self._needs_verify(h, current_block, verify_at)
+            ]
+
+            if unknown or current_block is None:
+                current_block = await self._fetch_blocks(unknown, current_block, verify_at)
+
+            # Without a watched head, threshold crossings are only known now
+            crossing = [
+                h for h in tx_hashes
+                if h in self._tx_blocks and self._needs_verify(h, current_block, verify_at)
+            ]
+            if crossing:
+                await self._fetch_blocks(crossing, current_block, verify_at)
+
+        except Exception as e:
+            logger.error(f"Error getting transaction confirmations: {e}")
+            return {tx_hash: 0 for tx_hash in tx_hashes}
+
+        confirmations = {}
+        for tx_hash in tx_hashes:
+            tx_block = self._tx_blocks.get(tx_hash)
+            if tx_block is None or current_block is None:
+                confirmations[tx_hash] = 0
+            else:
+                confirmations[tx_hash] = max(0, current_block - tx_block + 1)
+        return confirmations
+
+    async def _fetch_blocks(
+        self,
+        tx_hashes: List[str],
+        current_block: Optional[int],
+        verify_at: Optional[int]
+    ) -> Optional[int]:
+        """Re-read the blocks of tx_hashes from their receipts; returns the current block."""
+        for tx_hash in tx_hashes:
+            self._forget_block(tx_hash)
+        receipts, current_block_hex = await self._get_receipts_and_block(tx_hashes)
+        if current_block is None and current_block_hex:
+            current_block = int(current_block_hex, 16)
+        for tx_hash, receipt in receipts.items():
+            if receipt and receipt.get("blockNumber"):
+                self._store_block(
+                    tx_hash, int(receipt["blockNumber"], 16), current_block, verify_at
+                )
+        return current_block
+
+    def _store_block(
+        self,
+        tx_hash: str,
+        tx_block: int,
+        current_block: Optional[int],
+        verify_at: Optional[int]
+    ) -> None:
+        """Cache a block read from a receipt, noting if it was read at the threshold."""
+        self._remember(self._tx_blocks, tx_hash, tx_block, self.TX_BLOCK_CACHE_SIZE)
+        if (
+            verify_at is not None
+            and current_block is not None
+            and current_block - tx_block + 1 >= verify_at
+        ):
+            self._remember(self._verified_blocks, tx_hash, tx_block, self.TX_BLOCK_CACHE_SIZE)
+
+    def _forget_block(self, tx_hash: str) -> None:
+        """Drop a transaction's cached block and its verification."""
+        self._tx_blocks.pop(tx_hash, None)
+        self._verified_blocks.pop(tx_hash, None)
+
+    def _needs_verify(
+        self,
+        tx_hash: str,
+        current_block: Optional[int],
+        verify_at: Optional[int]
+    ) -> bool:
+        """Return True if a cached block reaches ``verify_at`` without having been re-read."""
+        if verify_at is None or current_block is None:
+            return False
+        tx_block = self._tx_blocks[tx_hash]
+        return (
+            current_block - tx_block + 1 >= verify_at
+            and self._verified_blocks.get(tx_hash) != tx_block
+        )
+
+    async def _get_receipt_and_block(
+        self,
+        tx_hash: str
+    ) -> Tuple[Optional[dict], Optional[str]]:
+        """
+        Fetch a transaction receipt and the current block number together.
+
+        Returns:
+            Tuple of (receipt, current block number as hex string)
+        """
+        receipts, current_block_hex = await self._get_receipts_and_block([tx_hash])
+        receipt = receipts.get(tx_hash)
+        if receipt is None:
+            return None, None
+        return receipt, current_block_hex
+
+    async def _get_receipts_and_block(
+        self,
+        tx_hashes: List[str]
+    ) -> Tuple[Dict[str, Optional[dict]], Optional[str]]:
+        """
+        Fetch transaction receipts and the current block number together.
+
+        Uses a single JSON-RPC batch request to Infura when configured,
+        otherwise issues the Etherscan proxy requests concurrently.
+
+        Returns:
+            Tuple of (receipts by hash, current block number as hex string)
+        """
+        if self.infura_project_id:
+            try:
+                return await self._get_receipts_and_block_from_infura(tx_hashes)
+            except Exception as e:
+                logger.warning(f"Infura batch request failed, using Etherscan: {e}")
+
+        *receipt_data, block_data = await asyncio.gather(
+            *(
+                self._etherscan_proxy({
+                    "module": "proxy",
+                    "action": "eth_getTransactionReceipt",
+                    "txhash": tx_hash,
+                    "apikey": self.api_key
+                })
+                for tx_hash in tx_hashes
+            ),
+            self._etherscan_proxy({
+                "module": "proxy",
+                "action": "eth_blockNumber",
+                "apikey": self.api_key
+            })
+        )
+        receipts = {
+            tx_hash: data.get("result") if data is not None else None
+            for tx_hash, data in zip(tx_hashes, receipt_data)
+        }
+        return receipts, block_data.get("result") if block_data is not None else None
+
+    async def _get_receipts_and_block_from_infura(
+        self,
+        tx_hashes: List[str]
+    ) -> Tuple[Dict[str, Optional[dict]], Optional[str]]:
+        """Fetch receipts and current block number in one Infura JSON-RPC batch."""
+        batch = [
+            {"jsonrpc": "2.0", "id": i, "method": "eth_getTransactionReceipt", "params": [tx_hash]}
+            for i, tx_hash in enumerate(tx_hashes, start=1)
+        ]
+        block_id = len(tx_hashes) + 1
+        batch.append({"jsonrpc": "2.0", "id": block_id, "method": "eth_blockNumber", "params": []})
+
+        session = await self._get_session()
+        async with session.post(f"{self.INFURA_URL}/{self.infura_project_id}", json=batch) as response:
+            if response.status != 200:
+                raise EtherscanAPIError(f"Infura returned status {response.status}")
+            data = json.loads(await response.read())
+
+        results = {item.get("id"): item.get("result") for item in data}
+        receipts = {
+            tx_hash: results.get(i) for i, tx_hash in enumerate(tx_hashes, start=1)
+        }
+        return receipts, results.get(block_id)
+
+    async def _etherscan_proxy(self, params: dict) -> Optional[dict]:
+        """Issue an Etherscan proxy-module request, returning None on HTTP errors."""
+        session = await self._get_session()
+        await self._rate_limiter.acquire()
+        async with session.get(self.ETHERSCAN_URL, params=params) as response:
+            if response.status != 200:
+                logger.warning(
+                    f"Etherscan {params.get('action')} failed: status {response.status}"
+                )
+                return None
+            return json.loads(await response.read())
+
     @staticmethod
     def eth_to_wei(eth_amount: Decimal) -> int:
         """Convert ETH to Wei."""
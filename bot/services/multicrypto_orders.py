@@ -1,10 +1,22 @@
 """Multi-crypto order service combining swap and order management."""
 
+import asyncio
+import json
 import logging
+import os
+import time
+from binascii import a2b_base64, b2a_base64
+from collections import Counter
 from datetime import datetime
 from decimal import Decimal
+from functools import lru_cache
 from typing import Optional
 
+from nacl.bindings import crypto_aead_aes256gcm_decrypt, crypto_aead_aes256gcm_encrypt
+from nacl._sodium import lib as sodium_lib
+from nacl.exceptions import CryptoError
+from nacl.secret import SecretBox
+
 from bot.models_multitenant import (
     MultiTenantDatabase, Tenant, TenantProduct, TenantOrder,
     OrderState, SwapState
@@ -13,39 +25,80 @@ from bot.services.crypto_swap import CryptoSwapService, SwapOrder, SupportedCoin
 
 logger = logging.getLogger(__name__)
 
+# Leading byte marking AES-256-GCM ciphertexts; SecretBox ones have no prefix
+AES_GCM_VERSION = b"\x01"
+AES_GCM_NONCE_BYTES = 12
+
+
+# libsodium's hardware AES-256-GCM check; PyNaCl has no public wrapper for it
+# but runs the same check before every aes256gcm call
+_AES_GCM = sodium_lib.crypto_aead_aes256gcm_is_available() == 1
 
-def encrypt_address(address: str, encryption_key: str) -> str:
-    """Encrypt a delivery address."""
-    from nacl.secret import SecretBox
-    import base64
 
+@lru_cache(maxsize=256)
+def _get_key(encryption_key: str) -> bytes:
+    """Get the 32-byte key for a tenant's hex encryption key."""
     # Key is hex string, convert to bytes
     key_bytes = bytes.fromhex(encryption_key)
     # Pad or truncate to 32 bytes
-    key_bytes = key_bytes[:32].ljust(32, b'\0')
+    return key_bytes[:32].ljust(32, b'\0')
 
-    box = SecretBox(key_bytes)
-    encrypted = box.encrypt(address.encode('utf-8'))
-    return base64.b64encode(encrypted).decode('utf-8')
+
+@lru_cache(maxsize=256)
+def _get_box(encryption_key: str) -> SecretBox:
+    """Get the SecretBox for a tenant's hex encryption key."""
+    return SecretBox(_get_key(encryption_key))
+
+
+def encrypt_address(address: str, encryption_key: str) -> str:
+    """
+    Encrypt a delivery address.
+
+    Uses AES-256-GCM when the CPU supports it, falling back to SecretBox.
+    """
+    if _AES_GCM:
+        nonce = os.urandom(AES_GCM_NONCE_BYTES)
+        ciphertext = crypto_aead_aes256gcm_encrypt(
+            address.encode('utf-8'), None, nonce, _get_key(encryption_key)
+        )
+        encrypted = AES_GCM_VERSION + nonce + ciphertext
+    else:
+        encrypted = _get_box(encryption_key).encrypt(address.encode('utf-8'))
+    return b2a_base64(encrypted, newline=False).decode('ascii')
 
 
 def decrypt_address(encrypted: str, encryption_key: str) -> str:
-    """Decrypt a delivery address."""
-    from nacl.secret import SecretBox
-    import base64
+    """Decrypt a delivery address encrypted with AES-256-GCM or SecretBox."""
+    encrypted_bytes = a2b_base64(encrypted)
 
-    key_bytes = bytes.fromhex(encryption_key)
-    key_bytes = key_bytes[:32].ljust(32, b'\0')
+    # Always try AES-GCM for versioned data, whatever this host writes with
+    if encrypted_bytes[:1] == AES_GCM_VERSION:
+        nonce_end = 1 + AES_GCM_NONCE_BYTES
+        try:
+            decrypted = crypto_aead_aes256gcm_decrypt(
+                encrypted_bytes[nonce_end:], None,
+                encrypted_bytes[1:nonce_end], _get_key(encryption_key)
+            )
+            return decrypted.decode('utf-8')
+        except CryptoError:
+            # A SecretBox ciphertext whose random nonce starts with the version
+            # byte, or no AES-NI here (UnavailableError is a CryptoError)
+            pass
 
-    box = SecretBox(key_bytes)
-    encrypted_bytes = base64.b64decode(encrypted)
-    decrypted = box.decrypt(encrypted_bytes)
+    decrypted = _get_box(encryption_key).decrypt(encrypted_bytes)
     return decrypted.decode('utf-8')
 
 
+def _enum_value(value):
+    """Return the plain value of an enum column, which SQLModel may load as a str."""
+    return getattr(value, "value", value)
+
+
 class MultiCryptoOrderService:
     """Service for handling orders with multi-crypto payments."""
 
+    SUPPORTED_COINS_TTL = 300  # Seconds before the supported coin list is refetched
+
     def __init__(
         self,
         db: MultiTenantDatabase,
@@ -53,10 +106,17 @@ class MultiCryptoOrderService:
     ):
         self.db = db
         self.swap_service = swap_service
+        self._supported_methods: list[str] = []
+        self._supported_coins: frozenset[str] = frozenset()
+        self._supported_fetched = float("-inf")  # time.monotonic() of last fetch
 
     async def get_supported_payment_methods(self) -> list[str]:
-        """Get list of supported payment cryptocurrencies."""
-        return await self.swap_service.get_supported_coins()
+        """Get list of supported payment cryptocurrencies, cached for SUPPORTED_COINS_TTL."""
+        if time.monotonic() - self._supported_fetched >= self.SUPPORTED_COINS_TTL:
+            self._supported_methods = list(await self.swap_service.get_supported_coins())
+            self._supported_coins = frozenset(self._supported_methods)
+            self._supported_fetched = time.monotonic()
+        return list(self._supported_methods)
 
     async def create_order(
         self,
@@ -74,10 +134,11 @@ class MultiCryptoOrderService:
         """
         payment_coin = payment_coin.lower()
 
-        # Validate payment coin
-        supported = await self.get_supported_payment_methods()
-        if payment_coin not in supported:
-            raise ValueError(f"Unsupported payment method: {payment_coin}")
+        # Validate payment coin; direct XMR payments never involve a swap provider
+        if payment_coin != "xmr":
+            await self.get_supported_payment_methods()
+            if payment_coin not in self._supported_coins:
+                raise ValueError(f"Unsupported payment method: {payment_coin}")
 
         # Get tenant and product
         tenant = self.db.get_tenant(tenant_id)
@@ -156,8 +217,11 @@ class MultiCryptoOrderService:
         self.db.log_action(
             action="order_created",
             tenant_id=tenant_id,
-            details=f'{{"order_id": {order.id}, "product_id": {product_id}, '
-                    f'"payment_coin": "{payment_coin}"}}'
+            details=json.dumps({
+                "order_id": order.id,
+                "product_id": product_id,
+                "payment_coin": payment_coin,
+            })
         )
 
         return {
@@ -205,10 +269,8 @@ class MultiCryptoOrderService:
             raise ValueError("Order not found")
 
         # Handle both enum and string states (SQLModel stores as string)
-        state_value = order.state.value if hasattr(order.state, 'value') else order.state
-        swap_status_value = None
-        if order.swap_id:
-            swap_status_value = order.swap_status.value if hasattr(order.swap_status, 'value') else order.swap_status
+        state_value = _enum_value(order.state)
+        swap_status_value = _enum_value(order.swap_status) if order.swap_id else None
 
         result = {
             "order_id": order_id,
@@ -218,8 +280,7 @@ class MultiCryptoOrderService:
         }
 
         # If order has a swap, check swap status
-        order_state_str = order.state.value if hasattr(order.state, 'value') else order.state
-        if order.swap_id and order_state_str == OrderState.SWAP_PENDING.value:
+        if order.swap_id and state_value == OrderState.SWAP_PENDING.value:
             swap_status = await self.swap_service.check_swap_status(
                 order.swap_id,
                 order.swap_provider
@@ -242,37 +303,49 @@ class MultiCryptoOrderService:
 
     async def process_pending_swaps(self) -> dict:
         """Process all pending swap orders (background task)."""
+        pending_orders = self.db.get_pending_swap_orders()
         results = {
-            "checked": 0,
+            "checked": len(pending_orders),
             "completed": 0,
             "failed": 0
         }
 
-        pending_orders = self.db.get_pending_swap_orders()
-
-        for order in pending_orders:
-            results["checked"] += 1
+        # Query all providers concurrently rather than one swap at a time
+        swap_orders = [order for order in pending_orders if order.swap_id]
+        statuses = await asyncio.gather(
+            *(
+                self.swap_service.check_swap_status(order.swap_id, order.swap_provider)
+                for order in swap_orders
+            ),
+            return_exceptions=True
+        )
 
-            if not order.swap_id:
+        updates = []
+        for order, swap_status in zip(swap_orders, statuses):
+            if isinstance(swap_status, Exception):
+                logger.error(f"Error checking swap for order {order.id}: {swap_status}")
                 continue
+            updates.append((order.id, SwapState(swap_status.value)))
 
-            try:
-                swap_status = await self.swap_service.check_swap_status(
-                    order.swap_id,
-                    order.swap_provider
-                )
-
-                self.db.update_order_swap_status(order.id, SwapState(swap_status.value))
-
-                if swap_status.value == "complete":
-                    results["completed"] += 1
-                    logger.info(f"Order {order.id} swap completed")
-                elif swap_status.value in ["failed", "expired"]:
-                    results["failed"] += 1
-                    logger.warning(f"Order {order.id} swap {swap_status.value}")
-
-            except Exception as e:
-                logger.error(f"Error checking swap for order {order.id}: {e}")
+        # Write every status change in a single transaction
+        try:
+            self.db.bulk_update_swap_status(updates)
+        except Exception as e:
+            logger.error(f"Error updating swap statuses: {e}")
+            return results
+
+        counts = Counter(swap_state for _, swap_state in updates)
+        results["completed"] = counts[SwapState.COMPLETE]
+        results["failed"] = counts[SwapState.FAILED] + counts[SwapState.EXPIRED]
+
+        if logger.isEnabledFor(logging.DEBUG):
+            for order_id, swap_state in updates:
+                logger.debug(f"Order {order_id} swap {swap_state.value}")
+        if results["completed"] or results["failed"]:
+            logger.info(
+                f"Swap check: {results['checked']} checked, "
+                f"{results['completed']} completed, {results['failed']} failed"
+            )
 
         return results
 
@@ -286,7 +359,7 @@ class MultiCryptoOrderService:
             self.db.log_action(
                 action="order_fulfilled",
                 tenant_id=tenant_id,
-                details=f'{{"order_id": {order_id}}}'
+                details=json.dumps({"order_id": order_id})
             )
             logger.info(f"Order {order_id} fulfilled")
 
@@ -294,30 +367,13 @@ class MultiCryptoOrderService:
 
     def cancel_order(self, order_id: int, tenant_id: str) -> Optional[TenantOrder]:
         """Cancel an order and restore inventory."""
-        order = self.db.get_order(order_id, tenant_id)
-        if not order:
-            return None
-
-        # Restore inventory
-        if order.product_id:
-            product = self.db.get_product(order.product_id, tenant_id)
-            if product:
-                self.db.update_product(
-                    order.product_id,
-                    tenant_id,
-                    inventory=product.inventory + order.quantity
-                )
-
-        # Update order state
-        order = self.db.update_order_state(
-            order_id, tenant_id, OrderState.CANCELLED
-        )
+        order = self.db.cancel_order(order_id, tenant_id)
 
         if order:
             self.db.log_action(
                 action="order_cancelled",
                 tenant_id=tenant_id,
-                details=f'{{"order_id": {order_id}}}'
+                details=json.dumps({"order_id": order_id})
             )
             logger.info(f"Order {order_id} cancelled")
 
@@ -2,20 +2,78 @@
 
 from __future__ import annotations
 
+import logging
 from decimal import Decimal
 from typing import List
 from datetime import datetime, timedelta
-from sqlmodel import select
+from sqlmodel import select, delete, update
 
-from ..models import Order, Database, encrypt, decrypt, Product, PostageType, Vendor
+from ..models import Order, Database, encrypt, decrypt, Payout, Product, PostageType, Vendor
 from .payments import PaymentService
 from .payment_factory import PaymentServiceFactory
+from .payout import PayoutService
 from .vendors import VendorService
 from .catalog import CatalogService
-from .currency import fiat_to_xmr_sync, fiat_to_crypto
+from .currency import (
+    fiat_to_crypto, to_atomic, from_atomic, apply_rate_atomic,
+    BPS_PLACES, CRYPTO_PLACES, XMR_PLACES,
+)
 from ..config import get_settings
 import asyncio
 
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import joinedload
+
+logger = logging.getLogger(__name__)
+
+
+def _as_decimal(value) -> Decimal:
+    """Return value as a Decimal; Numeric columns already load as Decimal."""
+    return value if type(value) is Decimal else Decimal(str(value))
+
+
+def purge_orders_before(db: Database, cutoff: datetime) -> int:
+    """Delete orders created before cutoff, with their payouts.
+
+    Orders with a payout still PENDING or FAILED are kept until it is
+    settled, so no owed vendor payment is lost.
+
+    Returns:
+        Number of orders deleted
+    """
+    with db.session() as session:
+        # Read first: MySQL cannot delete from a table its subquery selects
+        held = set(session.exec(
+            select(Payout.order_id).distinct().where(
+                Payout.status.not_in(PayoutService.SENT_STATES),
+                Payout.order_id.in_(select(Order.id).where(Order.created_at < cutoff)),
+            )
+        ))
+        expired = (Order.created_at < cutoff, Order.id.not_in(held))
+        # Payouts reference orders, so they go first in the same transaction
+        session.exec(delete(Payout).where(Payout.order_id.in_(select(Order.id).where(*expired))))
+        deleted = session.exec(delete(Order).where(*expired)).rowcount
+        session.commit()
+    return deleted
+
+
+# Vendor wallet attribute for each payment currency
+_WALLET_ATTRS = {
+    "XMR": "wallet_address",
+    "BTC": "btc_wallet_address",
+    "ETH": "eth_wallet_address",
+}
+
+# Columns needed by order list views; skips encrypted addresses and payment data
+ORDER_LIST_COLUMNS = (
+    Order.id,
+    Order.product_id,
+    Order.vendor_id,
+    Order.quantity,
+    Order.state,
+    Order.created_at,
+)
+
 
 class OrderService:
     """Manage orders in the database."""
@@ -33,7 +91,7 @@ class OrderService:
         self.vendors = vendors
         self.settings = get_settings()
 
-    def create_order(
+    async def create_order(
         self,
         product_id: int,
         quantity: int,
@@ -41,30 +99,32 @@ class OrderService:
         postage_type_id: int = None,
         payment_currency: str = "XMR"
     ) -> dict:
-        product = self.catalog.get_product(product_id)
-        if not product:
-            raise ValueError("Product not found")
-        if product.inventory < quantity:
-            raise ValueError(f"Insufficient inventory. Only {product.inventory} available.")
-        vendor = self.vendors.get_vendor(product.vendor_id)
-        if not vendor:
-            raise ValueError("Vendor not found")
+        # Load everything the order needs in one short read session; the
+        # connection is released before awaiting the rate conversions
+        stmt = (
+            select(Product, Vendor, PostageType)
+            .outerjoin(Vendor, Vendor.id == Product.vendor_id)
+            .outerjoin(PostageType, PostageType.id == postage_type_id)
+            .where(Product.id == product_id)
+        )
+        with self.db.session() as session:
+            row = session.exec(stmt).first()
+            if not row:
+                raise ValueError("Product not found")
+            product, vendor, postage_type = row
+            if product.inventory < quantity:
+                raise ValueError(f"Insufficient inventory. Only {product.inventory} available.")
+            if not vendor:
+                raise ValueError("Vendor not found")
 
         # Normalize payment currency
         payment_currency = payment_currency.upper()
-        if payment_currency not in ["XMR", "BTC", "ETH"]:
+        wallet_attr = _WALLET_ATTRS.get(payment_currency)
+        if wallet_attr is None:
             raise ValueError(f"Unsupported payment currency: {payment_currency}")
 
         # Check if vendor has wallet configured for chosen currency
-        import logging
-        logger = logging.getLogger(__name__)
-
-        wallet_map = {
-            "XMR": vendor.wallet_address,
-            "BTC": vendor.btc_wallet_address,
-            "ETH": vendor.eth_wallet_address
-        }
-        vendor_wallet = wallet_map.get(payment_currency)
+        vendor_wallet = getattr(vendor, wallet_attr)
 
         logger.info(f"Creating order - Vendor {vendor.id} {payment_currency} wallet: {vendor_wallet}")
 
@@ -82,16 +142,17 @@ class OrderService:
         )
 
         # Calculate total in product's fiat currency first
-        commission_rate = Decimal(str(vendor.commission_rate)) if not isinstance(vendor.commission_rate, Decimal) else vendor.commission_rate
+        commission_rate = _as_decimal(vendor.commission_rate)
+        commission_bps = to_atomic(commission_rate, BPS_PLACES)
 
         # Get product price in fiat (or convert from XMR if needed)
         if product.price_fiat and product.currency != "XMR":
             # Product priced in fiat
-            price_fiat = Decimal(str(product.price_fiat))
+            price_fiat = _as_decimal(product.price_fiat)
             product_currency = product.currency
         else:
             # Product priced in XMR, use that directly for backward compatibility
-            price_xmr = Decimal(str(product.price_xmr)) if not isinstance(product.price_xmr, Decimal) else product.price_xmr
+            price_xmr = _as_decimal(product.price_xmr)
             # For now, assume USD if converting
             product_currency = "USD"
             price_fiat = price_xmr * Decimal("150")  # Rough conversion, will be recalculated
@@ -101,41 +162,58 @@ class OrderService:
         # Calculate postage in fiat if selected
         postage_fiat = Decimal("0")
         postage_currency = product_currency
-        if postage_type_id:
-            with self.db.session() as session:
-                postage_type = session.get(PostageType, postage_type_id)
-                if postage_type and postage_type.is_active:
-                    postage_fiat = Decimal(str(postage_type.price_fiat))
-                    postage_currency = postage_type.currency
-                    # Convert to product currency if different
-                    if postage_currency != product_currency:
-                        # For simplicity, add directly (should do proper conversion in production)
-                        pass
-                    total_fiat += postage_fiat
-
-        # Convert total to chosen cryptocurrency
-        try:
-            loop = asyncio.get_event_loop()
-        except RuntimeError:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-
-        total_crypto = loop.run_until_complete(
-            fiat_to_crypto(total_fiat, product_currency, payment_currency)
-        )
+        if postage_type and postage_type.is_active:
+            postage_fiat = _as_decimal(postage_type.price_fiat)
+            postage_currency = postage_type.currency
+            # Convert to product currency if different
+            # XMR postage is added to the totals after conversion, below
+            if postage_currency != "XMR":
+                # Other currencies are added directly for simplicity
+                # (should do proper conversion in production)
+                total_fiat += postage_fiat
+
+        # Run the independent conversions concurrently; XMR orders reuse
+        # the payment total as the XMR total, and postage priced in XMR
+        # needs no conversion
+        convert_postage = postage_fiat > 0 and postage_currency != "XMR"
+        conversions = [fiat_to_crypto(total_fiat, product_currency, payment_currency)]
+        if payment_currency != "XMR":
+            conversions.append(fiat_to_crypto(total_fiat, product_currency, "XMR"))
+        if convert_postage:
+            conversions.append(fiat_to_crypto(postage_fiat, postage_currency, "XMR"))
+        converted = await asyncio.gather(*conversions)
+
+        total_crypto = converted[0]
+        total_xmr = converted[1] if payment_currency != "XMR" else total_crypto
+        if convert_postage:
+            postage_xmr = converted[-1]
+        elif postage_currency == "XMR":
+            postage_xmr = postage_fiat
+            if payment_currency == "XMR":
+                total_crypto += postage_xmr
+                total_xmr = total_crypto
+            else:
+                # Both totals come from one rate snapshot, so their ratio
+                # prices the XMR postage in the payment coin
+                places = CRYPTO_PLACES[payment_currency]
+                postage_crypto = postage_xmr * total_crypto / total_xmr
+                total_crypto += from_atomic(to_atomic(postage_crypto, places), places)
+                total_xmr += postage_xmr
+        else:
+            postage_xmr = Decimal("0")
 
-        commission_crypto = total_crypto * commission_rate
+        # Commission in integer atomic units of the payment coin
+        crypto_places = CRYPTO_PLACES[payment_currency.upper()]
+        commission_crypto = from_atomic(
+            apply_rate_atomic(to_atomic(total_crypto, crypto_places), commission_bps),
+            crypto_places,
+        )
 
         # Also calculate XMR amounts for backward compatibility
-        total_xmr = loop.run_until_complete(
-            fiat_to_crypto(total_fiat, product_currency, "XMR")
+        commission_xmr = from_atomic(
+            apply_rate_atomic(to_atomic(total_xmr, XMR_PLACES), commission_bps),
+            XMR_PLACES,
         )
-        commission_xmr = total_xmr * commission_rate
-        postage_xmr = Decimal("0")
-        if postage_fiat > 0:
-            postage_xmr = loop.run_until_complete(
-                fiat_to_crypto(postage_fiat, postage_currency, "XMR")
-            )
 
         # Encrypt delivery address
         encrypted = encrypt(address, self.settings.encryption_key)
@@ -155,24 +233,21 @@ class OrderService:
             payment_amount_crypto=total_crypto,
             commission_crypto=commission_crypto,
         )
-
-        # Save to database
+        product_name = product.name
+
+        # Reserve inventory and save the order in one short write session;
+        # the guarded decrement fails if stock sold out during the conversions
+        reserve = (
+            update(Product)
+            .where(Product.id == product_id, Product.inventory >= quantity)
+            .values(inventory=Product.inventory - quantity)
+        )
         with self.db.session() as session:
-            # Get product in this session
-            product_in_session = session.get(Product, product_id)
-            if not product_in_session:
-                raise ValueError("Product not found")
-
-            # Update inventory
-            product_in_session.inventory -= quantity
-            if product_in_session.inventory < 0:
+            if session.exec(reserve).rowcount == 0:
+                session.rollback()
                 raise ValueError("Insufficient inventory")
-
-            # Save order
             session.add(order)
-            session.add(product_in_session)
             session.commit()
-            session.refresh(order)
 
         # Return order details for user with currency info
         return {
@@ -183,169 +258,191 @@ class OrderService:
             "total_crypto": total_crypto,
             "total_xmr": total_xmr,  # Backward compatibility
             "postage_xmr": postage_xmr,
-            "product_name": product.name,
+            "product_name": product_name,
             "quantity": quantity,
             "confirmations_required": PaymentServiceFactory.get_confirmation_threshold(payment_currency)
         }
 
     def mark_paid(self, order_id: int, payout_service=None) -> Order:
+        # Load the product with the order in one query
+        stmt = select(Order).options(joinedload(Order.product)).where(Order.id == order_id)
         with self.db.session() as session:
-            order = session.get(Order, order_id)
+            order = session.exec(stmt).first()
             if not order:  # pragma: no cover
                 raise ValueError("Order not found")
             if self.payments.check_paid(order.payment_id):  # pragma: no cover
+                # Calculate vendor's share from the product loaded above
+                vendor_share = None  # pragma: no cover
+                if payout_service and order.product:  # pragma: no cover
+                    vendor_share = self._vendor_share(order)  # pragma: no cover
+
+                # The order is already in the session and stays loaded after commit
                 order.state = "PAID"  # pragma: no cover
-                session.add(order)  # pragma: no cover
                 session.commit()  # pragma: no cover
-                session.refresh(order)  # pragma: no cover
 
                 # Create payout record for vendor
-                if payout_service:  # pragma: no cover
-                    product = session.get(Product, order.product_id)  # pragma: no cover
-                    if product:  # pragma: no cover
-                        # Calculate vendor's share (total - commission)
-                        price_xmr = Decimal(str(product.price_xmr))  # pragma: no cover
-                        total_xmr = price_xmr * order.quantity + order.postage_xmr  # pragma: no cover
-                        vendor_share = total_xmr - order.commission_xmr  # pragma: no cover
-                        payout_service.create_payout(order.id, order.vendor_id, vendor_share)  # pragma: no cover
+                if vendor_share is not None:  # pragma: no cover
+                    payout_service.create_payout(order.id, order.vendor_id, vendor_share)  # pragma: no cover
             return order
 
-    def _load_order_attrs(self, order: Order) -> None:
-        """Ensure all order attributes are loaded before session closes."""
-        if order:
-            _ = order.id, order.product_id, order.vendor_id, order.quantity
-            _ = order.payment_id, order.address_encrypted, order.commission_xmr
-            _ = order.state, order.postage_type_id, order.postage_xmr
-            _ = order.shipped_at, order.shipping_note, order.created_at
+    @staticmethod
+    def _vendor_share(order: Order) -> Decimal:
+        """Vendor's share of an order (total - commission); needs order.product loaded."""
+        price_xmr = _as_decimal(order.product.price_xmr)
+        total_units = (
+            to_atomic(price_xmr, XMR_PLACES) * order.quantity
+            + to_atomic(order.postage_xmr, XMR_PLACES)
+        )
+        vendor_units = total_units - to_atomic(order.commission_xmr, XMR_PLACES)
+        return from_atomic(vendor_units, XMR_PLACES)
 
     def get_order(self, order_id: int) -> Order | None:
         """Retrieve a single order."""
         with self.db.session() as session:
-            order = session.get(Order, order_id)
-            self._load_order_attrs(order)
-            return order
+            return session.get(Order, order_id)
 
     def get_payment_info(self, order_id: int, coin: str = "XMR") -> dict:
         """Get payment info for an order."""
+        # Only the columns needed here, in one query
+        stmt = (
+            select(Order.payment_id, Order.quantity, Product.id, Product.price_xmr, Vendor.wallet_address)
+            .outerjoin(Product, Product.id == Order.product_id)
+            .outerjoin(Vendor, Vendor.id == Order.vendor_id)
+            .where(Order.id == order_id)
+        )
         with self.db.session() as session:
-            order = session.get(Order, order_id)
-            if not order:
-                raise ValueError("Order not found")
+            row = session.exec(stmt).first()
+        if not row:
+            raise ValueError("Order not found")
+        payment_id, quantity, product_id, price_xmr, vendor_wallet = row
+        if product_id is None:
+            raise ValueError("Product not found")
 
-            product = session.get(Product, order.product_id)
-            if not product:
-                raise ValueError("Product not found")
+        # Integer atomic units for the total, formatted back to Decimal once
+        total_xmr = from_atomic(to_atomic(_as_decimal(price_xmr), XMR_PLACES) * quantity, XMR_PLACES)
 
-            vendor = session.get(Vendor, order.vendor_id)
-            vendor_wallet = getattr(vendor, "wallet_address", None)
-
-            # Use Decimal for precise calculation
-            price_xmr = Decimal(str(product.price_xmr)) if not isinstance(product.price_xmr, Decimal) else product.price_xmr
-            total_xmr = price_xmr * Decimal(order.quantity)
-
-            # For XMR, use the existing payment address
-            coin_upper = coin.upper()
-            if coin_upper == "XMR":
-                payment_address = self.payments.get_address_for_payment_id(
-                    order.payment_id,
-                    vendor_wallet=vendor_wallet
-                )
-                return {
-                    "amount": total_xmr,
-                    "address": payment_address,
-                    "coin": coin_upper,
-                    "payment_id": order.payment_id
-                }
-
-            # For other coins, return placeholder (crypto swap integration needed)
+        # For XMR, use the existing payment address
+        coin_upper = coin.upper()
+        if coin_upper == "XMR":
+            payment_address = self.payments.get_address_for_payment_id(
+                payment_id,
+                vendor_wallet=vendor_wallet
+            )
             return {
                 "amount": total_xmr,
-                "address": "Payment address pending...",
-                "coin": coin_upper
+                "address": payment_address,
+                "coin": coin_upper,
+                "payment_id": payment_id
             }
 
-    def fulfill_order(self, order_id: int) -> Order:
-        """Mark a paid order as fulfilled."""
+        # For other coins, return placeholder (crypto swap integration needed)
+        return {
+            "amount": total_xmr,
+            "address": "Payment address pending...",
+            "coin": coin_upper
+        }
+
+    def _update_order(
+        self, order_id: int, values: dict, required_state: str | None = None
+    ) -> tuple[Order | None, bool]:
+        """Apply a state transition with one UPDATE, then load the order once.
+
+        Args:
+            order_id: Order to update
+            values: Column values to set
+            required_state: Only update if the order is currently in this state
+
+        Returns:
+            The order (None if it does not exist) and whether the update applied
+        """
+        stmt = update(Order).where(Order.id == order_id)
+        if required_state is not None:
+            stmt = stmt.where(Order.state == required_state)
         with self.db.session() as session:
-            order = session.get(Order, order_id)
-            if not order:  # pragma: no cover
-                raise ValueError("Order not found")
-            order.state = "FULFILLED"
-            session.add(order)
+            result = session.exec(stmt.values(**values))
             session.commit()
-            session.refresh(order)
-            return order
+            return session.get(Order, order_id), result.rowcount > 0
+
+    def fulfill_order(self, order_id: int) -> Order:
+        """Mark a paid order as fulfilled."""
+        order, _ = self._update_order(order_id, {"state": "FULFILLED"})
+        if not order:  # pragma: no cover
+            raise ValueError("Order not found")
+        return order
 
     def cancel_order(self, order_id: int) -> Order:
         """Cancel an order."""
-        with self.db.session() as session:
-            order = session.get(Order, order_id)
-            if not order:  # pragma: no cover
-                raise ValueError("Order not found")
-            order.state = "CANCELLED"
-            session.add(order)
-            session.commit()
-            session.refresh(order)
-            return order
-
-    def list_orders(self) -> List[Order]:
-        with self.db.session() as session:
-            orders = list(session.exec(select(Order)))
-            for order in orders:
-                self._load_order_attrs(order)
-            return orders
+        order, _ = self._update_order(order_id, {"state": "CANCELLED"})
+        if not order:  # pragma: no cover
+            raise ValueError("Order not found")
+        return order
+
+    def list_orders(
+        self, limit: int = 50, offset: int = 0, state: str | None = None
+    ) -> List[Row]:
+        """List one page of orders, newest first, as rows of ORDER_LIST_COLUMNS."""
+        stmt = select(*ORDER_LIST_COLUMNS)
+        if state is not None:
+            stmt = stmt.where(Order.state == state)
+        return self._list_page(stmt, limit, offset)
 
     def get_address(self, order: Order) -> str:
         return decrypt(order.address_encrypted, self.settings.encryption_key)
 
-    def purge_old_orders(self) -> None:
-        """Delete orders older than retention days."""
-        cutoff = datetime.utcnow() - timedelta(days=self.settings.data_retention_days)
+    def purge_old_orders(self, now: datetime | None = None) -> None:
+        """Delete orders older than retention days, with their payouts.
+
+        Orders with a payout still PENDING or FAILED are kept until it is
+        settled, so no owed vendor payment is lost.
+
+        now is the naive UTC time the retention window ends at, defaulting
+        to the current time.
+        """
+        cutoff = (now or datetime.utcnow()) - timedelta(days=self.settings.data_retention_days)
+        purge_orders_before(self.db, cutoff)
+
+    def list_orders_by_vendor(
+        self, vendor_id: int, limit: int = 50, offset: int = 0, state: str | None = None
+    ) -> List[Row]:
+        """List one page of a vendor's orders, newest first, as rows of ORDER_LIST_COLUMNS."""
+        stmt = select(*ORDER_LIST_COLUMNS).where(Order.vendor_id == vendor_id)
+        if state is not None:
+            stmt = stmt.where(Order.state == state)
+        return self._list_page(stmt, limit, offset)
+
+    def _list_page(self, stmt, limit: int, offset: int) -> List[Row]:
+        """Run a list query for one page, newest first."""
+        stmt = (
+            stmt.order_by(Order.created_at.desc(), Order.id.desc())
+            .limit(limit)
+            .offset(offset)
+        )
         with self.db.session() as session:
-            old_orders = session.exec(select(Order).where(Order.created_at < cutoff))
-            for order in list(old_orders):
-                session.delete(order)
-            session.commit()
-
-    def list_orders_by_vendor(self, vendor_id: int) -> List[Order]:
-        """List all orders for a specific vendor."""
-        with self.db.session() as session:
-            stmt = select(Order).where(Order.vendor_id == vendor_id).order_by(Order.created_at.desc())
-            orders = list(session.exec(stmt))
-            for order in orders:
-                self._load_order_attrs(order)
-            return orders
-
-    def mark_shipped(self, order_id: int, shipping_note: str = None) -> Order:
-        """Mark an order as shipped with optional note."""
-        with self.db.session() as session:
-            order = session.get(Order, order_id)
-            if not order:
-                raise ValueError("Order not found")
-            if order.state != "PAID":
-                raise ValueError(f"Cannot ship order in state: {order.state}")
-
-            order.state = "SHIPPED"
-            order.shipped_at = datetime.utcnow()
-            if shipping_note:
-                order.shipping_note = shipping_note
-
-            session.add(order)
-            session.commit()
-            session.refresh(order)
-            return order
+            return list(session.exec(stmt))
+
+    def mark_shipped(
+        self, order_id: int, shipping_note: str = None, now: datetime | None = None
+    ) -> Order:
+        """Mark an order as shipped with optional note.
+
+        now is the naive UTC ship time, defaulting to the current time.
+        """
+        values = {"state": "SHIPPED", "shipped_at": now or datetime.utcnow()}
+        if shipping_note:
+            values["shipping_note"] = shipping_note
+
+        order, updated = self._update_order(order_id, values, required_state="PAID")
+        if not order:
+            raise ValueError("Order not found")
+        if not updated:
+            raise ValueError(f"Cannot ship order in state: {order.state}")
+        return order
 
     def mark_completed(self, order_id: int) -> Order:
         """Mark an order as completed."""
-        with self.db.session() as session:
-            order = session.get(Order, order_id)
-            if not order:
-                raise ValueError("Order not found")
-            if order.state != "SHIPPED":
-                raise ValueError(f"Cannot complete order in state: {order.state}")
-
-            order.state = "COMPLETED"
-            session.add(order)
-            session.commit()
-            session.refresh(order)
-            return order
+        order, updated = self._update_order(order_id, {"state": "COMPLETED"}, required_state="SHIPPED")
+        if not order:
+            raise ValueError("Order not found")
+        if not updated:
+            raise ValueError(f"Cannot complete order in state: {order.state}")
+        return order
@@ -2,8 +2,11 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
-from typing import Union
+import threading
+from types import MappingProxyType
+from typing import Mapping, Union
 
 from .payment_protocol import PaymentServiceProtocol, PaymentError
 from .payments import MoneroPaymentService
@@ -17,15 +20,22 @@ logger = logging.getLogger(__name__)
 PaymentService = Union[MoneroPaymentService, BitcoinPaymentService, EthereumPaymentService]
 
 
+# Payment service class for each supported currency
+_SERVICE_CLASSES: Mapping[str, type] = MappingProxyType({
+    "XMR": MoneroPaymentService,
+    "BTC": BitcoinPaymentService,
+    "ETH": EthereumPaymentService,
+})
+
 # Supported currencies
-SUPPORTED_CURRENCIES = ["XMR", "BTC", "ETH"]
+SUPPORTED_CURRENCIES = list(_SERVICE_CLASSES)
 
 # Confirmation thresholds per currency
-CONFIRMATION_THRESHOLDS = {
+CONFIRMATION_THRESHOLDS: Mapping[str, int] = MappingProxyType({
     "XMR": 10,  # ~20 minutes
     "BTC": 6,   # ~1 hour
     "ETH": 12,  # ~3 minutes
-}
+})
 
 
 class UnsupportedCurrencyError(PaymentError):
@@ -43,7 +53,9 @@ class PaymentServiceFactory:
     """
 
     # Singleton instances (cached for efficiency)
-    _instances = {}
+    _instances: dict[str, PaymentService] = {}
+    # Serialises construction so concurrent callers share one instance
+    _lock = threading.Lock()
 
     @classmethod
     def create(cls, currency: str) -> PaymentService:
@@ -63,33 +75,26 @@ class PaymentServiceFactory:
             >>> service = PaymentServiceFactory.create("BTC")
             >>> address, payment_id = service.create_address(vendor_wallet="1ABC...")
         """
-        currency = currency.upper()
+        # Return cached instance if available
+        service = cls._instances.get(currency)
+        if service is not None:
+            return service
 
-        if currency not in SUPPORTED_CURRENCIES:
+        currency = currency.upper()
+        service_class = _SERVICE_CLASSES.get(currency)
+        if service_class is None:
             raise UnsupportedCurrencyError(
                 f"Currency '{currency}' is not supported. "
                 f"Supported currencies: {', '.join(SUPPORTED_CURRENCIES)}"
             )
 
-        # Return cached instance if available
-        if currency in cls._instances:
-            return cls._instances[currency]
-
-        # Create new instance
-        if currency == "XMR":
-            service = MoneroPaymentService()
-        elif currency == "BTC":
-            service = BitcoinPaymentService()
-        elif currency == "ETH":
-            service = EthereumPaymentService()
-        else:
-            # Should never reach here due to validation above
-            raise UnsupportedCurrencyError(f"Unsupported currency: {currency}")
-
-        # Cache the instance
-        cls._instances[currency] = service
-
-        logger.info(f"Created payment service for {currency}")
+        with cls._lock:
+            # Another thread may have created it while we waited
+            service = cls._instances.get(currency)
+            if service is None:
+                service = service_class()
+                cls._instances[currency] = service
+                logger.info(f"Created payment service for {currency}")
         return service
 
     @classmethod
@@ -127,7 +132,7 @@ class PaymentServiceFactory:
             >>> PaymentServiceFactory.is_supported("DOGE")
             False
         """
-        return currency.upper() in SUPPORTED_CURRENCIES
+        return currency.upper() in _SERVICE_CLASSES
 
     @classmethod
     def get_supported_currencies(cls) -> list[str]:
@@ -143,6 +148,33 @@ class PaymentServiceFactory:
         """
         return SUPPORTED_CURRENCIES.copy()
 
+    @classmethod
+    async def start_all(cls) -> None:
+        """
+        Start background work (e.g. block watchers) for services that have any.
+
+        Called on bot startup.
+        """
+        for currency, service_class in _SERVICE_CLASSES.items():
+            if not asyncio.iscoroutinefunction(getattr(service_class, "start", None)):
+                continue
+            try:
+                await cls.create(currency).start()
+            except Exception as e:
+                logger.warning(f"Could not start {currency} payment service: {e}")
+
+    @classmethod
+    async def close_all(cls) -> None:
+        """
+        Close network resources (e.g. HTTP sessions) held by cached instances.
+
+        Called on bot shutdown.
+        """
+        for service in cls._instances.values():
+            close = getattr(service, "close", None)
+            if close is not None and asyncio.iscoroutinefunction(close):
+                await close()
+
     @classmethod
     def clear_cache(cls):
         """
@@ -150,7 +182,8 @@ class PaymentServiceFactory:
 
         Useful for testing or when configuration changes.
         """
-        cls._instances.clear()
+        with cls._lock:
+            cls._instances.clear()
         logger.info("Cleared payment service cache")
 
 
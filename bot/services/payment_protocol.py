@@ -5,6 +5,9 @@ from __future__ import annotations
 from decimal import Decimal
 from typing import Protocol, Tuple, Optional, runtime_checkable
 
+# Seconds between background checks of pending order payments
+PAYMENT_CHECK_INTERVAL = 300
+
 
 class RetryableError(Exception):
     """Error that indicates the operation should be retried."""
@@ -94,6 +97,10 @@ class PaymentServiceProtocol(Protocol):
         ...
 
 
+# Methods every payment service must provide
+REQUIRED_METHODS = ("create_address", "check_paid", "get_confirmations", "get_balance")
+
+
 def validate_payment_service(service: object) -> bool:
     """
     Validate that an object implements the PaymentServiceProtocol.
@@ -107,9 +114,10 @@ def validate_payment_service(service: object) -> bool:
     Raises:
         TypeError: If service doesn't implement required methods
     """
-    if not isinstance(service, PaymentServiceProtocol):
+    missing = [name for name in REQUIRED_METHODS if not callable(getattr(service, name, None))]
+    if missing:
         raise TypeError(
             f"{type(service).__name__} does not implement PaymentServiceProtocol. "
-            f"Required methods: create_address, check_paid, get_confirmations, get_balance"
+            f"Missing methods: {', '.join(missing)}"
         )
     return True
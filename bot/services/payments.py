@@ -2,9 +2,12 @@
 
 from __future__ import annotations
 
-import uuid
+import secrets
 import logging
-from typing import Tuple, Optional
+from collections import OrderedDict
+import threading
+import time
+from typing import Iterable, Mapping, Tuple, Optional
 from decimal import Decimal
 from urllib.parse import urlparse
 
@@ -17,10 +20,23 @@ logger = logging.getLogger(__name__)
 
 class MoneroPaymentService:
     """Production Monero payment service."""
-    
+
+    BALANCE_CACHE_TTL = 5.0  # Seconds a wallet balance is served from memory
+    INCOMING_CACHE_TTL = 3.0  # Seconds a payment ID's incoming transfers are reused
+    INCOMING_CACHE_SIZE = 1024  # Entries kept before expired ones are pruned
+    PAID_CACHE_SIZE = 4096  # Verified payments remembered, least recently used evicted
+
     def __init__(self):
         self.settings = get_settings()
         self._wallet = None
+        # (balance, time.monotonic() of lookup)
+        self._balance_cache: Optional[Tuple[Decimal, float]] = None
+        # Serialises balance RPCs so concurrent callers share one lookup
+        self._balance_lock = threading.Lock()
+        # payment_id -> (incoming transfers, time.monotonic() of lookup)
+        self._incoming_cache: dict[str, Tuple[list, float]] = {}
+        # payment_id -> total received, for payments already seen as paid
+        self._paid_cache: OrderedDict[str, Decimal] = OrderedDict()
 
     def _split_rpc_url(self, rpc_url: str) -> tuple[str, int]:
         if "://" in rpc_url:
@@ -79,17 +95,44 @@ class MoneroPaymentService:
         Args:
             vendor_wallet: Optional vendor wallet address to use as fallback
         """
-        payment_id = uuid.uuid4().hex[:16]  # 16 char payment ID for Monero
+        payment_id = secrets.token_hex(8)  # 16 char payment ID for Monero
         address = self.get_address_for_payment_id(payment_id, vendor_wallet=vendor_wallet)
         return address, payment_id
     
+    def _incoming(self, wallet, payment_id: str) -> list:
+        """Incoming transfers for a payment ID, reused for INCOMING_CACHE_TTL.
+
+        check_paid and get_confirmations are polled back to back for the
+        same order, so they share one RPC.
+        """
+        now = time.monotonic()
+        cached = self._incoming_cache.get(payment_id)
+        if cached is not None and now - cached[1] < self.INCOMING_CACHE_TTL:
+            return cached[0]
+
+        transfers = list(wallet.incoming(payment_id=payment_id))
+        if len(self._incoming_cache) >= self.INCOMING_CACHE_SIZE:
+            # Drop expired entries so the cache only holds recent polls
+            self._incoming_cache = {
+                key: value for key, value in self._incoming_cache.items()
+                if now - value[1] < self.INCOMING_CACHE_TTL
+            }
+        self._incoming_cache[payment_id] = (transfers, now)
+        return transfers
+
     def check_paid(self, payment_id: str, expected_amount: Optional[Decimal] = None) -> bool:
         """Check if payment has been received."""
+        # Received funds don't go away, so a verified payment skips the RPC
+        total_received = self._paid_cache.get(payment_id)
+        if total_received is not None and not (expected_amount and total_received < expected_amount):
+            self._paid_cache.move_to_end(payment_id)
+            return True
+
         try:
             wallet = self._get_wallet()
             if wallet:
                 # Check incoming transfers with payment ID
-                transfers = wallet.incoming(payment_id=payment_id)
+                transfers = self._incoming(wallet, payment_id)
 
                 if not transfers:
                     return False
@@ -105,6 +148,10 @@ class MoneroPaymentService:
                     )
                     return False
 
+                self._paid_cache[payment_id] = total_received
+                self._paid_cache.move_to_end(payment_id)
+                if len(self._paid_cache) > self.PAID_CACHE_SIZE:
+                    self._paid_cache.popitem(last=False)
                 return True
 
         except Exception as e:
@@ -116,12 +163,65 @@ class MoneroPaymentService:
 
         raise RetryableError("Failed to check payment status")
 
+    def check_paid_bulk(
+        self,
+        payment_ids: Iterable[str],
+        expected_amounts: Optional[Mapping[str, Decimal]] = None
+    ) -> set[str]:
+        """Check many payment IDs with a single get_bulk_payments RPC.
+
+        Args:
+            payment_ids: Payment IDs to check
+            expected_amounts: Optional minimum amount per payment ID
+
+        Returns:
+            The payment IDs that have received payment
+        """
+        payment_ids = list(payment_ids)
+        if not payment_ids:
+            return set()
+
+        try:
+            wallet = self._get_wallet()
+            if wallet:
+                # A list of payment IDs is sent as one get_bulk_payments call
+                transfers = wallet.incoming(payment_id=payment_ids)
+
+                received: dict[str, Decimal] = {}
+                for t in transfers:
+                    key = str(t.payment_id)
+                    received[key] = received.get(key, Decimal("0")) + t.amount
+
+                paid = set()
+                for payment_id in payment_ids:
+                    total_received = received.get(payment_id)
+                    if total_received is None:
+                        continue
+                    expected_amount = (expected_amounts or {}).get(payment_id)
+                    if expected_amount and total_received < expected_amount:
+                        logger.warning(
+                            f"Payment {payment_id} received {total_received} XMR, "
+                            f"expected {expected_amount} XMR"
+                        )
+                        continue
+                    paid.add(payment_id)
+                return paid
+
+        except Exception as e:
+            logger.error(f"Failed to check payment status: {e}")
+
+        # Fallback for development/testing or when RPC not configured
+        if self.settings.environment == "development" or not self.settings.monero_rpc_url:
+            return set()  # In demo mode, payments stay pending
+
+        raise RetryableError("Failed to check payment status")
+
     def get_confirmations(self, payment_id: str) -> int:
         """Get the number of confirmations for a payment."""
         try:
             wallet = self._get_wallet()
             if wallet:
-                transfers = wallet.incoming(payment_id=payment_id)
+                transfers = self._incoming(wallet, payment_id)
                 if transfers:
                     min_confirmations = min(
                         t.transaction.confirmations or 0 for t in transfers
@@ -133,14 +233,25 @@ class MoneroPaymentService:
         return 0
 
     def get_balance(self) -> Decimal:
-        """Get wallet balance."""
-        try:
-            wallet = self._get_wallet()
-            if wallet:
-                return wallet.balance()
-        except Exception as e:
-            logger.error(f"Failed to get wallet balance: {e}")
-        
+        """Get wallet balance, cached for BALANCE_CACHE_TTL."""
+        cached = self._balance_cache
+        if cached is not None and time.monotonic() - cached[1] < self.BALANCE_CACHE_TTL:
+            return cached[0]
+
+        with self._balance_lock:
+            # Another caller may have refreshed it while we waited
+            cached = self._balance_cache
+            if cached is not None and time.monotonic() - cached[1] < self.BALANCE_CACHE_TTL:
+                return cached[0]
+            try:
+                wallet = self._get_wallet()
+                if wallet:
+                    balance = wallet.balance()
+                    self._balance_cache = (balance, time.monotonic())
+                    return balance
+            except Exception as e:
+                logger.error(f"Failed to get wallet balance: {e}")
+
         return Decimal("0")
 
 
@@ -2,14 +2,17 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
+import time
 from datetime import datetime
 from decimal import Decimal
-from typing import Optional, List
-from sqlmodel import select
+from typing import Optional, List, Tuple
+from sqlmodel import case, func, select
 
 from ..models import Database, PlatformSettings, Payout, Order, Vendor
 from ..config import get_settings
+from .payment_factory import PaymentServiceFactory
 
 logger = logging.getLogger(__name__)
 
@@ -19,19 +22,36 @@ class PayoutService:
 
     # Default settings
     DEFAULT_COMMISSION_RATE = Decimal("0.05")  # 5%
+    SETTINGS_CACHE_TTL = 30  # Seconds a platform setting is served from memory
+    PAID_STATES = ("PAID", "SHIPPED", "COMPLETED")  # Orders that earn commission
+    SENT_STATES = ("SENT", "CONFIRMED")  # Payouts that have left the wallet
+    PAYOUT_BATCH_SIZE = 256  # Pending payouts loaded per query in process_payouts
 
     def __init__(self, db: Database):
         self.db = db
         self.settings = get_settings()
+        # Every platform setting as key -> value, loaded together
+        self._settings_kv: Optional[dict[str, str]] = None
+        self._settings_loaded_at = 0.0  # time.monotonic() of the last load
+        # Last parsed commission rate as (setting string, rate)
+        self._commission_rate: Optional[Tuple[str, Decimal]] = None
 
     # Platform Settings Management
 
+    def _load_settings(self) -> dict[str, str]:
+        """Load all platform settings in one query, cached for SETTINGS_CACHE_TTL."""
+        now = time.monotonic()
+        if self._settings_kv is None or now - self._settings_loaded_at >= self.SETTINGS_CACHE_TTL:
+            with self.db.session() as session:
+                rows = session.exec(select(PlatformSettings.key, PlatformSettings.value))
+                self._settings_kv = {key: value for key, value in rows}
+            self._settings_loaded_at = now
+        return self._settings_kv
+
     def get_setting(self, key: str, default: str = "") -> str:
         """Get a platform setting value."""
-        with self.db.session() as session:
-            stmt = select(PlatformSettings).where(PlatformSettings.key == key)
-            setting = session.exec(stmt).first()
-            return setting.value if setting else default
+        value = self._load_settings().get(key)
+        return value if value is not None else default
 
     def set_setting(self, key: str, value: str) -> PlatformSettings:
         """Set a platform setting value."""
@@ -47,16 +67,21 @@ class PayoutService:
 
             session.add(setting)
             session.commit()
-            session.refresh(setting)
+            if self._settings_kv is not None:
+                self._settings_kv[key] = setting.value
             return setting
 
     def get_platform_commission_rate(self) -> Decimal:
         """Get the platform commission rate."""
         rate_str = self.get_setting("commission_rate", str(self.DEFAULT_COMMISSION_RATE))
+        if self._commission_rate is not None and self._commission_rate[0] == rate_str:
+            return self._commission_rate[1]
         try:
-            return Decimal(rate_str)
+            rate = Decimal(rate_str)
         except Exception:
-            return self.DEFAULT_COMMISSION_RATE
+            rate = self.DEFAULT_COMMISSION_RATE
+        self._commission_rate = (rate_str, rate)
+        return rate
 
     def set_platform_commission_rate(self, rate: Decimal) -> None:
         """Set the platform commission rate."""
@@ -133,14 +158,23 @@ class PayoutService:
         with self.db.session() as session:
             session.add(payout)
             session.commit()
-            session.refresh(payout)
             logger.info(f"Created payout {payout.id} for vendor {vendor_id}: {amount} {currency}")
             return payout
 
-    def get_pending_payouts(self) -> List[Payout]:
-        """Get all pending payouts."""
+    def get_pending_payouts(self, limit: Optional[int] = None, after_id: int = 0) -> List[Payout]:
+        """Get pending payouts in ID order, optionally one page at a time.
+
+        Args:
+            limit: Maximum number of payouts to return
+            after_id: Only return payouts with a greater ID
+        """
         with self.db.session() as session:
             stmt = select(Payout).where(Payout.status == "PENDING")
+            if after_id:
+                stmt = stmt.where(Payout.id > after_id)
+            stmt = stmt.order_by(Payout.id)
+            if limit is not None:
+                stmt = stmt.limit(limit)
             return list(session.exec(stmt))
 
     def get_vendor_payouts(self, vendor_id: int) -> List[Payout]:
@@ -152,14 +186,13 @@ class PayoutService:
     def mark_payout_sent(self, payout_id: int, tx_hash: str) -> Optional[Payout]:
         """Mark a payout as sent with transaction hash."""
         with self.db.session() as session:
+            # The payout stays loaded after commit, so it is not refreshed
             payout = session.get(Payout, payout_id)
             if payout:
                 payout.status = "SENT"
                 payout.tx_hash = tx_hash
                 payout.sent_at = datetime.utcnow()
-                session.add(payout)
                 session.commit()
-                session.refresh(payout)
                 logger.info(f"Payout {payout_id} sent: {tx_hash}")
             return payout
 
@@ -169,9 +202,7 @@ class PayoutService:
             payout = session.get(Payout, payout_id)
             if payout:
                 payout.status = "CONFIRMED"
-                session.add(payout)
                 session.commit()
-                session.refresh(payout)
             return payout
 
     def mark_payout_failed(self, payout_id: int, error: str = "") -> Optional[Payout]:
@@ -180,9 +211,7 @@ class PayoutService:
             payout = session.get(Payout, payout_id)
             if payout:
                 payout.status = "FAILED"
-                session.add(payout)
                 session.commit()
-                session.refresh(payout)
                 logger.error(f"Payout {payout_id} failed: {error}")
             return payout
 
@@ -192,19 +221,36 @@ class PayoutService:
 
         Returns summary of processed payouts.
         """
-        from ..services.payments import MoneroPaymentService
-
         results = {"processed": 0, "sent": 0, "failed": 0, "skipped": 0}
-        payment_service = MoneroPaymentService()
+        # Shared instance, so the wallet RPC connection outlives each run
+        payment_service = PaymentServiceFactory.create("XMR")
+
+        # Work through the backlog a page at a time so memory stays bounded
+        after_id = 0
+        while True:
+            pending = self.get_pending_payouts(limit=self.PAYOUT_BATCH_SIZE, after_id=after_id)
+            if not pending:
+                break
+            results["processed"] += len(pending)
+            await self._send_payouts(pending, payment_service, results)
+            if len(pending) < self.PAYOUT_BATCH_SIZE:
+                break
+            after_id = pending[-1].id
 
-        pending = self.get_pending_payouts()
-        results["processed"] = len(pending)
+        return results
 
-        for payout in pending:
-            # Get vendor wallet address
-            with self.db.session() as session:
-                vendor = session.get(Vendor, payout.vendor_id)
+    async def _send_payouts(self, pending: List[Payout], payment_service, results: dict) -> None:
+        """Send a page of pending payouts, counting outcomes into results."""
+        # Load every payout's vendor in one query
+        vendor_ids = {payout.vendor_id for payout in pending}
+        with self.db.session() as session:
+            vendors = {
+                vendor.id: vendor
+                for vendor in session.exec(select(Vendor).where(Vendor.id.in_(vendor_ids)))
+            }
 
+        for payout in pending:
+            vendor = vendors.get(payout.vendor_id)
             if not vendor or not vendor.wallet_address:
                 logger.warning(
                     f"Skipping payout {payout.id}: vendor {payout.vendor_id} has no wallet"
@@ -216,8 +262,11 @@ class PayoutService:
                 # Send the payment via Monero RPC
                 wallet = payment_service._get_wallet()
                 if wallet:
-                    # Use monero library to send
-                    tx = wallet.transfer(
+                    # The monero library blocks on the RPC, so send from a
+                    # worker thread; transfers stay sequential because the
+                    # wallet can only spend its unlocked outputs once
+                    tx = await asyncio.to_thread(
+                        wallet.transfer,
                         vendor.wallet_address,
                         payout.amount_xmr
                     )
@@ -236,50 +285,51 @@ class PayoutService:
                 results["failed"] += 1
                 logger.error(f"Failed to process payout {payout.id}: {e}")
 
-        return results
-
     def get_platform_earnings(self) -> dict[str, Decimal]:
         """Get platform commission earnings by currency."""
+        currency = func.coalesce(Order.payment_currency, "XMR")
+        # Per-currency commission, falling back to the legacy XMR field
+        commission = case(
+            (Order.commission_crypto != 0, Order.commission_crypto),
+            (currency == "XMR", Order.commission_xmr),
+            else_=0,
+        )
         with self.db.session() as session:
-            orders = session.exec(
-                select(Order).where(Order.state.in_(["PAID", "SHIPPED", "COMPLETED"]))
+            rows = session.exec(
+                select(currency, func.sum(commission))
+                .where(Order.state.in_(self.PAID_STATES))
+                .group_by(currency)
             ).all()
 
-            earnings = {"XMR": Decimal(0), "BTC": Decimal(0), "ETH": Decimal(0)}
-
-            for order in orders:
-                currency = getattr(order, 'payment_currency', 'XMR') or 'XMR'
-                commission = getattr(order, 'commission_crypto', None)
-                if commission:
-                    earnings[currency] += commission
-                elif currency == "XMR":
-                    # Fallback to legacy field
-                    earnings[currency] += order.commission_xmr
-
-            return earnings
+        earnings = {"XMR": Decimal(0), "BTC": Decimal(0), "ETH": Decimal(0)}
+        for code, total in rows:
+            earnings[code] = earnings.get(code, Decimal(0)) + (total or Decimal(0))
+        return earnings
 
     def get_platform_stats(self) -> dict:
         """Get platform statistics for super admin."""
+        paid = Order.state.in_(self.PAID_STATES)
+        pending = Payout.status == "PENDING"
+        sent = Payout.status.in_(self.SENT_STATES)
         with self.db.session() as session:
-            # Total orders
-            orders = list(session.exec(select(Order)))
-            total_orders = len(orders)
-            paid_orders = len([o for o in orders if o.state in ("PAID", "SHIPPED", "COMPLETED")])
-
-            # Total commission earned
-            total_commission = sum(o.commission_xmr for o in orders if o.state in ("PAID", "SHIPPED", "COMPLETED"))
-
-            # Pending payouts
-            pending_payouts = list(session.exec(
-                select(Payout).where(Payout.status == "PENDING")
-            ))
-            pending_amount = sum(p.amount_xmr for p in pending_payouts)
-
-            # Sent payouts
-            sent_payouts = list(session.exec(
-                select(Payout).where(Payout.status.in_(["SENT", "CONFIRMED"]))
-            ))
-            sent_amount = sum(p.amount_xmr for p in sent_payouts)
+            # Order counts and commission earned, aggregated in SQL
+            total_orders, paid_orders, total_commission = session.exec(
+                select(
+                    func.count(Order.id),
+                    func.count(case((paid, 1))),
+                    func.sum(case((paid, Order.commission_xmr), else_=0)),
+                )
+            ).one()
+
+            # Pending and sent payouts
+            pending_count, pending_amount, sent_count, sent_amount = session.exec(
+                select(
+                    func.count(case((pending, 1))),
+                    func.sum(case((pending, Payout.amount_xmr), else_=0)),
+                    func.count(case((sent, 1))),
+                    func.sum(case((sent, Payout.amount_xmr), else_=0)),
+                )
+            ).one()
 
             # Get earnings by currency
             earnings = self.get_platform_earnings()
@@ -287,12 +337,12 @@ class PayoutService:
             return {
                 "total_orders": total_orders,
                 "paid_orders": paid_orders,
-                "total_commission_xmr": total_commission,
+                "total_commission_xmr": total_commission or Decimal(0),
                 "commission_earnings": earnings,
-                "pending_payouts": len(pending_payouts),
-                "pending_payout_amount_xmr": pending_amount,
-                "completed_payouts": len(sent_payouts),
-                "completed_payout_amount_xmr": sent_amount,
+                "pending_payouts": pending_count,
+                "pending_payout_amount_xmr": pending_amount or Decimal(0),
+                "completed_payouts": sent_count,
+                "completed_payout_amount_xmr": sent_amount or Decimal(0),
                 "commission_rate": self.get_platform_commission_rate(),
                 "platform_wallet_xmr": self.get_platform_wallet("XMR"),
                 "platform_wallet_btc": self.get_platform_wallet("BTC"),
@@ -5,6 +5,7 @@ from __future__ import annotations
 from typing import List, Optional
 from decimal import Decimal
 from sqlmodel import select
+from sqlalchemy.engine import Row
 
 from ..models import Database, PostageType
 
@@ -35,7 +36,6 @@ class PostageService:
         with self.db.session() as session:
             session.add(postage)
             session.commit()
-            session.refresh(postage)
             return postage
 
     def get_postage_type(self, postage_id: int) -> Optional[PostageType]:
@@ -59,6 +59,19 @@ class PostageService:
                 _ = pt.id, pt.vendor_id, pt.name, pt.description, pt.price_fiat, pt.currency, pt.is_active
             return postage_types
 
+    def list_active_for_menu(self, vendor_id: int) -> List[Row]:
+        """List a vendor's active postage types with only the menu columns."""
+        with self.db.session() as session:
+            stmt = select(
+                PostageType.id,
+                PostageType.name,
+                PostageType.description,
+                PostageType.price_fiat,
+                PostageType.currency,
+                PostageType.is_active,
+            ).where(PostageType.vendor_id == vendor_id, PostageType.is_active == True)
+            return list(session.exec(stmt))
+
     def update_postage_type(self, postage_id: int, **kwargs) -> Optional[PostageType]:
         """Update a postage type."""
         with self.db.session() as session:
@@ -69,7 +82,6 @@ class PostageService:
                         setattr(postage, key, value)
                 session.add(postage)
                 session.commit()
-                session.refresh(postage)
             return postage
 
     def toggle_active(self, postage_id: int) -> Optional[PostageType]:
@@ -80,7 +92,6 @@ class PostageService:
                 postage.is_active = not postage.is_active
                 session.add(postage)
                 session.commit()
-                session.refresh(postage)
             return postage
 
     def delete_postage_type(self, postage_id: int) -> bool:
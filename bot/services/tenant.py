@@ -1,6 +1,7 @@
 """Tenant management service."""
 
 import hashlib
+import json
 import logging
 import secrets
 from datetime import datetime
@@ -55,7 +56,7 @@ class TenantService:
         self.db.log_action(
             action="tenant_registered",
             tenant_id=tenant.id,
-            details=f'{{"email": "{email}"}}'
+            details=json.dumps({"email": email})
         )
 
         return tenant
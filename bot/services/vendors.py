@@ -21,7 +21,6 @@ class VendorService:
         with self.db.session() as session:
             session.add(vendor)
             session.commit()
-            session.refresh(vendor)
             return vendor
 
     def _load_vendor_attrs(self, vendor: Vendor) -> None:
@@ -89,7 +88,6 @@ class VendorService:
 
             session.add(vendor)
             session.commit()
-            session.refresh(vendor)
             logger.info(f"Vendor {vendor_id} settings saved. Wallet: {vendor.wallet_address}")
             return vendor
 
@@ -5,40 +5,48 @@ import logging
 from datetime import datetime, timedelta
 from decimal import Decimal
 
-from sqlmodel import select, delete
+from sqlmodel import select
 from .models import Database, Order, Product, Vendor
 from .config import get_settings
+from .services.orders import purge_orders_before
 from .services.payout import PayoutService
 from .services.payments import PaymentService
 from .services.payment_factory import PaymentServiceFactory
+from .services.payment_protocol import PAYMENT_CHECK_INTERVAL
 
 logger = logging.getLogger(__name__)
 
 
 async def cleanup_old_orders(db: Database) -> None:
-    """Delete orders older than retention period."""
+    """Delete orders older than retention period, keeping any with unsettled payouts."""
     settings = get_settings()
     cutoff_date = datetime.utcnow() - timedelta(days=settings.data_retention_days)
-    
+
     try:
-        with db.session() as session:
-            # Find old orders
-            statement = select(Order).where(Order.created_at < cutoff_date)
-            old_orders = session.exec(statement).all()
-            
-            if old_orders:
-                # Delete old orders
-                delete_statement = delete(Order).where(Order.created_at < cutoff_date)
-                session.exec(delete_statement)
-                session.commit()
-                logger.info(f"Deleted {len(old_orders)} old orders")
-            else:
-                logger.debug("No old orders to delete")
-                
+        deleted = purge_orders_before(db, cutoff_date)
+        if deleted:
+            logger.info(f"Deleted {deleted} old orders")
+        else:
+            logger.debug("No old orders to delete")
+
     except Exception as e:
         logger.error(f"Error cleaning up old orders: {e}", exc_info=True)
 
 
+def _expected_amount(session, order: Order) -> Decimal | None:
+    """Amount an order must receive, or None if its product is gone."""
+    # Use new field if available, fallback to legacy
+    expected_amount = getattr(order, 'payment_amount_crypto', None)
+    if not expected_amount:
+        # Legacy order - calculate from price_xmr
+        product = session.get(Product, order.product_id)
+        if not product:
+            return None
+        price_xmr = Decimal(str(product.price_xmr))
+        expected_amount = price_xmr * order.quantity + order.postage_xmr
+    return expected_amount
+
+
 async def check_pending_payments(db: Database) -> None:
     """Check pending orders for received payments (multi-currency support)."""
     try:
@@ -55,6 +63,22 @@ async def check_pending_payments(db: Database) -> None:
 
             logger.info(f"Checking {len(pending_orders)} pending orders for payments")
 
+            # All XMR orders are checked with one get_bulk_payments RPC
+            xmr_expected = {}
+            for order in pending_orders:
+                if (getattr(order, 'payment_currency', 'XMR') or 'XMR') == "XMR":
+                    expected_amount = _expected_amount(session, order)
+                    if expected_amount is not None:
+                        xmr_expected[order.payment_id] = expected_amount
+            xmr_paid = set()
+            if xmr_expected:
+                try:
+                    xmr_paid = PaymentServiceFactory.create("XMR").check_paid_bulk(
+                        list(xmr_expected), expected_amounts=xmr_expected
+                    )
+                except Exception as e:
+                    logger.error(f"Error checking XMR payments: {e}")
+
             for order in pending_orders:
                 try:
                     # Get payment currency (default to XMR for old orders)
@@ -63,15 +87,9 @@ async def check_pending_payments(db: Database) -> None:
                     # Get appropriate payment service for this order's currency
                     payment_service = PaymentServiceFactory.create(payment_currency)
 
-                    # Get expected amount (use new field if available, fallback to legacy)
-                    expected_amount = getattr(order, 'payment_amount_crypto', None)
-                    if not expected_amount:
-                        # Legacy order - calculate from price_xmr
-                        product = session.get(Product, order.product_id)
-                        if not product:
-                            continue
-                        price_xmr = Decimal(str(product.price_xmr))
-                        expected_amount = price_xmr * order.quantity + order.postage_xmr
+                    expected_amount = _expected_amount(session, order)
+                    if expected_amount is None:
+                        continue
 
                     # For BTC/ETH, need vendor address and order creation time
                     check_kwargs = {
@@ -112,11 +130,11 @@ async def check_pending_payments(db: Database) -> None:
                             )
                             order.crypto_confirmations = confirmations
                     else:
-                        # XMR - synchronous check
-                        is_paid = payment_service.check_paid(**check_kwargs)
+                        # XMR - resolved by the bulk check above
+                        is_paid = order.payment_id in xmr_paid
 
                         # Get confirmations for XMR
-                        if hasattr(payment_service, 'get_confirmations'):
+                        if is_paid and hasattr(payment_service, 'get_confirmations'):
                             confirmations = payment_service.get_confirmations(order.payment_id)
                             order.crypto_confirmations = confirmations
 
@@ -203,10 +221,10 @@ async def start_background_tasks(db: Database) -> None:
                 await cleanup_old_orders(db)
                 iteration = 0  # Reset to prevent overflow
 
-            await asyncio.sleep(300)  # 5 minutes
+            await asyncio.sleep(PAYMENT_CHECK_INTERVAL)
         except asyncio.CancelledError:
             logger.info("Background tasks cancelled")
             break
         except Exception as e:
             logger.error(f"Error in background tasks: {e}", exc_info=True)
-            await asyncio.sleep(300)  # Retry after 5 minutes on error
\ No newline at end of file
+            await asyncio.sleep(PAYMENT_CHECK_INTERVAL)  # Retry on error
\ No newline at end of file
@@ -54,6 +54,10 @@ def clean_env():
     import bot.config
     bot.config._settings = None
 
+    # Drop order rates cached by a previous test
+    from bot.services.currency import clear_order_rate_cache
+    clear_order_rate_cache()
+
     yield
 
     # Restore .env file
@@ -4,12 +4,13 @@ E2E Tests: Complete Customer Purchase Flow
 Tests the full customer journey from browsing products to order completion.
 """
 
+import asyncio
 import pytest
 import tempfile
 import os
 import base64
 from decimal import Decimal
-from unittest.mock import patch, MagicMock
+from unittest.mock import AsyncMock, patch, MagicMock
 
 from bot.models import Database, Product, Vendor
 from bot.services.vendors import VendorService
@@ -114,8 +115,9 @@ class TestCustomerPurchaseFlow:
 
         return vendor, products, [postage1, postage2]
 
-    @patch('bot.services.orders.fiat_to_xmr_sync')
-    def test_complete_purchase_flow_xmr(
+    @pytest.mark.asyncio
+    @patch('bot.services.orders.fiat_to_crypto', new_callable=AsyncMock)
+    async def test_complete_purchase_flow_xmr(
         self, mock_fiat_to_xmr, db, services, vendor_with_products
     ):
         """Test complete purchase flow with XMR payment."""
@@ -136,7 +138,7 @@ class TestCustomerPurchaseFlow:
         assert product_details.inventory == 10
 
         # Step 3: Customer creates order
-        result = services['orders'].create_order(
+        result = await services['orders'].create_order(
             product_id=product.id,
             quantity=2,
             address="123 Test Street, Test City, TC 12345"
@@ -175,8 +177,9 @@ class TestCustomerPurchaseFlow:
         vendor_products = services['catalog'].list_products_by_vendor(vendor.id)
         assert len(vendor_products) == 5
 
-    @patch('bot.services.orders.fiat_to_xmr_sync')
-    def test_order_cancellation_restores_inventory(
+    @pytest.mark.asyncio
+    @patch('bot.services.orders.fiat_to_crypto', new_callable=AsyncMock)
+    async def test_order_cancellation_restores_inventory(
         self, mock_fiat_to_xmr, db, services, vendor_with_products
     ):
         """Test that cancelling an order restores inventory."""
@@ -186,7 +189,7 @@ class TestCustomerPurchaseFlow:
         original_inventory = product.inventory
 
         # Create an order
-        result = services['orders'].create_order(
+        result = await services['orders'].create_order(
             product_id=product.id,
             quantity=3,
             address="Test Address"
@@ -204,8 +207,9 @@ class TestCustomerPurchaseFlow:
         order = services['orders'].get_order(result["order_id"])
         assert order.state == "CANCELLED"
 
-    @patch('bot.services.orders.fiat_to_xmr_sync')
-    def test_order_with_postage(
+    @pytest.mark.asyncio
+    @patch('bot.services.orders.fiat_to_crypto', new_callable=AsyncMock)
+    async def test_order_with_postage(
         self, mock_fiat_to_xmr, db, services, vendor_with_products
     ):
         """Test order creation with postage selection."""
@@ -215,7 +219,7 @@ class TestCustomerPurchaseFlow:
         express_postage = postage_options[1]  # Express: $15
 
         # Create order with postage
-        result = services['orders'].create_order(
+        result = await services['orders'].create_order(
             product_id=product.id,
             quantity=1,
             address="Test Address",
@@ -226,7 +230,8 @@ class TestCustomerPurchaseFlow:
         assert result["order_id"] is not None
         assert result["postage_xmr"] > 0
 
-    def test_insufficient_inventory_rejected(
+    @pytest.mark.asyncio
+    async def test_insufficient_inventory_rejected(
         self, db, services, vendor_with_products
     ):
         """Test that orders exceeding inventory are rejected."""
@@ -234,14 +239,15 @@ class TestCustomerPurchaseFlow:
         product = products[0]  # Has 10 in inventory
 
         with pytest.raises(ValueError, match="Insufficient"):
-            services['orders'].create_order(
+            await services['orders'].create_order(
                 product_id=product.id,
                 quantity=100,  # More than available
                 address="Test Address"
             )
 
-    @patch('bot.services.orders.fiat_to_xmr_sync')
-    def test_multiple_orders_same_product(
+    @pytest.mark.asyncio
+    @patch('bot.services.orders.fiat_to_crypto', new_callable=AsyncMock)
+    async def test_multiple_orders_same_product(
         self, mock_fiat_to_xmr, db, services, vendor_with_products
     ):
         """Test multiple customers ordering same product."""
@@ -250,14 +256,14 @@ class TestCustomerPurchaseFlow:
         product = products[0]  # Has 10 in inventory
 
         # First customer orders 3
-        result1 = services['orders'].create_order(
+        result1 = await services['orders'].create_order(
             product_id=product.id,
             quantity=3,
             address="Address 1"
         )
 
         # Second customer orders 4
-        result2 = services['orders'].create_order(
+        result2 = await services['orders'].create_order(
             product_id=product.id,
             quantity=4,
             address="Address 2"
@@ -271,8 +277,9 @@ class TestCustomerPurchaseFlow:
         orders = services['orders'].list_orders_by_vendor(vendor.id)
         assert len(orders) == 2
 
-    @patch('bot.services.orders.fiat_to_xmr_sync')
-    def test_customer_can_view_order_status(
+    @pytest.mark.asyncio
+    @patch('bot.services.orders.fiat_to_crypto', new_callable=AsyncMock)
+    async def test_customer_can_view_order_status(
         self, mock_fiat_to_xmr, db, services, vendor_with_products
     ):
         """Test customer checking their order status."""
@@ -281,7 +288,7 @@ class TestCustomerPurchaseFlow:
         product = products[0]
 
         # Create order
-        result = services['orders'].create_order(
+        result = await services['orders'].create_order(
             product_id=product.id,
             quantity=1,
             address="Test Address"
@@ -332,11 +339,11 @@ class TestOrderLifecycle:
             vendor_id=vendor.id
         ))
 
-        result = orders.create_order(
+        result = asyncio.run(orders.create_order(
             product_id=product.id,
             quantity=2,
             address="123 Test St"
-        )
+        ))
 
         return vendor, product, result["order_id"], orders
 
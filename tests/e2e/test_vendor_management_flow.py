@@ -4,6 +4,7 @@ E2E Tests: Vendor Management Flow
 Tests the complete vendor journey from onboarding to order fulfillment.
 """
 
+import asyncio
 import pytest
 import tempfile
 import os
@@ -503,17 +504,17 @@ class TestVendorOrderManagementFlow:
         ))
 
         # Create multiple orders
-        result1 = orders.create_order(
+        result1 = asyncio.run(orders.create_order(
             product_id=product.id,
             quantity=2,
             address="Address 1"
-        )
+        ))
 
-        result2 = orders.create_order(
+        result2 = asyncio.run(orders.create_order(
             product_id=product.id,
             quantity=3,
             address="Address 2"
-        )
+        ))
 
         return vendor, product, [result1, result2], orders
 
@@ -73,7 +73,8 @@ def order_service(test_db, test_vendor):
 class TestMultiCurrencyOrderCreation:
     """Test creating orders with different currencies."""
 
-    def test_create_order_with_xmr(self, order_service, test_product):
+    @pytest.mark.asyncio
+    async def test_create_order_with_xmr(self, order_service, test_product):
         """Test creating order with XMR payment."""
         with patch('bot.services.bitcoin_payment.get_settings') as mock_settings:
             mock_settings.return_value.environment = "development"
@@ -85,7 +86,7 @@ class TestMultiCurrencyOrderCreation:
 
                 mock_convert.side_effect = mock_fiat_to_crypto
 
-                order_data = order_service.create_order(
+                order_data = await order_service.create_order(
                     product_id=test_product.id,
                     quantity=2,
                     address="123 Test St",
@@ -98,7 +99,8 @@ class TestMultiCurrencyOrderCreation:
                 assert order_data["total_crypto"] > 0
                 assert order_data["confirmations_required"] == 10
 
-    def test_create_order_with_btc(self, order_service, test_product):
+    @pytest.mark.asyncio
+    async def test_create_order_with_btc(self, order_service, test_product):
         """Test creating order with BTC payment."""
         with patch('bot.services.bitcoin_payment.get_settings') as mock_settings:
             mock_settings.return_value.environment = "development"
@@ -111,7 +113,7 @@ class TestMultiCurrencyOrderCreation:
 
                 mock_convert.side_effect = mock_fiat_to_crypto
 
-                order_data = order_service.create_order(
+                order_data = await order_service.create_order(
                     product_id=test_product.id,
                     quantity=1,
                     address="456 Test Ave",
@@ -122,7 +124,8 @@ class TestMultiCurrencyOrderCreation:
                 assert order_data["payment_address"] == "1A1zP1eP5QGefi2DMPTfTL5SLmv7DivfNa"
                 assert order_data["confirmations_required"] == 6
 
-    def test_create_order_with_eth(self, order_service, test_product):
+    @pytest.mark.asyncio
+    async def test_create_order_with_eth(self, order_service, test_product):
         """Test creating order with ETH payment."""
         with patch('bot.services.ethereum_payment.get_settings') as mock_settings:
             mock_settings.return_value.environment = "development"
@@ -135,7 +138,7 @@ class TestMultiCurrencyOrderCreation:
 
                 mock_convert.side_effect = mock_fiat_to_crypto
 
-                order_data = order_service.create_order(
+                order_data = await order_service.create_order(
                     product_id=test_product.id,
                     quantity=1,
                     address="789 Test Blvd",
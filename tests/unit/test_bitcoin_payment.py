@@ -178,3 +178,24 @@ class TestBitcoinGetBalance:
         """Test get_balance returns zero (not implemented)."""
         balance = btc_service.get_balance()
         assert balance == Decimal("0")
+
+
+@pytest.mark.asyncio
+class TestBlockchainRateLimit:
+    """Test BlockchainAPI request pacing."""
+
+    async def test_first_request_does_not_wait(self):
+        """Test the first request is sent immediately."""
+        api = BlockchainAPI()
+        with patch('bot.services.blockchain_api.asyncio.sleep', new_callable=AsyncMock) as mock_sleep:
+            await api._wait_for_rate_limit()
+        mock_sleep.assert_not_called()
+
+    async def test_back_to_back_requests_wait(self):
+        """Test a second request waits out the remaining delay."""
+        api = BlockchainAPI()
+        with patch('bot.services.blockchain_api.asyncio.sleep', new_callable=AsyncMock) as mock_sleep:
+            await api._wait_for_rate_limit()
+            await api._wait_for_rate_limit()
+        mock_sleep.assert_called_once()
+        assert 0 < mock_sleep.call_args[0][0] <= api.RATE_LIMIT_DELAY
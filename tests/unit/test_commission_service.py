@@ -274,6 +274,30 @@ class TestCommissionService:
         updated = commission_service.get_invoice(invoice.id)
         assert updated.state == InvoiceState.WAIVED
 
+    def test_waive_invoice_audit_details_escaped(self, commission_service, db):
+        """Test audit details stay valid JSON when the reason has quotes."""
+        import json
+        from sqlmodel import select
+        from bot.models_multitenant import AuditLog
+
+        tenant = db.create_tenant("quote@test.com", "hash", "1.0")
+        invoice = db.create_commission_invoice(
+            tenant.id, date(2024, 1, 1), date(2024, 1, 7),
+            5, Decimal("50"), Decimal("0.05"), Decimal("2.5"),
+            "4AAA...", datetime(2024, 1, 14)
+        )
+
+        commission_service.waive_invoice(invoice.id, 'Agreed "goodwill" waiver')
+
+        with db.get_session() as session:
+            log = session.exec(
+                select(AuditLog).where(AuditLog.action == "invoice_waived")
+            ).one()
+        assert json.loads(log.details) == {
+            "invoice_id": invoice.id,
+            "reason": 'Agreed "goodwill" waiver',
+        }
+
     def test_waive_nonexistent_invoice(self, commission_service):
         """Test waiving non-existent invoice."""
         result = commission_service.waive_invoice(99999, "Test")
@@ -1,8 +1,10 @@
 """Tests for multi-cryptocurrency currency conversion."""
 
+import asyncio
+import json
 import pytest
 from decimal import Decimal
-from unittest.mock import patch, AsyncMock
+from unittest.mock import patch, AsyncMock, MagicMock
 
 from bot.services.currency import (
     fetch_crypto_rates,
@@ -28,7 +30,7 @@ class TestFetchCryptoRates:
 
         with patch('bot.services.currency.aiohttp.ClientSession') as mock_session:
             mock_session.return_value.__aenter__.return_value.get.return_value.__aenter__.return_value.status = 200
-            mock_session.return_value.__aenter__.return_value.get.return_value.__aenter__.return_value.json = AsyncMock(return_value=mock_response)
+            mock_session.return_value.__aenter__.return_value.get.return_value.__aenter__.return_value.read = AsyncMock(return_value=json.dumps(mock_response).encode())
 
             rates = await fetch_crypto_rates()
 
@@ -48,11 +50,37 @@ class TestFetchCryptoRates:
 
         with patch('bot.services.currency.aiohttp.ClientSession') as mock_session:
             mock_session.return_value.__aenter__.return_value.get.return_value.__aenter__.return_value.status = 200
-            mock_session.return_value.__aenter__.return_value.get.return_value.__aenter__.return_value.json = AsyncMock(return_value=mock_response)
+            mock_session.return_value.__aenter__.return_value.get.return_value.__aenter__.return_value.read = AsyncMock(return_value=json.dumps(mock_response).encode())
 
             with pytest.raises(ValueError, match="Incomplete rates data"):
                 await fetch_crypto_rates()
 
+    async def test_fetch_crypto_rates_http_error(self):
+        """Test non-2xx responses are rejected before the body is read."""
+        import aiohttp
+
+        mock_resp = MagicMock()
+        mock_resp.raise_for_status.side_effect = aiohttp.ClientResponseError(
+            request_info=MagicMock(), history=(), status=429
+        )
+        mock_resp.read = AsyncMock()
+
+        mock_cm = MagicMock()
+        mock_cm.__aenter__ = AsyncMock(return_value=mock_resp)
+        mock_cm.__aexit__ = AsyncMock(return_value=False)
+
+        with patch('bot.services.currency.aiohttp.ClientSession') as mock_session:
+            mock_session_instance = MagicMock()
+            mock_session_instance.get.return_value = mock_cm
+            mock_session_instance.__aenter__ = AsyncMock(return_value=mock_session_instance)
+            mock_session_instance.__aexit__ = AsyncMock(return_value=False)
+            mock_session.return_value = mock_session_instance
+
+            with pytest.raises(ValueError, match="Invalid response from CoinGecko: 429"):
+                await fetch_crypto_rates()
+
+        mock_resp.read.assert_not_called()
+
 
 @pytest.mark.asyncio
 class TestFiatToCrypto:
@@ -114,6 +142,84 @@ class TestFiatToCrypto:
         with pytest.raises(ValueError, match="Amount must be positive"):
             await fiat_to_crypto(Decimal("-10"), "USD", "BTC")
 
+    async def test_rates_shared_within_ttl(self):
+        """Test conversions within ORDER_RATE_TTL fetch rates once."""
+        with patch('bot.services.currency.fetch_crypto_rates', new_callable=AsyncMock) as mock_rates:
+            mock_rates.return_value = {
+                "XMR": {"USD": Decimal("150.0")}
+            }
+
+            await fiat_to_crypto(Decimal("150"), "USD", "XMR")
+            result = await fiat_to_crypto(Decimal("300"), "USD", "XMR")
+
+            assert result == Decimal("2")
+            mock_rates.assert_awaited_once()
+
+    async def test_rates_refetched_after_ttl(self):
+        """Test expired order rates are fetched again."""
+        import bot.services.currency as currency
+
+        with patch('bot.services.currency.fetch_crypto_rates', new_callable=AsyncMock) as mock_rates:
+            mock_rates.return_value = {
+                "XMR": {"USD": Decimal("150.0")}
+            }
+
+            await fiat_to_crypto(Decimal("150"), "USD", "XMR")
+            currency._order_rates_time -= currency.ORDER_RATE_TTL.total_seconds()
+            await fiat_to_crypto(Decimal("150"), "USD", "XMR")
+
+            assert mock_rates.await_count == 2
+
+    async def test_failed_fetch_not_cached(self):
+        """Test a failed rate fetch is retried on the next conversion."""
+        with patch('bot.services.currency.fetch_crypto_rates', new_callable=AsyncMock) as mock_rates:
+            mock_rates.side_effect = [
+                ValueError("Failed to fetch exchange rates"),
+                {"XMR": {"USD": Decimal("150.0")}},
+            ]
+
+            with pytest.raises(ValueError):
+                await fiat_to_crypto(Decimal("150"), "USD", "XMR")
+            result = await fiat_to_crypto(Decimal("150"), "USD", "XMR")
+
+            assert result == Decimal("1")
+
+    async def test_concurrent_misses_share_one_fetch(self):
+        """Test conversions gathered on a cold cache fetch rates once."""
+        async def slow_rates():
+            await asyncio.sleep(0.01)
+            return {
+                "XMR": {"USD": Decimal("150.0")},
+                "BTC": {"USD": Decimal("45000.0")},
+            }
+
+        with patch('bot.services.currency.fetch_crypto_rates', new_callable=AsyncMock) as mock_rates:
+            mock_rates.side_effect = slow_rates
+
+            results = await asyncio.gather(
+                fiat_to_crypto(Decimal("150"), "USD", "XMR"),
+                fiat_to_crypto(Decimal("450"), "USD", "BTC"),
+                fiat_to_crypto(Decimal("300"), "USD", "XMR"),
+            )
+
+            assert results == [Decimal("1"), Decimal("0.01"), Decimal("2")]
+            mock_rates.assert_awaited_once()
+
+    async def test_clear_order_rate_cache(self):
+        """Test clearing the cache forces a fresh fetch."""
+        from bot.services.currency import clear_order_rate_cache
+
+        with patch('bot.services.currency.fetch_crypto_rates', new_callable=AsyncMock) as mock_rates:
+            mock_rates.return_value = {
+                "XMR": {"USD": Decimal("150.0")}
+            }
+
+            await fiat_to_crypto(Decimal("150"), "USD", "XMR")
+            clear_order_rate_cache()
+            await fiat_to_crypto(Decimal("150"), "USD", "XMR")
+
+            assert mock_rates.await_count == 2
+
 
 @pytest.mark.asyncio
 class TestCryptoToFiat:
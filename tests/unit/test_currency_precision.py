@@ -4,6 +4,7 @@ These tests ensure no money is lost due to floating-point errors.
 All financial calculations must use Decimal for precision.
 """
 
+import json
 import pytest
 from decimal import Decimal
 from unittest.mock import AsyncMock, MagicMock, patch
@@ -114,6 +115,23 @@ class TestRoundingBehavior:
             # Should round to nearest cent
             assert result == Decimal("100.00")
 
+    def test_divide_down_matches_quantize(self):
+        """Integer division path matches Decimal quantize with ROUND_DOWN."""
+        from decimal import ROUND_DOWN
+        from bot.services.currency import _divide_down
+
+        cases = [
+            (Decimal("100.00"), Decimal("150.00"), 8),
+            (Decimal("0.01"), Decimal("45123.87654321"), 8),
+            (Decimal("99.99"), Decimal("3000.5"), 6),
+            (Decimal("1234.5678"), Decimal("0.3"), 8),
+        ]
+        for amount, price, places in cases:
+            expected = (amount / price).quantize(Decimal(10) ** -places, rounding=ROUND_DOWN)
+            result = _divide_down(amount, price, places)
+            assert result == expected
+            assert result.as_tuple().exponent == expected.as_tuple().exponent
+
 
 class TestNoFloatingPointErrors:
     """Test that classic floating-point errors are avoided."""
@@ -235,6 +253,17 @@ class TestFormatFunctions:
         result = format_price_simple(Decimal("0.5"), "XMR")
         assert result == "0.5 XMR"
 
+    def test_format_price_memoized(self):
+        """Repeated renders of the same amount are served from the cache."""
+        from bot.services.currency import _format_price_cached
+
+        _format_price_cached.cache_clear()
+        assert format_price(Decimal("12.50"), "USD") == "$12.50"
+        assert format_price("12.50", "USD") == "$12.50"
+        info = _format_price_cached.cache_info()
+        assert info.misses == 1
+        assert info.hits == 1
+
 
 class TestOrderCalculationIntegration:
     """Test that order calculations maintain precision."""
@@ -284,7 +313,8 @@ class TestFetchXMRRates:
         with patch('aiohttp.ClientSession') as mock_session:
             mock_resp = AsyncMock()
             mock_resp.status = 200
-            mock_resp.json = AsyncMock(return_value=mock_response)
+            mock_resp.raise_for_status = MagicMock()
+            mock_resp.read = AsyncMock(return_value=json.dumps(mock_response).encode())
 
             mock_cm = AsyncMock()
             mock_cm.__aenter__.return_value = mock_resp
@@ -301,15 +331,22 @@ class TestFetchXMRRates:
             assert "GBP" in rates
             assert "EUR" in rates
             assert isinstance(rates["USD"], Decimal)
+            with pytest.raises(TypeError):
+                rates["USD"] = Decimal("0")
 
     @pytest.mark.asyncio
     async def test_fetch_rates_api_error(self):
         """Test API error handling."""
         from bot.services.currency import fetch_xmr_rates
 
+        import aiohttp
+
         with patch('bot.services.currency.aiohttp.ClientSession') as mock_session:
             mock_resp = MagicMock()
             mock_resp.status = 500
+            mock_resp.raise_for_status.side_effect = aiohttp.ClientResponseError(
+                request_info=MagicMock(), history=(), status=500
+            )
 
             # Mock the response context manager (session.get() returns this)
             # __aexit__ must return False to not suppress exceptions
@@ -335,7 +372,7 @@ class TestFetchXMRRates:
         with patch('bot.services.currency.aiohttp.ClientSession') as mock_session:
             mock_resp = MagicMock()
             mock_resp.status = 200
-            mock_resp.json = AsyncMock(return_value={"bitcoin": {"usd": 50000}})
+            mock_resp.read = AsyncMock(return_value=b'{"bitcoin": {"usd": 50000}}')
 
             # Mock the response context manager
             mock_cm = MagicMock()
@@ -403,121 +440,6 @@ class TestGetXMRPrice:
                 await get_xmr_price("INVALID")
 
 
-class TestFiatToXMRSync:
-    """Test fiat_to_xmr_sync function."""
-
-    def test_fiat_to_xmr_sync_with_cache(self):
-        """Test sync conversion using cached rate."""
-        from bot.services.currency import fiat_to_xmr_sync, _display_cache, DISPLAY_CACHE_DURATION
-        import bot.services.currency as currency_module
-        from datetime import datetime
-
-        currency_module._display_cache = {"USD": Decimal("150.00")}
-        currency_module._display_cache_time = datetime.utcnow()
-
-        result = fiat_to_xmr_sync(Decimal("100.00"), "USD")
-        assert isinstance(result, Decimal)
-
-    def test_fiat_to_xmr_sync_xmr(self):
-        """Test sync conversion for XMR currency."""
-        from bot.services.currency import fiat_to_xmr_sync
-
-        result = fiat_to_xmr_sync(Decimal("1.5"), "XMR")
-        assert result == Decimal("1.50000000")
-
-    def test_fiat_to_xmr_sync_no_cache_running_loop(self):
-        """Test sync conversion with running event loop and no cache."""
-        from bot.services.currency import fiat_to_xmr_sync
-        import bot.services.currency as currency_module
-
-        currency_module._display_cache = {}
-        currency_module._display_cache_time = None
-
-        # Mock fetch_xmr_rates to avoid network call
-        with patch('bot.services.currency.fetch_xmr_rates', new_callable=AsyncMock) as mock:
-            mock.return_value = {"USD": Decimal("150.00"), "GBP": Decimal("120.00"), "EUR": Decimal("140.00")}
-            result = fiat_to_xmr_sync(Decimal("100.00"), "USD")
-            assert isinstance(result, Decimal)
-
-    def test_fiat_to_xmr_sync_running_loop_xmr(self):
-        """Test sync conversion with running event loop for XMR currency."""
-        from bot.services.currency import fiat_to_xmr_sync
-        import asyncio
-
-        # Create and run in an event loop context
-        async def run_test():
-            # Mock fiat_to_xmr_cached to return None, forcing us into the running loop branch
-            with patch('bot.services.currency.fiat_to_xmr_cached', return_value=None):
-                result = fiat_to_xmr_sync(Decimal("1.5"), "XMR")
-                return result
-
-        result = asyncio.run(run_test())
-        assert result == Decimal("1.50000000")
-
-    def test_fiat_to_xmr_sync_running_loop_gbp(self):
-        """Test sync conversion with running event loop for GBP currency."""
-        from bot.services.currency import fiat_to_xmr_sync
-        import asyncio
-
-        async def run_test():
-            # Mock fiat_to_xmr_cached to return None
-            with patch('bot.services.currency.fiat_to_xmr_cached', return_value=None):
-                result = fiat_to_xmr_sync(Decimal("100.00"), "GBP")
-                return result
-
-        result = asyncio.run(run_test())
-        assert isinstance(result, Decimal)
-        # GBP has a multiplier of 0.79, so rate = 150 * 0.79 = 118.5
-        # 100 / 118.5 = ~0.84388...
-        assert result > Decimal("0")
-
-    def test_fiat_to_xmr_sync_running_loop_eur(self):
-        """Test sync conversion with running event loop for EUR currency."""
-        from bot.services.currency import fiat_to_xmr_sync
-        import asyncio
-
-        async def run_test():
-            with patch('bot.services.currency.fiat_to_xmr_cached', return_value=None):
-                result = fiat_to_xmr_sync(Decimal("100.00"), "EUR")
-                return result
-
-        result = asyncio.run(run_test())
-        assert isinstance(result, Decimal)
-        assert result > Decimal("0")
-
-    def test_fiat_to_xmr_sync_running_loop_unknown(self):
-        """Test sync conversion with running event loop for unknown currency."""
-        from bot.services.currency import fiat_to_xmr_sync
-        import asyncio
-
-        async def run_test():
-            # Unknown currency uses default multiplier of 1
-            with patch('bot.services.currency.fiat_to_xmr_cached', return_value=None):
-                result = fiat_to_xmr_sync(Decimal("100.00"), "UNKNOWN")
-                return result
-
-        result = asyncio.run(run_test())
-        assert isinstance(result, Decimal)
-
-    def test_fiat_to_xmr_sync_no_event_loop(self):
-        """Test sync conversion with no event loop (RuntimeError branch)."""
-        from bot.services.currency import fiat_to_xmr_sync
-        import bot.services.currency as currency_module
-        import asyncio
-
-        # Clear cache
-        currency_module._display_cache = {}
-        currency_module._display_cache_time = None
-
-        # Patch get_event_loop to raise RuntimeError
-        with patch('bot.services.currency.asyncio.get_event_loop') as mock_get_loop:
-            mock_get_loop.side_effect = RuntimeError("No event loop")
-            with patch('bot.services.currency.fiat_to_xmr_accurate', new_callable=AsyncMock) as mock_convert:
-                mock_convert.return_value = Decimal("0.66666666")
-                result = fiat_to_xmr_sync(Decimal("100.00"), "USD")
-                assert result == Decimal("0.66666666")
-
-
 class TestFiatToXMRAccurateEdgeCases:
     """Test edge cases for fiat_to_xmr_accurate function."""
 
@@ -573,18 +495,42 @@ class TestUpdateDisplayCache:
         from bot.services.currency import update_display_cache
         import bot.services.currency as currency_module
 
+        currency_module._display_cache = {}
+        currency_module._display_cache_time = 0.0
+
         with patch('bot.services.currency.fetch_xmr_rates', new_callable=AsyncMock) as mock:
             mock.return_value = {"USD": Decimal("150.00")}
 
             await update_display_cache()
 
             assert "USD" in currency_module._display_cache
-            assert currency_module._display_cache_time is not None
+            assert currency_module._display_cache_time > 0
+
+    @pytest.mark.asyncio
+    async def test_update_cache_concurrent_refreshes_fetch_once(self):
+        """Concurrent refreshes only hit the API once."""
+        import asyncio
+        from bot.services.currency import update_display_cache
+        import bot.services.currency as currency_module
+
+        currency_module._display_cache = {}
+        currency_module._display_cache_time = 0.0
+
+        with patch('bot.services.currency.fetch_xmr_rates', new_callable=AsyncMock) as mock, \
+                patch('bot.services.currency._display_cache_lock', asyncio.Lock()):
+            mock.return_value = {"USD": Decimal("150.00")}
+
+            await asyncio.gather(*(update_display_cache() for _ in range(5)))
+
+            assert mock.await_count == 1
 
     @pytest.mark.asyncio
     async def test_update_cache_failure(self):
         """Test cache update failure."""
         from bot.services.currency import update_display_cache
+        import bot.services.currency as currency_module
+
+        currency_module._display_cache_time = 0.0
 
         with patch('bot.services.currency.fetch_xmr_rates', new_callable=AsyncMock) as mock:
             mock.side_effect = Exception("API error")
@@ -606,33 +552,68 @@ class TestGetCachedRate:
         """Test getting cached rate with valid cache."""
         from bot.services.currency import get_cached_rate
         import bot.services.currency as currency_module
-        from datetime import datetime
+        import time
 
         currency_module._display_cache = {"USD": Decimal("150.00")}
-        currency_module._display_cache_time = datetime.utcnow()
+        currency_module._display_cache_time = time.monotonic()
 
         result = get_cached_rate("USD")
         assert result == Decimal("150.00")
 
     def test_get_cached_rate_expired(self):
-        """Test getting cached rate with expired cache."""
-        from bot.services.currency import get_cached_rate, DISPLAY_CACHE_DURATION
+        """Test getting cached rate with cache past the stale limit."""
+        from bot.services.currency import get_cached_rate, DISPLAY_CACHE_STALE_MAX
         import bot.services.currency as currency_module
-        from datetime import datetime, timedelta
+        import time
 
         currency_module._display_cache = {"USD": Decimal("150.00")}
-        currency_module._display_cache_time = datetime.utcnow() - DISPLAY_CACHE_DURATION - timedelta(minutes=1)
+        currency_module._display_cache_time = time.monotonic() - DISPLAY_CACHE_STALE_MAX.total_seconds() - 60
 
         result = get_cached_rate("USD")
         assert result is None
 
+    def test_get_cached_rate_stale_without_loop(self):
+        """Stale rate is served even when no event loop can refresh it."""
+        from bot.services.currency import get_cached_rate, DISPLAY_CACHE_DURATION
+        import bot.services.currency as currency_module
+        import time
+
+        currency_module._display_cache = {"USD": Decimal("150.00")}
+        currency_module._display_cache_time = time.monotonic() - DISPLAY_CACHE_DURATION.total_seconds() - 60
+        currency_module._display_refresh_task = None
+
+        result = get_cached_rate("USD")
+        assert result == Decimal("150.00")
+        assert currency_module._display_refresh_task is None
+
+    @pytest.mark.asyncio
+    async def test_get_cached_rate_stale_revalidates_once(self):
+        """Stale rate is served and a single background refresh is scheduled."""
+        from bot.services.currency import get_cached_rate, DISPLAY_CACHE_DURATION
+        import bot.services.currency as currency_module
+        import time
+
+        currency_module._display_cache = {"USD": Decimal("150.00")}
+        currency_module._display_cache_time = time.monotonic() - DISPLAY_CACHE_DURATION.total_seconds() - 60
+        currency_module._display_refresh_task = None
+
+        with patch('bot.services.currency.fetch_xmr_rates', new_callable=AsyncMock) as mock:
+            mock.return_value = {"USD": Decimal("160.00")}
+
+            assert get_cached_rate("USD") == Decimal("150.00")
+            assert get_cached_rate("USD") == Decimal("150.00")
+            await currency_module._display_refresh_task
+
+            assert mock.await_count == 1
+            assert get_cached_rate("USD") == Decimal("160.00")
+
     def test_get_cached_rate_no_cache(self):
         """Test getting cached rate with no cache."""
         from bot.services.currency import get_cached_rate
         import bot.services.currency as currency_module
 
         currency_module._display_cache = {}
-        currency_module._display_cache_time = None
+        currency_module._display_cache_time = 0.0
 
         result = get_cached_rate("USD")
         assert result is None
@@ -652,10 +633,10 @@ class TestFiatToXMRCached:
         """Test cached conversion with valid cache."""
         from bot.services.currency import fiat_to_xmr_cached
         import bot.services.currency as currency_module
-        from datetime import datetime
+        import time
 
         currency_module._display_cache = {"USD": Decimal("150.00")}
-        currency_module._display_cache_time = datetime.utcnow()
+        currency_module._display_cache_time = time.monotonic()
 
         result = fiat_to_xmr_cached(Decimal("150.00"), "USD")
         assert result == Decimal("1.00000000")
@@ -666,7 +647,7 @@ class TestFiatToXMRCached:
         import bot.services.currency as currency_module
 
         currency_module._display_cache = {}
-        currency_module._display_cache_time = None
+        currency_module._display_cache_time = 0.0
 
         result = fiat_to_xmr_cached(Decimal("100.00"), "USD")
         assert result is None
@@ -696,3 +677,32 @@ class TestFormatPriceSimple:
         assert format_price_simple(Decimal("99.99"), "USD") == "$99.99"
         assert format_price_simple(Decimal("50.00"), "GBP") == "£50.00"
         assert format_price_simple(Decimal("75.50"), "EUR") == "€75.50"
+
+
+class TestAtomicUnits:
+    """Test integer atomic-unit helpers used for order totals."""
+
+    def test_round_trip(self):
+        """Test amounts survive conversion to atomic units and back."""
+        from bot.services.currency import to_atomic, from_atomic, XMR_PLACES
+
+        assert to_atomic(Decimal("1.23456789"), XMR_PLACES) == 123456789
+        assert from_atomic(123456789, XMR_PLACES) == Decimal("1.23456789")
+
+    def test_to_atomic_truncates(self):
+        """Test digits beyond the precision are truncated."""
+        from bot.services.currency import to_atomic, XMR_PLACES
+
+        assert to_atomic(Decimal("0.123456789"), XMR_PLACES) == 12345678
+
+    def test_apply_rate_matches_decimal(self):
+        """Test basis-point commission matches Decimal multiplication."""
+        from bot.services.currency import (
+            to_atomic, from_atomic, apply_rate_atomic, BPS_PLACES, XMR_PLACES,
+        )
+
+        bps = to_atomic(Decimal("0.05"), BPS_PLACES)
+        units = apply_rate_atomic(to_atomic(Decimal("3.0"), XMR_PLACES), bps)
+
+        assert bps == 500
+        assert from_atomic(units, XMR_PLACES) == Decimal("0.15")
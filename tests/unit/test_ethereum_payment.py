@@ -2,7 +2,7 @@
 
 import pytest
 from decimal import Decimal
-from datetime import datetime
+from datetime import datetime, timedelta
 from unittest.mock import Mock, AsyncMock, patch
 
 from bot.services.ethereum_payment import EthereumPaymentService
@@ -45,6 +45,13 @@ class TestEthereumAddressValidation:
         """Test rejection of address without 0x prefix."""
         assert not eth_service.validate_address("742d35Cc6634C0532925a3b844Bc9e7595f0bEb2")
 
+    def test_reject_non_hex_characters(self, eth_service):
+        """Test rejection of non-hex characters, whitespace and bad length."""
+        assert not eth_service.validate_address("0x742d35Cc6634C0532925a3b844Bc9e7595f0bEbZ")
+        assert not eth_service.validate_address("0x742d35Cc6634C0532925a3b844Bc9e7595f0 Eb2")
+        assert not eth_service.validate_address("0X742d35Cc6634C0532925a3b844Bc9e7595f0bEb2")
+        assert not eth_service.validate_address("0x742d35Cc6634C0532925a3b844Bc9e7595f0bEb2a")
+
 
 class TestEthereumCreateAddress:
     """Test Ethereum address creation."""
@@ -151,6 +158,35 @@ class TestEthereumCheckPaid:
 
             assert result is False
 
+    async def test_check_paid_purges_old_cache_entries(self, eth_service):
+        """Test cached payments older than the max age are evicted."""
+        mock_tx = Mock()
+        mock_tx.hash = "0xabc123"
+        eth_service._payment_cache["old"] = (
+            "0x742d35Cc6634C0532925a3b844Bc9e7595f0bEb2",
+            Decimal("0.1"),
+            datetime.utcnow() - timedelta(hours=49),
+            mock_tx
+        )
+        eth_service._payment_cache["recent"] = (
+            "0x742d35Cc6634C0532925a3b844Bc9e7595f0bEb2",
+            Decimal("0.2"),
+            datetime.utcnow(),
+            mock_tx
+        )
+
+        with patch.object(eth_service.api, 'find_payment', new_callable=AsyncMock) as mock_find:
+            mock_find.return_value = None
+            await eth_service.check_paid(
+                payment_id="test123",
+                expected_amount=Decimal("0.1"),
+                address="0x742d35Cc6634C0532925a3b844Bc9e7595f0bEb2",
+                created_at=datetime.utcnow()
+            )
+
+        assert "old" not in eth_service._payment_cache
+        assert "recent" in eth_service._payment_cache
+
     async def test_get_confirmations_from_cache(self, eth_service):
         """Test getting confirmations from cache."""
         # First, cache a transaction
@@ -171,9 +207,56 @@ class TestEthereumCheckPaid:
             confirmations = await eth_service.get_confirmations("test123")
 
             assert confirmations == 10
-            mock_confs.assert_called_once_with("0xabc123")
+            mock_confs.assert_called_once_with(
+                "0xabc123", verify_at=eth_service.CONFIRMATION_THRESHOLD
+            )
 
 
+    async def test_confirmations_batched_across_cached_payments(self, eth_service):
+        """Test pending payments share one batched confirmations lookup."""
+        for pid, tx_hash in (("p1", "0xaaa"), ("p2", "0xbbb")):
+            mock_tx = Mock()
+            mock_tx.hash = tx_hash
+            mock_tx.confirmations = 0
+            eth_service._payment_cache[pid] = (
+                "0x742d35Cc6634C0532925a3b844Bc9e7595f0bEb2",
+                Decimal("0.1"),
+                datetime.utcnow(),
+                mock_tx
+            )
+
+        with patch.object(eth_service.api, 'get_many_confirmations', new_callable=AsyncMock) as mock_many:
+            mock_many.return_value = {"0xaaa": 12, "0xbbb": 3}
+
+            assert await eth_service.get_confirmations("p1") == 12
+            assert await eth_service.get_confirmations("p2") == 3
+
+        mock_many.assert_called_once()
+        assert sorted(mock_many.call_args[0][0]) == ["0xaaa", "0xbbb"]
+        assert mock_many.call_args.kwargs["verify_at"] == eth_service.CONFIRMATION_THRESHOLD
+
+    async def test_confirmed_payments_leave_the_batch(self, eth_service):
+        """Test only payments below the threshold are batched, and confirmed ones are dropped."""
+        for pid, tx_hash, confs in (("p1", "0xaaa", 2), ("p2", "0xbbb", 3), ("old", "0xccc", 40)):
+            mock_tx = Mock()
+            mock_tx.hash = tx_hash
+            mock_tx.confirmations = confs
+            eth_service._payment_cache[pid] = (
+                "0x742d35Cc6634C0532925a3b844Bc9e7595f0bEb2",
+                Decimal("0.1"),
+                datetime.utcnow(),
+                mock_tx
+            )
+
+        with patch.object(eth_service.api, 'get_many_confirmations', new_callable=AsyncMock) as mock_many:
+            mock_many.return_value = {"0xaaa": 12, "0xbbb": 4}
+
+            assert await eth_service.get_confirmations("p1") == 12
+
+        assert sorted(mock_many.call_args[0][0]) == ["0xaaa", "0xbbb"]
+        assert "p1" not in eth_service._payment_cache
+        assert eth_service._payment_cache["p2"][3].confirmations == 4
+
 class TestEthereumGetBalance:
     """Test Ethereum balance retrieval."""
 
@@ -193,3 +276,14 @@ class TestEthereumChecksum:
 
         assert checksummed.startswith("0x")
         assert len(checksummed) == 42
+
+    def test_to_checksum_address_eip55_vectors(self, eth_service):
+        """Test EIP-55 reference vectors round-trip from lowercase."""
+        vectors = [
+            "0x5aAeb6053F3E94C9b9A09f33669435E7Ef1BeAed",
+            "0xfB6916095ca1df60bB79Ce92cE3Ea74c37c5d359",
+            "0xdbF03B407c01E7cD3CBea99509d93f8DDDC8C6FB",
+            "0xD1220A0cf47c7B9Be7A2E6BA89F429762e7b9aDb",
+        ]
+        for expected in vectors:
+            assert eth_service.to_checksum_address(expected.lower()) == expected
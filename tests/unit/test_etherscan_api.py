@@ -0,0 +1,561 @@
+"""Tests for the Etherscan API client."""
+
+import asyncio
+import json
+import time
+from datetime import datetime
+from decimal import Decimal
+
+import aiohttp
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from bot.services.etherscan_api import (
+    EthereumTransaction,
+    EtherscanAPI,
+    EtherscanAPIError,
+    _TokenBucket,
+)
+
+
+def _mock_response(payload: dict, status: int = 200) -> MagicMock:
+    """Build an aiohttp-style response context manager returning payload."""
+    response = MagicMock()
+    response.status = status
+    response.read = AsyncMock(return_value=json.dumps(payload).encode())
+
+    cm = MagicMock()
+    cm.__aenter__ = AsyncMock(return_value=response)
+    cm.__aexit__ = AsyncMock(return_value=False)
+    return cm
+
+
+@pytest.fixture
+def api():
+    """Create an Etherscan API client."""
+    return EtherscanAPI(api_key="test_key")
+
+
+class TestEtherscanInit:
+    """Test client construction."""
+
+    def test_requires_api_key(self):
+        """Test an API key is mandatory."""
+        with pytest.raises(ValueError, match="API key is required"):
+            EtherscanAPI(api_key="")
+
+
+@pytest.mark.asyncio
+class TestTokenBucket:
+    """Test the shared request rate limiter."""
+
+    async def test_burst_does_not_wait(self):
+        """Test up to `rate` concurrent requests proceed immediately."""
+        bucket = _TokenBucket(5)
+        with patch('bot.services.etherscan_api.asyncio.sleep', new_callable=AsyncMock) as mock_sleep:
+            await asyncio.gather(*(bucket.acquire() for _ in range(5)))
+        mock_sleep.assert_not_called()
+
+    async def test_excess_requests_are_paced(self):
+        """Test requests beyond the burst are spread at `rate` per second."""
+        bucket = _TokenBucket(20)
+        start = time.monotonic()
+        await asyncio.gather(*(bucket.acquire() for _ in range(25)))
+        elapsed = time.monotonic() - start
+
+        # 5 requests over the burst at 20/s need ~0.25s
+        assert 0.2 <= elapsed < 2
+
+
+@pytest.mark.asyncio
+class TestEtherscanSession:
+    """Test HTTP session reuse."""
+
+    async def test_session_reused_across_calls(self, api):
+        """Test the same pooled session is returned on repeated calls."""
+        first = await api._get_session()
+        second = await api._get_session()
+        try:
+            assert first is second
+            assert not first.closed
+        finally:
+            await api.close()
+
+    async def test_close_releases_session(self, api):
+        """Test close() closes the session and a new one is created lazily."""
+        session = await api._get_session()
+        await api.close()
+
+        assert session.closed
+        assert api._session is None
+
+        replacement = await api._get_session()
+        assert replacement is not session
+        await api.close()
+
+    async def test_close_without_session(self, api):
+        """Test close() is a no-op before any request."""
+        await api.close()
+        assert api._session is None
+
+    async def test_transactions_use_shared_session(self, api):
+        """Test transaction lookups go through the shared session."""
+        session = MagicMock()
+        session.get.return_value = _mock_response({"status": "1", "result": []})
+
+        with patch.object(api, '_get_session', new=AsyncMock(return_value=session)):
+            await api._get_from_etherscan("0x" + "a" * 40)
+            await api._get_from_etherscan("0x" + "a" * 40)
+
+        assert session.get.call_count == 2
+        session.close.assert_not_called()
+
+
+@pytest.mark.asyncio
+class TestTransactionConfirmations:
+    """Test confirmation lookups."""
+
+    async def test_confirmations_via_etherscan(self, api):
+        """Test receipt and block number are fetched from Etherscan."""
+        responses = {
+            "eth_getTransactionReceipt": {"result": {"blockNumber": hex(100)}},
+            "eth_blockNumber": {"result": hex(111)},
+        }
+        session = MagicMock()
+        session.get.side_effect = lambda url, params: _mock_response(responses[params["action"]])
+
+        with patch.object(api, '_get_session', new=AsyncMock(return_value=session)):
+            confirmations = await api.get_transaction_confirmations("0xabc")
+
+        assert confirmations == 12
+        assert session.get.call_count == 2
+
+    async def test_confirmations_pending_receipt(self, api):
+        """Test an unmined transaction has zero confirmations."""
+        responses = {
+            "eth_getTransactionReceipt": {"result": None},
+            "eth_blockNumber": {"result": hex(111)},
+        }
+        session = MagicMock()
+        session.get.side_effect = lambda url, params: _mock_response(responses[params["action"]])
+
+        with patch.object(api, '_get_session', new=AsyncMock(return_value=session)):
+            assert await api.get_transaction_confirmations("0xabc") == 0
+
+    async def test_confirmations_etherscan_http_error(self, api):
+        """Test HTTP errors yield zero confirmations."""
+        session = MagicMock()
+        session.get.side_effect = lambda url, params: _mock_response({}, status=500)
+
+        with patch.object(api, '_get_session', new=AsyncMock(return_value=session)):
+            assert await api.get_transaction_confirmations("0xabc") == 0
+
+    async def test_confirmations_via_infura_batch(self):
+        """Test a single JSON-RPC batch is sent to Infura when configured."""
+        api = EtherscanAPI(api_key="test_key", infura_project_id="proj")
+        session = MagicMock()
+        session.post.return_value = _mock_response([
+            {"jsonrpc": "2.0", "id": 2, "result": hex(205)},
+            {"jsonrpc": "2.0", "id": 1, "result": {"blockNumber": hex(200)}},
+        ])
+
+        with patch.object(api, '_get_session', new=AsyncMock(return_value=session)):
+            confirmations = await api.get_transaction_confirmations("0xabc")
+
+        assert confirmations == 6
+        session.post.assert_called_once()
+        batch = session.post.call_args.kwargs["json"]
+        assert [call["method"] for call in batch] == ["eth_getTransactionReceipt", "eth_blockNumber"]
+        session.get.assert_not_called()
+
+    async def test_infura_failure_falls_back_to_etherscan(self):
+        """Test Etherscan is used when the Infura batch fails."""
+        api = EtherscanAPI(api_key="test_key", infura_project_id="proj")
+        responses = {
+            "eth_getTransactionReceipt": {"result": {"blockNumber": hex(10)}},
+            "eth_blockNumber": {"result": hex(10)},
+        }
+        session = MagicMock()
+        session.post.return_value = _mock_response({}, status=503)
+        session.get.side_effect = lambda url, params: _mock_response(responses[params["action"]])
+
+        with patch.object(api, '_get_session', new=AsyncMock(return_value=session)):
+            assert await api.get_transaction_confirmations("0xabc") == 1
+
+
+    async def test_many_confirmations_in_one_infura_batch(self):
+        """Test several receipts and the block number share one batch."""
+        api = EtherscanAPI(api_key="test_key", infura_project_id="proj")
+        session = MagicMock()
+        session.post.return_value = _mock_response([
+            {"jsonrpc": "2.0", "id": 1, "result": {"blockNumber": hex(200)}},
+            {"jsonrpc": "2.0", "id": 2, "result": None},
+            {"jsonrpc": "2.0", "id": 3, "result": hex(205)},
+        ])
+
+        with patch.object(api, '_get_session', new=AsyncMock(return_value=session)):
+            confirmations = await api.get_many_confirmations(["0xa", "0xb"])
+
+        assert confirmations == {"0xa": 6, "0xb": 0}
+        session.post.assert_called_once()
+        assert len(session.post.call_args.kwargs["json"]) == 3
+
+    async def test_many_confirmations_skip_known_blocks(self, api):
+        """Test receipts are only fetched for transactions with unknown blocks."""
+        api._tx_blocks["0xa"] = 100
+        with patch.object(api, '_get_receipts_and_block', new_callable=AsyncMock) as mock_fetch:
+            mock_fetch.return_value = ({"0xb": {"blockNumber": hex(105)}}, hex(110))
+            confirmations = await api.get_many_confirmations(["0xa", "0xb"])
+
+        mock_fetch.assert_called_once_with(["0xb"])
+        assert confirmations == {"0xa": 11, "0xb": 6}
+
+@pytest.mark.asyncio
+class TestStartBlock:
+    """Test scoping transaction scans to blocks after `since`."""
+
+    async def test_block_at_time_cached_per_minute(self, api):
+        """Test block lookups within the same minute share one request."""
+        with patch.object(api, '_etherscan_proxy', new_callable=AsyncMock) as mock_proxy:
+            mock_proxy.return_value = {"status": "1", "result": "18000000"}
+            assert await api._block_at_time(datetime.fromtimestamp(1_700_000_005)) == 18000000
+            assert await api._block_at_time(datetime.fromtimestamp(1_700_000_010)) == 18000000
+
+        assert mock_proxy.call_count == 1
+        assert mock_proxy.call_args[0][0]["action"] == "getblocknobytime"
+
+    async def test_start_block_applies_margin(self, api):
+        """Test the scan starts a safety margin before the block at `since`."""
+        with patch.object(api, '_block_at_time', new=AsyncMock(return_value=18000000)):
+            assert await api._start_block(datetime.fromtimestamp(1_700_000_000)) == (
+                18000000 - api.START_BLOCK_MARGIN
+            )
+        assert await api._start_block(None) == 0
+
+    async def test_start_block_falls_back_to_zero(self, api):
+        """Test a failed block lookup scans from the genesis block."""
+        with patch.object(api, '_etherscan_proxy', new=AsyncMock(return_value=None)):
+            assert await api._start_block(datetime.fromtimestamp(1_700_000_000)) == 0
+
+
+@pytest.mark.asyncio
+class TestEtherscanTxList:
+    """Test parsing of Etherscan txlist results."""
+
+    async def test_stops_at_first_transaction_before_since(self, api):
+        """Test parsing stops once results are older than `since`."""
+        to = "0x" + "a" * 40
+        payload = {"status": "1", "result": [
+            {"hash": "0x1", "to": to, "value": "1", "timeStamp": "1700000200"},
+            {"hash": "0x2", "to": to, "value": "1", "timeStamp": "1699999000"},
+            {"hash": "0x3", "to": to, "value": "1", "timeStamp": "1700000300"},
+        ]}
+        session = MagicMock()
+        session.get.return_value = _mock_response(payload)
+
+        with patch.object(api, '_get_session', new=AsyncMock(return_value=session)), \
+                patch.object(api, '_start_block', new=AsyncMock(return_value=0)), \
+                patch('bot.services.etherscan_api.EthereumTransaction', wraps=EthereumTransaction) as ctor:
+            txs = await api._get_from_etherscan(to, since=datetime.fromtimestamp(1_700_000_000))
+
+        assert [tx.hash for tx in txs] == ["0x1"]
+        assert ctor.call_count == 1
+
+    async def test_filters_raw_results_before_parsing(self, api):
+        """Test failed and outgoing transactions are skipped without parsing."""
+        to = "0x" + "a" * 40
+        payload = {"status": "1", "result": [
+            {"hash": "0x1", "to": to, "value": "1", "timeStamp": "1700000300", "isError": "1"},
+            {"hash": "0x2", "to": "0x" + "b" * 40, "value": "1", "timeStamp": "1700000200"},
+            {"hash": "0x3", "to": to.upper().replace("0X", "0x"), "value": "1", "timeStamp": "1700000100"},
+        ]}
+        session = MagicMock()
+        session.get.return_value = _mock_response(payload)
+
+        with patch.object(api, '_get_session', new=AsyncMock(return_value=session)), \
+                patch.object(api, '_start_block', new=AsyncMock(return_value=0)), \
+                patch('bot.services.etherscan_api.EthereumTransaction', wraps=EthereumTransaction) as ctor:
+            txs = await api._get_from_etherscan(to)
+
+        assert [tx.hash for tx in txs] == ["0x3"]
+        assert ctor.call_count == 1
+
+
+    async def test_no_transactions_found_is_empty(self, api):
+        """Test Etherscan's "No transactions found" reply is an empty list."""
+        payload = {"status": "0", "message": "No transactions found", "result": []}
+        session = MagicMock()
+        session.get.return_value = _mock_response(payload)
+
+        with patch.object(api, '_get_session', new=AsyncMock(return_value=session)), \
+                patch.object(api, '_start_block', new=AsyncMock(return_value=19_000_000)):
+            txs = await api._get_from_etherscan("0x" + "a" * 40, since=datetime.fromtimestamp(1_700_000_000))
+
+        assert txs == []
+
+    async def test_error_status_still_raises(self, api):
+        """Test a real Etherscan error is reported."""
+        payload = {"status": "0", "message": "NOTOK", "result": "Invalid API Key"}
+        session = MagicMock()
+        session.get.return_value = _mock_response(payload)
+
+        with patch.object(api, '_get_session', new=AsyncMock(return_value=session)), \
+                patch.object(api, '_start_block', new=AsyncMock(return_value=0)):
+            with pytest.raises(EtherscanAPIError, match="NOTOK"):
+                await api._get_from_etherscan("0x" + "a" * 40)
+
+@pytest.mark.asyncio
+class TestBlockWatcher:
+    """Test newHeads WebSocket tracking of the current block."""
+
+    async def test_start_requires_infura(self, api):
+        """Test the watcher is not started without an Infura project id."""
+        assert api.start_block_watcher() is False
+        assert api._watcher_task is None
+
+    async def test_watcher_tracks_new_heads(self):
+        """Test newHeads notifications update the current block."""
+        api = EtherscanAPI(api_key="test_key", infura_project_id="proj")
+        head = MagicMock(type=aiohttp.WSMsgType.TEXT, data=json.dumps(
+            {"method": "eth_subscription", "params": {"result": {"number": hex(500)}}}
+        ))
+
+        class FakeWS:
+            send_json = AsyncMock()
+
+            def __aiter__(self):
+                async def gen():
+                    yield head
+                return gen()
+
+        ws = FakeWS()
+        cm = MagicMock()
+        cm.__aenter__ = AsyncMock(return_value=ws)
+        cm.__aexit__ = AsyncMock(return_value=False)
+        session = MagicMock()
+        session.ws_connect.return_value = cm
+
+        with patch.object(api, '_get_session', new=AsyncMock(return_value=session)), \
+                patch('bot.services.etherscan_api.asyncio.sleep', side_effect=asyncio.CancelledError):
+            with pytest.raises(asyncio.CancelledError):
+                await api._watch_new_heads()
+
+        assert ws.send_json.call_args[0][0]["params"] == ["newHeads"]
+        assert api._watched_block() == 500
+
+    async def test_confirmations_from_watched_block(self, api):
+        """Test a live watcher and known tx block need no HTTP requests."""
+        api._tx_blocks["0xabc"] = 100
+        api._current_block = 111
+        api._current_block_seen = time.monotonic()
+
+        with patch.object(api, '_get_receipt_and_block', new_callable=AsyncMock) as mock_fetch:
+            assert await api.get_transaction_confirmations("0xabc") == 12
+
+        mock_fetch.assert_not_called()
+
+    async def test_stale_watcher_falls_back_to_polling(self, api):
+        """Test a stale watcher head is ignored in favour of polling."""
+        api._tx_blocks["0xabc"] = 100
+        api._current_block = 111
+        api._current_block_seen = time.monotonic() - api.BLOCK_WATCHER_STALE_AFTER - 1
+
+        with patch.object(api, '_get_receipt_and_block', new_callable=AsyncMock) as mock_fetch:
+            mock_fetch.return_value = ({"blockNumber": hex(100)}, hex(120))
+            assert await api.get_transaction_confirmations("0xabc") == 21
+
+        mock_fetch.assert_called_once()
+
+    async def test_cached_block_rechecked_at_threshold(self, api):
+        """Test a cached block is re-read from the receipt before it confirms."""
+        api._tx_blocks["0xabc"] = 100
+        api._current_block = 111
+        api._current_block_seen = time.monotonic()
+
+        with patch.object(api, '_get_receipt_and_block', new_callable=AsyncMock) as mock_fetch:
+            # Reorged into a later block
+            mock_fetch.return_value = ({"blockNumber": hex(105)}, hex(111))
+            assert await api.get_transaction_confirmations("0xabc", verify_at=12) == 7
+
+        assert api._tx_blocks["0xabc"] == 105
+
+    async def test_reorged_out_tx_has_no_confirmations(self, api):
+        """Test a transaction dropped by a reorg is forgotten."""
+        api._tx_blocks["0xa"] = 100
+        api._current_block = 111
+        api._current_block_seen = time.monotonic()
+
+        with patch.object(api, '_get_receipts_and_block', new_callable=AsyncMock) as mock_fetch:
+            mock_fetch.return_value = ({"0xa": None}, hex(111))
+            confirmations = await api.get_many_confirmations(["0xa"], verify_at=12)
+
+        assert confirmations == {"0xa": 0}
+        assert "0xa" not in api._tx_blocks
+
+    async def test_threshold_recheck_happens_once(self, api):
+        """Test confirmed transactions are not re-read on every later call."""
+        hashes = [f"0x{i}" for i in range(50)]
+        for tx_hash in hashes:
+            api._tx_blocks[tx_hash] = 100
+        api._current_block = 120
+        api._current_block_seen = time.monotonic()
+
+        with patch.object(api, '_get_receipts_and_block', new_callable=AsyncMock) as mock_fetch:
+            mock_fetch.return_value = ({h: {"blockNumber": hex(100)} for h in hashes}, hex(120))
+            for _ in range(3):
+                confirmations = await api.get_many_confirmations(hashes, verify_at=12)
+
+        mock_fetch.assert_called_once()
+        assert set(confirmations.values()) == {21}
+
+    async def test_batch_rechecks_crossing_without_watcher(self, api):
+        """Test a polled head that reaches the threshold still triggers a recheck."""
+        api._tx_blocks["0xa"] = 100
+
+        with patch.object(api, '_get_receipts_and_block', new_callable=AsyncMock) as mock_fetch:
+            mock_fetch.side_effect = [
+                ({}, hex(111)),
+                ({"0xa": {"blockNumber": hex(103)}}, hex(111)),
+            ]
+            confirmations = await api.get_many_confirmations(["0xa"], verify_at=12)
+
+        assert mock_fetch.call_args_list[1].args == (["0xa"],)
+        assert confirmations == {"0xa": 9}
+
+    async def test_tx_block_cache_is_bounded(self, api):
+        """Test the oldest tx block is evicted once the cache is full."""
+        with patch.object(api, 'TX_BLOCK_CACHE_SIZE', 2), \
+                patch.object(api, '_get_receipt_and_block', new_callable=AsyncMock) as mock_fetch:
+            mock_fetch.return_value = ({"blockNumber": hex(100)}, hex(110))
+            for tx_hash in ("0xa", "0xb", "0xc"):
+                await api.get_transaction_confirmations(tx_hash)
+
+        assert list(api._tx_blocks) == ["0xb", "0xc"]
+
+
+def _tx(timestamp: int, value: str = "100000000000000000") -> EthereumTransaction:
+    """Build a transaction to the test address."""
+    return EthereumTransaction({
+        "hash": f"0x{timestamp:064x}",
+        "to": "0x" + "a" * 40,
+        "value": value,
+        "timeStamp": str(timestamp),
+        "confirmations": "3",
+    })
+
+
+@pytest.mark.asyncio
+class TestAddressTransactionCache:
+    """Test per-address caching and request deduplication."""
+
+    async def test_concurrent_lookups_share_one_request(self, api):
+        """Test concurrent lookups for one address issue a single fetch."""
+        async def slow_fetch(address, since=None):
+            await asyncio.sleep(0.01)
+            return [_tx(1_700_000_000)]
+
+        with patch.object(api, '_get_from_etherscan', side_effect=slow_fetch) as mock_fetch:
+            results = await asyncio.gather(*(
+                api.get_address_transactions("0x" + "A" * 40) for _ in range(5)
+            ))
+
+        assert mock_fetch.call_count == 1
+        assert all(len(r) == 1 for r in results)
+        assert api._inflight == {}
+
+    async def test_cached_result_reused_within_ttl(self, api):
+        """Test a fresh cache entry is served without a new request."""
+        with patch.object(api, '_get_from_etherscan', new_callable=AsyncMock) as mock_fetch:
+            mock_fetch.return_value = [_tx(1_700_000_000)]
+            await api.get_address_transactions("0x" + "a" * 40)
+            await api.get_address_transactions("0x" + "a" * 40)
+
+        assert mock_fetch.call_count == 1
+
+    async def test_expired_cache_refetches(self, api):
+        """Test an expired cache entry triggers a new request."""
+        with patch.object(api, '_get_from_etherscan', new_callable=AsyncMock) as mock_fetch:
+            mock_fetch.return_value = []
+            await api.get_address_transactions("0x" + "a" * 40)
+            key = "0x" + "a" * 40
+            api._tx_cache[key] = (time.monotonic() - api.TX_CACHE_TTL - 1, None, [])
+            await api.get_address_transactions("0x" + "a" * 40)
+
+        assert mock_fetch.call_count == 2
+
+    async def test_since_filters_cached_transactions(self, api):
+        """Test `since` is applied to the shared cached list."""
+        with patch.object(api, '_get_from_etherscan', new_callable=AsyncMock) as mock_fetch:
+            mock_fetch.return_value = [_tx(1_700_000_200), _tx(1_700_000_000)]
+            since = datetime.fromtimestamp(1_700_000_100)
+            recent = await api.get_address_transactions("0x" + "a" * 40, since=since)
+            everything = await api.get_address_transactions("0x" + "a" * 40)
+
+        assert len(recent) == 1
+        assert len(everything) == 2
+
+    async def test_cache_reused_for_later_since_only(self, api):
+        """Test a lookup from an earlier `since` serves later ones, not vice versa."""
+        with patch.object(api, '_get_from_etherscan', new_callable=AsyncMock) as mock_fetch:
+            mock_fetch.return_value = []
+            await api.get_address_transactions("0x" + "a" * 40, since=datetime.fromtimestamp(1_700_000_000))
+            await api.get_address_transactions("0x" + "a" * 40, since=datetime.fromtimestamp(1_700_000_500))
+            assert mock_fetch.call_count == 1
+
+            await api.get_address_transactions("0x" + "a" * 40, since=datetime.fromtimestamp(1_699_999_000))
+            assert mock_fetch.call_count == 2
+
+    async def test_failure_not_cached(self, api):
+        """Test failed lookups raise and are retried on the next call."""
+        with patch.object(api, '_get_from_etherscan', new_callable=AsyncMock) as mock_fetch:
+            mock_fetch.side_effect = [Exception("boom"), []]
+            with pytest.raises(EtherscanAPIError, match="All Ethereum APIs failed"):
+                await api.get_address_transactions("0x" + "a" * 40)
+            assert await api.get_address_transactions("0x" + "a" * 40) == []
+
+
+@pytest.mark.asyncio
+class TestFindPayment:
+    """Test payment matching in integer Wei."""
+
+    async def test_value_stored_as_integer_wei(self):
+        """Test transaction values are kept as int Wei with a Decimal ETH view."""
+        tx = _tx(1_700_000_000, value="123450000000000000")
+        assert tx.value_wei == 123450000000000000
+        assert tx.value_eth == Decimal("0.12345")
+        assert tx.timestamp_ts == 1_700_000_000
+        assert tx.timestamp == datetime.fromtimestamp(1_700_000_000)
+
+    async def test_matches_within_tolerance(self, api):
+        """Test a payment within tolerance is found and others are ignored."""
+        txs = [_tx(1_700_000_300, value="500000000000000000"),
+               _tx(1_700_000_200, value="100500000000000000")]
+        with patch.object(api, '_get_from_etherscan', new=AsyncMock(return_value=txs)):
+            found = await api.find_payment(
+                "0x" + "a" * 40, Decimal("0.1"), datetime.fromtimestamp(1_700_000_000)
+            )
+
+        assert found is txs[1]
+
+    async def test_no_match_outside_tolerance(self, api):
+        """Test amounts beyond the tolerance do not match."""
+        txs = [_tx(1_700_000_200, value="101100000000000000")]
+        with patch.object(api, '_get_from_etherscan', new=AsyncMock(return_value=txs)):
+            found = await api.find_payment(
+                "0x" + "a" * 40, Decimal("0.1"), datetime.fromtimestamp(1_700_000_000)
+            )
+
+        assert found is None
+
+    async def test_custom_tolerance_in_wei(self, api):
+        """Test the tolerance is given in integer Wei."""
+        txs = [_tx(1_700_000_200, value="100000000000000005")]
+        with patch.object(api, '_get_from_etherscan', new=AsyncMock(return_value=txs)):
+            assert await api.find_payment(
+                "0x" + "a" * 40, Decimal("0.1"), datetime.fromtimestamp(1_700_000_000),
+                tolerance_wei=4
+            ) is None
+            assert await api.find_payment(
+                "0x" + "a" * 40, Decimal("0.1"), datetime.fromtimestamp(1_700_000_000),
+                tolerance_wei=5
+            ) is txs[0]
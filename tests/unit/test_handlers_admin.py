@@ -1465,6 +1465,7 @@ class TestAdminHandlers:
         call_args = mock_callback_update.callback_query.edit_message_text.call_args
         assert "Pending Payouts" in call_args[0][0]
         assert "Order #1" in call_args[0][0]
+        mock_payout.get_pending_payouts.assert_called_once_with(limit=10)
 
     @pytest.mark.asyncio
     async def test_handle_super_admin_callback_vendors(self, mock_callback_update, mock_callback_context, mock_settings):
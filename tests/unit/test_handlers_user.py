@@ -1833,7 +1833,7 @@ class TestOrderCallbackExtended:
             price_fiat=Decimal("5.00"), currency="USD", is_active=True
         )
         mock_postage = MagicMock(spec=PostageService)
-        mock_postage.list_by_vendor.return_value = [mock_postage_type]
+        mock_postage.list_active_for_menu.return_value = [mock_postage_type]
 
         await handle_order_callback(mock_update, mock_context, catalog=mock_catalog, postage=mock_postage)
 
@@ -1855,7 +1855,7 @@ class TestOrderCallbackExtended:
         mock_catalog.get_product.return_value = product
 
         mock_postage = MagicMock(spec=PostageService)
-        mock_postage.list_by_vendor.return_value = []
+        mock_postage.list_active_for_menu.return_value = []
 
         await handle_order_callback(mock_update, mock_context, catalog=mock_catalog, postage=mock_postage)
 
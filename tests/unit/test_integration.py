@@ -42,7 +42,8 @@ class TestIntegration:
         """Create test database."""
         return Database(url=f"sqlite:///{tmp_path}/test.db")
 
-    def test_full_order_flow(self, db, test_settings):
+    @pytest.mark.asyncio
+    async def test_full_order_flow(self, db, test_settings):
         """Test complete order flow from product creation to order."""
         # Initialize services
         vendors = VendorService(db)
@@ -76,7 +77,7 @@ class TestIntegration:
         assert found_products[0].id == product.id
         
         # Create order
-        order_data = orders.create_order(
+        order_data = await orders.create_order(
             product_id=product.id,
             quantity=2,
             address="123 Test Street, Test City"
@@ -108,7 +109,8 @@ class TestIntegration:
         order = orders.fulfill_order(order.id)
         assert order.state == "FULFILLED"
 
-    def test_vendor_commission_flow(self, db, test_settings):
+    @pytest.mark.asyncio
+    async def test_vendor_commission_flow(self, db, test_settings):
         """Test vendor commission calculation."""
         vendors = VendorService(db)
         catalog = CatalogService(db)
@@ -136,13 +138,14 @@ class TestIntegration:
         )
 
         # Create order
-        order_data = orders.create_order(product.id, 1, "address")
+        order_data = await orders.create_order(product.id, 1, "address")
 
         # Verify commission
         order = orders.get_order(order_data["order_id"])
         assert order.commission_xmr == Decimal("1.0")  # 10.0 * 0.10
 
-    def test_inventory_management(self, db, test_settings):
+    @pytest.mark.asyncio
+    async def test_inventory_management(self, db, test_settings):
         """Test inventory tracking and limits."""
         vendors = VendorService(db)
         catalog = CatalogService(db)
@@ -162,15 +165,15 @@ class TestIntegration:
         )
         
         # Order 1 item - should succeed
-        order1 = orders.create_order(product.id, 1, "addr1")
+        order1 = await orders.create_order(product.id, 1, "addr1")
         assert order1["order_id"] is not None
         
         # Try to order 2 more items - should fail
         with pytest.raises(ValueError, match="Insufficient inventory"):
-            orders.create_order(product.id, 2, "addr2")
+            await orders.create_order(product.id, 2, "addr2")
         
         # Order last item - should succeed
-        order2 = orders.create_order(product.id, 1, "addr2")
+        order2 = await orders.create_order(product.id, 1, "addr2")
         assert order2["order_id"] is not None
         
         # Verify inventory is depleted
@@ -32,6 +32,10 @@ class TestMain:
         mock_settings.return_value.log_file = None
         mock_settings.return_value.environment = "test"
         mock_settings.return_value.database_url = "sqlite:///test.db"
+        mock_settings.return_value.db_pool_size = 10
+        mock_settings.return_value.db_max_overflow = 5
+        mock_settings.return_value.db_pool_recycle = 1800
+        mock_settings.return_value.db_pool_timeout = 30
 
         mock_app = MagicMock()
         mock_app.add_handler = MagicMock()
@@ -48,7 +52,13 @@ class TestMain:
 
         # Verify setup
         mock_setup_logging.assert_called_once_with("INFO", None)
-        mock_db.assert_called_once_with("sqlite:///test.db")
+        mock_db.assert_called_once_with(
+            "sqlite:///test.db",
+            pool_size=10,
+            max_overflow=5,
+            pool_recycle=1800,
+            pool_timeout=30,
+        )
 
         # Verify services initialized
         mock_vendors.assert_called_once()
@@ -84,7 +94,8 @@ class TestMain:
             "db": mock_db
         }
 
-        with patch('bot.main.asyncio.create_task') as mock_create_task:
+        with patch('bot.main.asyncio.create_task') as mock_create_task, \
+                patch('bot.main.PaymentServiceFactory.start_all', new_callable=AsyncMock) as mock_start_all:
             await post_init(mock_app)
 
             # Verify health server started
@@ -92,6 +103,7 @@ class TestMain:
 
             # Verify background tasks started
             mock_create_task.assert_called_once()
+            mock_start_all.assert_awaited_once()
 
     @pytest.mark.asyncio
     async def test_post_shutdown(self):
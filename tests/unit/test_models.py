@@ -8,3 +8,48 @@ def test_encrypt_decrypt() -> None:
     text = "hello"
     cipher = encrypt(text, key)
     assert decrypt(cipher, key) == text
+
+
+def test_database_pool_options_for_server_url(monkeypatch) -> None:
+    from unittest.mock import MagicMock
+    from bot.models import Database, SQLModel
+
+    engine_factory = MagicMock()
+    monkeypatch.setattr("bot.models.create_engine", engine_factory)
+    monkeypatch.setattr(SQLModel.metadata, "create_all", MagicMock())
+    monkeypatch.setattr(Database, "_run_migrations", lambda self: None)
+
+    Database("mysql+pymysql://bot:pw@db/bot", pool_size=20, pool_timeout=10)
+
+    kwargs = engine_factory.call_args.kwargs
+    assert kwargs["pool_size"] == 20
+    assert kwargs["max_overflow"] == 5
+    assert kwargs["pool_timeout"] == 10
+    assert kwargs["pool_pre_ping"] is False
+
+
+def test_database_sqlite_keeps_default_pool(tmp_path) -> None:
+    from sqlalchemy.pool import QueuePool
+    from bot.models import Database
+
+    db = Database(url=f"sqlite:///{tmp_path/'test.db'}")
+    assert isinstance(db.engine.pool, QueuePool)
+    assert db.engine.pool.size() == 5
+
+
+def test_database_adds_indexes_to_existing_tables(tmp_path) -> None:
+    from sqlalchemy import inspect, text
+    from bot.models import Database
+
+    url = f"sqlite:///{tmp_path/'test.db'}"
+    db = Database(url=url)
+    with db.engine.begin() as conn:
+        for name in ("ix_orders_created", "ix_postage_vendor_active", "ix_payout_status"):
+            conn.execute(text(f"DROP INDEX {name}"))
+    db.engine.dispose()
+
+    db = Database(url=url)
+    inspector = inspect(db.engine)
+    assert "ix_orders_created" in {ix["name"] for ix in inspector.get_indexes("order")}
+    assert "ix_postage_vendor_active" in {ix["name"] for ix in inspector.get_indexes("postagetype")}
+    assert {ix["name"]: ix["column_names"] for ix in inspector.get_indexes("payout")}["ix_payout_status"] == ["status"]
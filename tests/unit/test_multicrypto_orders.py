@@ -1,14 +1,20 @@
 """Tests for multi-crypto order service."""
 
+import asyncio
 import pytest
 import tempfile
 import os
+import base64
 from decimal import Decimal
 from unittest.mock import AsyncMock, MagicMock, patch
 
+from nacl.secret import SecretBox
+
 from bot.services.multicrypto_orders import (
-    MultiCryptoOrderService, encrypt_address, decrypt_address
+    MultiCryptoOrderService, encrypt_address, decrypt_address, _get_key,
+    AES_GCM_VERSION
 )
+from bot.services import multicrypto_orders
 from bot.services.crypto_swap import CryptoSwapService, SwapOrder, SwapStatus
 from bot.models_multitenant import (
     MultiTenantDatabase, OrderState, SwapState
@@ -51,6 +57,54 @@ class TestEncryption:
         with pytest.raises(Exception):
             decrypt_address(encrypted, key2)
 
+    def test_key_reused_per_tenant_key(self):
+        """Test the key for a tenant is derived once and reused."""
+        key = "cd" * 32
+        _get_key.cache_clear()
+
+        encrypted = encrypt_address("1 Main St", key)
+        decrypt_address(encrypted, key)
+
+        info = _get_key.cache_info()
+        assert info.misses == 1
+        assert info.hits == 1
+
+    def test_encrypts_with_versioned_aes_gcm(self):
+        """Test new ciphertexts are AES-GCM with a version prefix."""
+        if not multicrypto_orders._AES_GCM:
+            pytest.skip("AES-256-GCM not supported on this CPU")
+        encrypted = base64.b64decode(encrypt_address("1 Main St", "ab" * 32))
+
+        assert encrypted[:1] == AES_GCM_VERSION
+        assert len(encrypted) == 1 + 12 + len("1 Main St") + 16
+
+    def test_decrypts_aes_gcm_when_writing_secretbox(self):
+        """Test AES-GCM addresses decrypt even where new writes use SecretBox."""
+        if not multicrypto_orders._AES_GCM:
+            pytest.skip("AES-256-GCM not supported on this CPU")
+        key = "ab" * 32
+        encrypted = encrypt_address("1 Main St", key)
+
+        with patch.object(multicrypto_orders, "_AES_GCM", False):
+            assert decrypt_address(encrypted, key) == "1 Main St"
+
+    def test_decrypts_legacy_secretbox_ciphertext(self):
+        """Test addresses encrypted with SecretBox still decrypt."""
+        key = "ab" * 32
+        legacy = base64.b64encode(SecretBox(bytes.fromhex(key)).encrypt(b"1 Main St")).decode()
+
+        assert decrypt_address(legacy, key) == "1 Main St"
+
+    def test_decrypts_legacy_ciphertext_with_version_like_nonce(self):
+        """Test a SecretBox nonce starting with the version byte falls back."""
+        key = "ab" * 32
+        nonce = AES_GCM_VERSION + bytes(23)
+        legacy = base64.b64encode(
+            SecretBox(bytes.fromhex(key)).encrypt(b"1 Main St", nonce)
+        ).decode()
+
+        assert decrypt_address(legacy, key) == "1 Main St"
+
 
 class TestMultiCryptoOrderService:
     """Test MultiCryptoOrderService functionality."""
@@ -103,6 +157,23 @@ class TestMultiCryptoOrderService:
         assert "eth" in methods
         assert "sol" in methods
 
+    @pytest.mark.asyncio
+    async def test_supported_payment_methods_cached(self, order_service):
+        """Test the swap provider's coin list is fetched once per TTL."""
+        with patch.object(
+            order_service.swap_service, 'get_supported_coins',
+            new_callable=AsyncMock, return_value=["xmr", "btc"]
+        ) as mock_coins:
+            await order_service.get_supported_payment_methods()
+            methods = await order_service.get_supported_payment_methods()
+
+            assert methods == ["xmr", "btc"]
+            mock_coins.assert_awaited_once()
+
+            order_service._supported_fetched -= order_service.SUPPORTED_COINS_TTL
+            await order_service.get_supported_payment_methods()
+            assert mock_coins.await_count == 2
+
     # ==================== ORDER CREATION TESTS ====================
 
     @pytest.mark.asyncio
@@ -128,6 +199,25 @@ class TestMultiCryptoOrderService:
         assert result["payment_address"] == tenant.monero_wallet_address
         assert result["swap_id"] is None
 
+    @pytest.mark.asyncio
+    async def test_create_order_xmr_skips_supported_coins(self, order_service, tenant_with_product):
+        """Test direct XMR orders don't consult the swap provider's coin list."""
+        tenant, product = tenant_with_product
+
+        with patch.object(
+            order_service.swap_service, 'get_supported_coins', new_callable=AsyncMock
+        ) as mock_coins:
+            await order_service.create_order(
+                tenant_id=tenant.id,
+                product_id=product.id,
+                customer_telegram_id=12345,
+                quantity=1,
+                delivery_address="123 Main St",
+                payment_coin="xmr"
+            )
+
+        mock_coins.assert_not_awaited()
+
     @pytest.mark.asyncio
     async def test_create_order_btc_swap(self, order_service, tenant_with_product):
         """Test creating an order with BTC payment (swap required)."""
@@ -540,6 +630,52 @@ class TestMultiCryptoOrderService:
             assert results["completed"] == 0
             assert results["failed"] == 0
 
+    @pytest.mark.asyncio
+    async def test_process_pending_swaps_queries_concurrently(self, order_service, db, tenant_with_product):
+        """Test swap statuses are requested concurrently."""
+        tenant, product = tenant_with_product
+
+        for customer in (12345, 12346, 12347):
+            await order_service.create_order(
+                tenant.id, product.id, customer, 1, "Address", "btc"
+            )
+
+        in_flight = 0
+        peak = 0
+
+        async def slow_status(swap_id, provider):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return SwapStatus.COMPLETE
+
+        with patch.object(order_service.swap_service, 'check_swap_status', side_effect=slow_status):
+            results = await order_service.process_pending_swaps()
+
+        assert results["completed"] == 3
+        assert peak == 3
+
+    @pytest.mark.asyncio
+    async def test_process_pending_swaps_single_db_write(self, order_service, db, tenant_with_product):
+        """Test all swap status changes are written in one bulk update."""
+        tenant, product = tenant_with_product
+
+        for customer in (12345, 12346):
+            await order_service.create_order(
+                tenant.id, product.id, customer, 1, "Address", "btc"
+            )
+
+        with patch.object(db, 'bulk_update_swap_status', wraps=db.bulk_update_swap_status) as bulk, \
+                patch.object(db, 'update_order_swap_status') as single:
+            results = await order_service.process_pending_swaps()
+
+        bulk.assert_called_once()
+        assert len(bulk.call_args[0][0]) == 2
+        single.assert_not_called()
+        assert results["completed"] == 2
+
     @pytest.mark.asyncio
     async def test_get_order_returns_order(self, order_service, db, tenant_with_product):
         """Test get_order returns the order."""
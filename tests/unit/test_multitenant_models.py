@@ -314,6 +314,76 @@ class TestMultiTenantDatabase:
         assert updated.swap_status == SwapState.FAILED
         assert updated.state == OrderState.CANCELLED
 
+    def test_cancel_order_restores_inventory(self, db, tenant):
+        """Test cancelling an order restores inventory atomically."""
+        product = db.create_product(tenant.id, "Test", Decimal("1.0"), 10)
+        order = db.create_order(
+            tenant.id, product.id, 12345, 3, Decimal("3.0"),
+            Decimal("0.15"), "xmr", Decimal("3.0"), "4...", "enc"
+        )
+
+        cancelled = db.cancel_order(order.id, tenant.id)
+
+        assert cancelled.state == OrderState.CANCELLED
+        assert db.get_product(product.id, tenant.id).inventory == 13
+
+    def test_cancel_order_twice_restores_once(self, db, tenant):
+        """Test a repeated cancel does not restock the product again."""
+        product = db.create_product(tenant.id, "Test", Decimal("1.0"), 10)
+        order = db.create_order(
+            tenant.id, product.id, 12345, 3, Decimal("3.0"),
+            Decimal("0.15"), "xmr", Decimal("3.0"), "4...", "enc"
+        )
+
+        db.cancel_order(order.id, tenant.id)
+        cancelled = db.cancel_order(order.id, tenant.id)
+
+        assert cancelled.state == OrderState.CANCELLED
+        assert db.get_product(product.id, tenant.id).inventory == 13
+
+    def test_cancel_order_wrong_tenant(self, db, tenant):
+        """Test an order cannot be cancelled through another tenant."""
+        product = db.create_product(tenant.id, "Test", Decimal("1.0"), 10)
+        order = db.create_order(
+            tenant.id, product.id, 12345, 1, Decimal("1.0"),
+            Decimal("0.05"), "xmr", Decimal("1.0"), "4...", "enc"
+        )
+
+        assert db.cancel_order(order.id, "other-tenant") is None
+        assert db.get_product(product.id, tenant.id).inventory == 10
+
+    def test_bulk_update_swap_status(self, db, tenant):
+        """Test updating several orders' swap status at once."""
+        product = db.create_product(tenant.id, "Test", Decimal("1.0"), 10)
+        orders = [
+            db.create_order(
+                tenant.id, product.id, 12345, 1, Decimal("1.0"),
+                Decimal("0.05"), "btc", Decimal("0.004"), "bc1q...", "enc",
+                swap_id=f"swap{i}", swap_provider="trocador"
+            )
+            for i in range(3)
+        ]
+
+        updated = db.bulk_update_swap_status([
+            (orders[0].id, SwapState.COMPLETE),
+            (orders[1].id, SwapState.EXPIRED),
+            (orders[2].id, SwapState.EXCHANGING),
+        ])
+
+        assert updated == 3
+        complete, expired, exchanging = (
+            db.get_order(order.id, tenant.id) for order in orders
+        )
+        assert complete.state == OrderState.PAID
+        assert complete.paid_at is not None
+        assert expired.state == OrderState.CANCELLED
+        assert exchanging.swap_status == SwapState.EXCHANGING
+        assert exchanging.state == orders[2].state
+
+    def test_bulk_update_swap_status_empty(self, db):
+        """Test an empty update list is a no-op."""
+        assert db.bulk_update_swap_status([]) == 0
+
     def test_get_pending_swap_orders(self, db, tenant):
         """Test getting pending swap orders."""
         product = db.create_product(tenant.id, "Test", Decimal("1.0"), 10)
@@ -449,3 +519,30 @@ class TestMultiTenantDatabase:
 
         assert len(completed) == 1
         assert completed[0].id == order1.id
+
+    # ==================== INDEX TESTS ====================
+
+    def test_order_lookup_indexes_created(self, db):
+        """Test composite order indexes exist for hot lookup predicates."""
+        from sqlalchemy import inspect
+
+        indexes = {
+            ix["name"]: ix["column_names"]
+            for ix in inspect(db.engine).get_indexes("tenant_orders")
+        }
+
+        assert indexes["ix_tenant_orders_state_created"] == ["state", "created_at"]
+        assert indexes["ix_tenant_order_state_swap"] == ["tenant_id", "state", "swap_id"]
+
+    def test_order_indexes_added_to_existing_table(self, db):
+        """Test indexes are backfilled when the table predates them."""
+        from sqlalchemy import inspect, text
+
+        with db.engine.connect() as conn:
+            conn.execute(text("DROP INDEX ix_tenant_order_state_swap"))
+            conn.commit()
+
+        reopened = MultiTenantDatabase(str(db.engine.url))
+        names = {ix["name"] for ix in inspect(reopened.engine).get_indexes("tenant_orders")}
+
+        assert "ix_tenant_order_state_swap" in names
@@ -8,10 +8,11 @@ import base64, os
 from bot.config import Settings
 import pytest
 from datetime import timedelta, datetime
-from unittest.mock import patch
+from unittest.mock import AsyncMock, patch
 
 
-def test_create_and_mark_paid(monkeypatch, tmp_path) -> None:
+@pytest.mark.asyncio
+async def test_create_and_mark_paid(monkeypatch, tmp_path) -> None:
     key = base64.b64encode(os.urandom(32)).decode()
     settings = Settings(
         telegram_token="123:ABC",
@@ -35,7 +36,7 @@ def test_create_and_mark_paid(monkeypatch, tmp_path) -> None:
     product = catalog.add_product(
         Product(name="p", description="", price_xmr=Decimal("1.0"), inventory=10, vendor_id=vendor.id)
     )
-    order_data = orders.create_order(product.id, 1, "addr")
+    order_data = await orders.create_order(product.id, 1, "addr")
     order_id = order_data["order_id"]
     assert order_data["total_xmr"] == Decimal("1.0")
     assert order_data["quantity"] == 1
@@ -68,7 +69,8 @@ def test_create_and_mark_paid(monkeypatch, tmp_path) -> None:
     assert orders.get_order(order_id) is None
 
 
-def test_create_order_errors(tmp_path) -> None:
+@pytest.mark.asyncio
+async def test_create_order_errors(tmp_path) -> None:
     db = Database(url=f"sqlite:///{tmp_path/'test.db'}")
     vendors = VendorService(db)
     catalog = CatalogService(db)
@@ -77,7 +79,7 @@ def test_create_order_errors(tmp_path) -> None:
     
     # Test product not found
     with pytest.raises(ValueError, match="Product not found"):
-        orders.create_order(1, 1, "a")
+        await orders.create_order(1, 1, "a")
     
     vend = vendors.add_vendor(Vendor(telegram_id=2, name="v"))
     product = catalog.add_product(
@@ -86,17 +88,18 @@ def test_create_order_errors(tmp_path) -> None:
     
     # Test insufficient inventory
     with pytest.raises(ValueError, match="Insufficient inventory"):
-        orders.create_order(product.id, 2, "a")
+        await orders.create_order(product.id, 2, "a")
     
     # remove vendor to trigger not found
     with db.session() as s:
         s.delete(vend)
         s.commit()
     with pytest.raises(ValueError, match="Vendor not found"):
-        orders.create_order(product.id, 1, "a")
+        await orders.create_order(product.id, 1, "a")
 
 
-def test_create_order_vendor_no_wallet(monkeypatch, tmp_path) -> None:
+@pytest.mark.asyncio
+async def test_create_order_vendor_no_wallet(monkeypatch, tmp_path) -> None:
     """Test create_order raises error when vendor has no wallet and no RPC."""
     key = base64.b64encode(os.urandom(32)).decode()
     settings = Settings(
@@ -124,10 +127,11 @@ def test_create_order_vendor_no_wallet(monkeypatch, tmp_path) -> None:
     )
 
     with pytest.raises(ValueError, match="Vendor has not configured their payment wallet"):
-        orders.create_order(product.id, 1, "addr")
+        await orders.create_order(product.id, 1, "addr")
 
 
-def test_create_order_with_postage(monkeypatch, tmp_path) -> None:
+@pytest.mark.asyncio
+async def test_create_order_with_postage(monkeypatch, tmp_path) -> None:
     """Test create_order with postage type."""
     from bot.models import PostageType
     key = base64.b64encode(os.urandom(32)).decode()
@@ -143,8 +147,8 @@ def test_create_order_with_postage(monkeypatch, tmp_path) -> None:
     )
     monkeypatch.setattr("bot.config.get_settings", lambda: settings)
     monkeypatch.setattr("bot.services.orders.get_settings", lambda: settings)
-    # Mock fiat_to_xmr_sync to return a fixed rate
-    monkeypatch.setattr("bot.services.orders.fiat_to_xmr_sync", lambda amount, currency: Decimal("0.1"))
+    # Mock fiat_to_crypto to return a fixed rate
+    monkeypatch.setattr("bot.services.orders.fiat_to_crypto", AsyncMock(return_value=Decimal("0.1")))
 
     db = Database(url=f"sqlite:///{tmp_path/'test.db'}")
     vendors = VendorService(db)
@@ -171,13 +175,61 @@ def test_create_order_with_postage(monkeypatch, tmp_path) -> None:
         session.refresh(postage)
         postage_id = postage.id
 
-    order_data = orders.create_order(product.id, 1, "addr", postage_type_id=postage_id)
+    order_data = await orders.create_order(product.id, 1, "addr", postage_type_id=postage_id)
 
     assert order_data["postage_xmr"] == Decimal("0.1")
     assert order_data["total_xmr"] == Decimal("1.1")  # 1.0 + 0.1 postage
 
 
-def test_get_payment_info_xmr(monkeypatch, tmp_path) -> None:
+@pytest.mark.asyncio
+async def test_create_order_with_xmr_postage(monkeypatch, tmp_path) -> None:
+    """Test postage priced in XMR is used as-is instead of converted."""
+    from bot.models import PostageType
+    key = base64.b64encode(os.urandom(32)).decode()
+    settings = Settings(
+        telegram_token="123:ABC",
+        admin_ids="",
+        super_admin_ids="",
+        monero_rpc_url="url",
+        encryption_key=key,
+        data_retention_days=30,
+        default_commission_rate=0.05,
+        totp_secret=None,
+    )
+    monkeypatch.setattr("bot.config.get_settings", lambda: settings)
+    monkeypatch.setattr("bot.services.orders.get_settings", lambda: settings)
+    mock_convert = AsyncMock(return_value=Decimal("1.0"))
+    monkeypatch.setattr("bot.services.orders.fiat_to_crypto", mock_convert)
+
+    db = Database(url=f"sqlite:///{tmp_path/'test.db'}")
+    vendors = VendorService(db)
+    vendor = vendors.add_vendor(Vendor(telegram_id=1, name="vend", wallet_address="4ABC..."))
+    catalog = CatalogService(db)
+    orders = OrderService(db, PaymentService(), catalog, vendors)
+    product = catalog.add_product(
+        Product(name="p", description="", price_xmr=Decimal("1.0"), inventory=10, vendor_id=vendor.id)
+    )
+    with db.session() as session:
+        postage = PostageType(vendor_id=vendor.id, name="Std", price_fiat=Decimal("0.05"), currency="XMR")
+        session.add(postage)
+        session.commit()
+        postage_id = postage.id
+
+    order_data = await orders.create_order(product.id, 1, "addr", postage_type_id=postage_id)
+
+    assert order_data["postage_xmr"] == Decimal("0.05")
+    # Only the product subtotal is converted; XMR postage is added to it
+    mock_convert.assert_awaited_once()
+    assert mock_convert.await_args.args[0] == Decimal("150")
+    assert order_data["total_xmr"] == Decimal("1.05")
+    assert order_data["total_crypto"] == Decimal("1.05")
+    stored = orders.get_order(order_data["order_id"])
+    assert stored.payment_amount_crypto == Decimal("1.05")
+    assert stored.postage_xmr == Decimal("0.05")
+
+
+@pytest.mark.asyncio
+async def test_get_payment_info_xmr(monkeypatch, tmp_path) -> None:
     """Test get_payment_info for XMR."""
     key = base64.b64encode(os.urandom(32)).decode()
     settings = Settings(
@@ -203,7 +255,7 @@ def test_get_payment_info_xmr(monkeypatch, tmp_path) -> None:
         Product(name="p", description="", price_xmr=Decimal("2.5"), inventory=10, vendor_id=vendor.id)
     )
 
-    order_data = orders.create_order(product.id, 2, "addr")
+    order_data = await orders.create_order(product.id, 2, "addr")
     order_id = order_data["order_id"]
 
     payment_info = orders.get_payment_info(order_id, "XMR")
@@ -213,7 +265,8 @@ def test_get_payment_info_xmr(monkeypatch, tmp_path) -> None:
     assert "address" in payment_info
 
 
-def test_get_payment_info_uses_existing_payment_id(monkeypatch, tmp_path) -> None:
+@pytest.mark.asyncio
+async def test_get_payment_info_uses_existing_payment_id(monkeypatch, tmp_path) -> None:
     """Test get_payment_info uses stored payment_id."""
     key = base64.b64encode(os.urandom(32)).decode()
     settings = Settings(
@@ -240,7 +293,7 @@ def test_get_payment_info_uses_existing_payment_id(monkeypatch, tmp_path) -> Non
     )
 
     with patch.object(payments, "get_address_for_payment_id", return_value="4ADDR") as mock_get_address:
-        order_data = orders.create_order(product.id, 1, "addr")
+        order_data = await orders.create_order(product.id, 1, "addr")
         mock_get_address.reset_mock()
 
         payment_info = orders.get_payment_info(order_data["order_id"], "XMR")
@@ -253,7 +306,8 @@ def test_get_payment_info_uses_existing_payment_id(monkeypatch, tmp_path) -> Non
         assert payment_info["payment_id"] == order_data["payment_id"]
 
 
-def test_get_payment_info_other_coin(monkeypatch, tmp_path) -> None:
+@pytest.mark.asyncio
+async def test_get_payment_info_other_coin(monkeypatch, tmp_path) -> None:
     """Test get_payment_info for non-XMR coin."""
     key = base64.b64encode(os.urandom(32)).decode()
     settings = Settings(
@@ -279,7 +333,7 @@ def test_get_payment_info_other_coin(monkeypatch, tmp_path) -> None:
         Product(name="p", description="", price_xmr=Decimal("1.0"), inventory=10, vendor_id=vendor.id)
     )
 
-    order_data = orders.create_order(product.id, 1, "addr")
+    order_data = await orders.create_order(product.id, 1, "addr")
     order_id = order_data["order_id"]
 
     payment_info = orders.get_payment_info(order_id, "BTC")
@@ -315,7 +369,8 @@ def test_get_payment_info_order_not_found(monkeypatch, tmp_path) -> None:
         orders.get_payment_info(99999, "XMR")
 
 
-def test_list_orders_by_vendor(monkeypatch, tmp_path) -> None:
+@pytest.mark.asyncio
+async def test_list_orders_by_vendor(monkeypatch, tmp_path) -> None:
     """Test listing orders by vendor."""
     key = base64.b64encode(os.urandom(32)).decode()
     settings = Settings(
@@ -347,18 +402,54 @@ def test_list_orders_by_vendor(monkeypatch, tmp_path) -> None:
     )
 
     # Create orders for both vendors
-    orders.create_order(product1.id, 1, "addr1")
-    orders.create_order(product1.id, 1, "addr2")
-    orders.create_order(product2.id, 1, "addr3")
+    await orders.create_order(product1.id, 1, "addr1")
+    await orders.create_order(product1.id, 1, "addr2")
+    await orders.create_order(product2.id, 1, "addr3")
 
     vendor1_orders = orders.list_orders_by_vendor(vendor1.id)
     vendor2_orders = orders.list_orders_by_vendor(vendor2.id)
 
     assert len(vendor1_orders) == 2
     assert len(vendor2_orders) == 1
+    assert all(order.vendor_id == vendor1.id for order in vendor1_orders)
+    assert not hasattr(vendor1_orders[0], "address_encrypted")
 
 
-def test_mark_shipped(monkeypatch, tmp_path) -> None:
+def test_list_orders_pagination(monkeypatch, tmp_path) -> None:
+    """Order lists are paged newest first and can filter by state."""
+    from bot.models import Order
+
+    db = Database(url=f"sqlite:///{tmp_path/'test.db'}")
+    vendors = VendorService(db)
+    vendor = vendors.add_vendor(Vendor(telegram_id=1, name="vend"))
+    catalog = CatalogService(db)
+    orders = OrderService(db, PaymentService(), catalog, vendors)
+    product = catalog.add_product(
+        Product(name="p", description="", price_xmr=Decimal("1.0"), inventory=10, vendor_id=vendor.id)
+    )
+    now = datetime.utcnow()
+    with db.session() as session:
+        for i in range(5):
+            session.add(Order(
+                product_id=product.id, vendor_id=vendor.id, quantity=1, payment_id=f"pid{i}",
+                address_encrypted="enc", commission_xmr=Decimal("0"),
+                state="PAID" if i % 2 else "NEW", created_at=now - timedelta(minutes=i),
+            ))
+        session.commit()
+
+    first_page = orders.list_orders(limit=2)
+    second_page = orders.list_orders(limit=2, offset=2)
+    assert [row.created_at for row in first_page] == [now, now - timedelta(minutes=1)]
+    assert [row.created_at for row in second_page] == [now - timedelta(minutes=2), now - timedelta(minutes=3)]
+
+    paid = orders.list_orders_by_vendor(vendor.id, state="PAID")
+    assert len(paid) == 2
+    assert all(row.state == "PAID" for row in paid)
+    assert len(orders.list_orders_by_vendor(vendor.id, limit=3)) == 3
+
+
+@pytest.mark.asyncio
+async def test_mark_shipped(monkeypatch, tmp_path) -> None:
     """Test marking an order as shipped."""
     key = base64.b64encode(os.urandom(32)).decode()
     settings = Settings(
@@ -384,7 +475,7 @@ def test_mark_shipped(monkeypatch, tmp_path) -> None:
         Product(name="p", description="", price_xmr=Decimal("1.0"), inventory=10, vendor_id=vendor.id)
     )
 
-    order_data = orders.create_order(product.id, 1, "addr")
+    order_data = await orders.create_order(product.id, 1, "addr")
     order_id = order_data["order_id"]
 
     # Mark as paid first
@@ -392,14 +483,17 @@ def test_mark_shipped(monkeypatch, tmp_path) -> None:
     orders.mark_paid(order_id)
 
     # Now mark as shipped
-    shipped_order = orders.mark_shipped(order_id, shipping_note="Tracking: XYZ123")
+    shipped_at = datetime(2024, 5, 1, 12, 30)
+    shipped_order = orders.mark_shipped(order_id, shipping_note="Tracking: XYZ123", now=shipped_at)
 
     assert shipped_order.state == "SHIPPED"
-    assert shipped_order.shipped_at is not None
+    assert shipped_order.shipped_at == shipped_at
+    assert orders.get_order(order_id).shipped_at == shipped_at
     assert shipped_order.shipping_note == "Tracking: XYZ123"
 
 
-def test_mark_shipped_without_note(monkeypatch, tmp_path) -> None:
+@pytest.mark.asyncio
+async def test_mark_shipped_without_note(monkeypatch, tmp_path) -> None:
     """Test marking an order as shipped without a note."""
     key = base64.b64encode(os.urandom(32)).decode()
     settings = Settings(
@@ -425,7 +519,7 @@ def test_mark_shipped_without_note(monkeypatch, tmp_path) -> None:
         Product(name="p", description="", price_xmr=Decimal("1.0"), inventory=10, vendor_id=vendor.id)
     )
 
-    order_data = orders.create_order(product.id, 1, "addr")
+    order_data = await orders.create_order(product.id, 1, "addr")
     order_id = order_data["order_id"]
 
     # Mark as paid first
@@ -465,7 +559,8 @@ def test_mark_shipped_order_not_found(monkeypatch, tmp_path) -> None:
         orders.mark_shipped(99999)
 
 
-def test_mark_shipped_wrong_state(monkeypatch, tmp_path) -> None:
+@pytest.mark.asyncio
+async def test_mark_shipped_wrong_state(monkeypatch, tmp_path) -> None:
     """Test mark_shipped on an order that's not PAID."""
     key = base64.b64encode(os.urandom(32)).decode()
     settings = Settings(
@@ -491,7 +586,7 @@ def test_mark_shipped_wrong_state(monkeypatch, tmp_path) -> None:
         Product(name="p", description="", price_xmr=Decimal("1.0"), inventory=10, vendor_id=vendor.id)
     )
 
-    order_data = orders.create_order(product.id, 1, "addr")
+    order_data = await orders.create_order(product.id, 1, "addr")
     order_id = order_data["order_id"]
 
     # Try to ship without paying first (order is NEW)
@@ -499,7 +594,8 @@ def test_mark_shipped_wrong_state(monkeypatch, tmp_path) -> None:
         orders.mark_shipped(order_id)
 
 
-def test_mark_completed(monkeypatch, tmp_path) -> None:
+@pytest.mark.asyncio
+async def test_mark_completed(monkeypatch, tmp_path) -> None:
     """Test marking an order as completed."""
     key = base64.b64encode(os.urandom(32)).decode()
     settings = Settings(
@@ -525,7 +621,7 @@ def test_mark_completed(monkeypatch, tmp_path) -> None:
         Product(name="p", description="", price_xmr=Decimal("1.0"), inventory=10, vendor_id=vendor.id)
     )
 
-    order_data = orders.create_order(product.id, 1, "addr")
+    order_data = await orders.create_order(product.id, 1, "addr")
     order_id = order_data["order_id"]
 
     # Mark as paid, then shipped
@@ -565,7 +661,8 @@ def test_mark_completed_order_not_found(monkeypatch, tmp_path) -> None:
         orders.mark_completed(99999)
 
 
-def test_mark_completed_wrong_state(monkeypatch, tmp_path) -> None:
+@pytest.mark.asyncio
+async def test_mark_completed_wrong_state(monkeypatch, tmp_path) -> None:
     """Test mark_completed on an order that's not SHIPPED."""
     key = base64.b64encode(os.urandom(32)).decode()
     settings = Settings(
@@ -591,7 +688,7 @@ def test_mark_completed_wrong_state(monkeypatch, tmp_path) -> None:
         Product(name="p", description="", price_xmr=Decimal("1.0"), inventory=10, vendor_id=vendor.id)
     )
 
-    order_data = orders.create_order(product.id, 1, "addr")
+    order_data = await orders.create_order(product.id, 1, "addr")
     order_id = order_data["order_id"]
 
     # Mark as paid but not shipped
@@ -603,7 +700,8 @@ def test_mark_completed_wrong_state(monkeypatch, tmp_path) -> None:
         orders.mark_completed(order_id)
 
 
-def test_get_payment_info_product_not_found(monkeypatch, tmp_path) -> None:
+@pytest.mark.asyncio
+async def test_get_payment_info_product_not_found(monkeypatch, tmp_path) -> None:
     """Test get_payment_info when product has been deleted."""
     from unittest.mock import patch
     key = base64.b64encode(os.urandom(32)).decode()
@@ -630,7 +728,7 @@ def test_get_payment_info_product_not_found(monkeypatch, tmp_path) -> None:
         Product(name="p", description="", price_xmr=Decimal("1.0"), inventory=10, vendor_id=vendor.id)
     )
 
-    order_data = orders.create_order(product.id, 1, "addr")
+    order_data = await orders.create_order(product.id, 1, "addr")
     order_id = order_data["order_id"]
 
     # Delete the product to trigger "Product not found" in get_payment_info
@@ -643,7 +741,8 @@ def test_get_payment_info_product_not_found(monkeypatch, tmp_path) -> None:
         orders.get_payment_info(order_id, "XMR")
 
 
-def test_create_order_with_inactive_postage(monkeypatch, tmp_path) -> None:
+@pytest.mark.asyncio
+async def test_create_order_with_inactive_postage(monkeypatch, tmp_path) -> None:
     """Test create_order with inactive postage type (should not add postage)."""
     from bot.models import PostageType
     key = base64.b64encode(os.urandom(32)).decode()
@@ -659,7 +758,7 @@ def test_create_order_with_inactive_postage(monkeypatch, tmp_path) -> None:
     )
     monkeypatch.setattr("bot.config.get_settings", lambda: settings)
     monkeypatch.setattr("bot.services.orders.get_settings", lambda: settings)
-    monkeypatch.setattr("bot.services.orders.fiat_to_xmr_sync", lambda amount, currency: Decimal("0.1"))
+    monkeypatch.setattr("bot.services.orders.fiat_to_crypto", AsyncMock(return_value=Decimal("0.1")))
 
     db = Database(url=f"sqlite:///{tmp_path/'test.db'}")
     vendors = VendorService(db)
@@ -687,14 +786,15 @@ def test_create_order_with_inactive_postage(monkeypatch, tmp_path) -> None:
         postage_id = postage.id
 
     # Order should be created but without postage since it's inactive
-    order_data = orders.create_order(product.id, 1, "addr", postage_type_id=postage_id)
+    order_data = await orders.create_order(product.id, 1, "addr", postage_type_id=postage_id)
 
     # Postage should be 0 since the type is inactive
     assert order_data["postage_xmr"] == Decimal("0")
     assert order_data["total_xmr"] == Decimal("1.0")
 
 
-def test_create_order_with_nonexistent_postage(monkeypatch, tmp_path) -> None:
+@pytest.mark.asyncio
+async def test_create_order_with_nonexistent_postage(monkeypatch, tmp_path) -> None:
     """Test create_order with non-existent postage type ID."""
     key = base64.b64encode(os.urandom(32)).decode()
     settings = Settings(
@@ -721,14 +821,15 @@ def test_create_order_with_nonexistent_postage(monkeypatch, tmp_path) -> None:
     )
 
     # Pass non-existent postage_type_id
-    order_data = orders.create_order(product.id, 1, "addr", postage_type_id=99999)
+    order_data = await orders.create_order(product.id, 1, "addr", postage_type_id=99999)
 
     # Should succeed but with zero postage
     assert order_data["postage_xmr"] == Decimal("0")
     assert order_data["total_xmr"] == Decimal("1.0")
 
 
-def test_create_order_product_deleted_race_condition(monkeypatch, tmp_path) -> None:
+@pytest.mark.asyncio
+async def test_create_order_product_deleted_race_condition(monkeypatch, tmp_path) -> None:
     """Test create_order when product is deleted between checks (race condition)."""
     from unittest.mock import patch, MagicMock
     key = base64.b64encode(os.urandom(32)).decode()
@@ -755,34 +856,28 @@ def test_create_order_product_deleted_race_condition(monkeypatch, tmp_path) -> N
         Product(name="p", description="", price_xmr=Decimal("1.0"), inventory=10, vendor_id=vendor.id)
     )
 
-    # Delete the product after catalog lookup but before session lookup
-    # We'll patch the session.get to return None only in the order-saving block
+    # Delete the product before create_order's session loads it
     original_session = db.session
     session_count = [0]
 
     def mock_session():
         session_count[0] += 1
         session = original_session()
-        # After monkeypatch, in create_order:
-        # 1: catalog.get_product
-        # 2: vendors.get_vendor
-        # 3: order saving block (lines 90-105) <- this is where we want to return None
-        if session_count[0] == 3:
-            original_get = session.get
-            def mock_get(model, id):
-                if model == Product:
-                    return None  # Simulate product deleted
-                return original_get(model, id)
-            session.get = mock_get
+        # create_order loads the product in its first session
+        if session_count[0] == 1:
+            deleted = MagicMock()
+            deleted.first.return_value = None  # Simulate product deleted
+            session.exec = lambda stmt: deleted
         return session
 
     monkeypatch.setattr(db, "session", mock_session)
 
     with pytest.raises(ValueError, match="Product not found"):
-        orders_service.create_order(product.id, 1, "addr")
+        await orders_service.create_order(product.id, 1, "addr")
 
 
-def test_create_order_inventory_race_condition(monkeypatch, tmp_path) -> None:
+@pytest.mark.asyncio
+async def test_create_order_inventory_race_condition(monkeypatch, tmp_path) -> None:
     """Test create_order when inventory goes negative due to race condition."""
     from unittest.mock import MagicMock
     key = base64.b64encode(os.urandom(32)).decode()
@@ -809,29 +904,325 @@ def test_create_order_inventory_race_condition(monkeypatch, tmp_path) -> None:
         Product(name="p", description="", price_xmr=Decimal("1.0"), inventory=10, vendor_id=vendor.id)
     )
 
-    # Mock the session to return product with inventory=0 in third session (order saving block)
+    # Mock the session to return product with inventory=0 when create_order loads it
     original_session = db.session
     session_count = [0]
 
     def mock_session():
         session_count[0] += 1
         session = original_session()
-        # After monkeypatch, in create_order:
-        # 1: catalog.get_product
-        # 2: vendors.get_vendor
-        # 3: order saving block (lines 90-105) <- this is where we want to set inventory=0
-        if session_count[0] == 3:
-            original_get = session.get
-            def mock_get(model, id):
-                result = original_get(model, id)
-                if model == Product and result is not None:
-                    # Simulate another order reducing inventory to 0
-                    result.inventory = 0
+        # create_order loads the product in its first session
+        if session_count[0] == 1:
+            original_exec = session.exec
+            def mock_exec(stmt):
+                row = original_exec(stmt).first()
+                # Simulate another order reducing inventory to 0
+                row[0].inventory = 0
+                result = MagicMock()
+                result.first.return_value = row
                 return result
-            session.get = mock_get
+            session.exec = mock_exec
         return session
 
     monkeypatch.setattr(db, "session", mock_session)
 
     with pytest.raises(ValueError, match="Insufficient inventory"):
-        orders_service.create_order(product.id, 1, "addr")
+        await orders_service.create_order(product.id, 1, "addr")
+
+
+@pytest.mark.asyncio
+async def test_create_order_sold_out_during_conversion(monkeypatch, tmp_path) -> None:
+    """Test create_order rejects an order when stock sells out while rates are fetched."""
+    key = base64.b64encode(os.urandom(32)).decode()
+    settings = Settings(
+        telegram_token="123:ABC",
+        admin_ids="",
+        super_admin_ids="",
+        monero_rpc_url="url",
+        encryption_key=key,
+        data_retention_days=30,
+        default_commission_rate=0.05,
+        totp_secret=None,
+    )
+    monkeypatch.setattr("bot.config.get_settings", lambda: settings)
+    monkeypatch.setattr("bot.services.orders.get_settings", lambda: settings)
+
+    db = Database(url=f"sqlite:///{tmp_path/'test.db'}")
+    vendors = VendorService(db)
+    vendor = vendors.add_vendor(Vendor(telegram_id=1, name="vend", wallet_address="4ABC..."))
+    catalog = CatalogService(db)
+    orders_service = OrderService(db, PaymentService(), catalog, vendors)
+    product = catalog.add_product(
+        Product(name="p", description="", price_xmr=Decimal("1.0"), inventory=1, vendor_id=vendor.id)
+    )
+
+    async def sell_out(amount, fiat, crypto):
+        # Another order takes the last item while this one awaits rates
+        with db.session() as session:
+            session.get(Product, product.id).inventory = 0
+            session.commit()
+        return Decimal("1")
+
+    monkeypatch.setattr("bot.services.orders.fiat_to_crypto", sell_out)
+
+    with pytest.raises(ValueError, match="Insufficient inventory"):
+        await orders_service.create_order(product.id, 1, "addr")
+
+    assert orders_service.list_orders() == []
+    assert catalog.get_product(product.id).inventory == 0
+
+
+def test_purge_old_orders_bulk_delete(monkeypatch, tmp_path) -> None:
+    """Test purge removes only orders older than the retention window, with their payouts."""
+    from sqlmodel import select
+    from bot.models import Order, Payout
+
+    key = base64.b64encode(os.urandom(32)).decode()
+    settings = Settings(
+        telegram_token="123:ABC",
+        admin_ids="",
+        super_admin_ids="",
+        monero_rpc_url="url",
+        encryption_key=key,
+        data_retention_days=30,
+        default_commission_rate=0.05,
+        totp_secret=None,
+    )
+    monkeypatch.setattr("bot.config.get_settings", lambda: settings)
+    monkeypatch.setattr("bot.services.orders.get_settings", lambda: settings)
+
+    db = Database(url=f"sqlite:///{tmp_path/'test.db'}")
+    vendors = VendorService(db)
+    catalog = CatalogService(db)
+    orders = OrderService(db, PaymentService(), catalog, vendors)
+
+    with db.session() as session:
+        for age_days, payment_id in ((40, "old1"), (31, "old2"), (1, "recent")):
+            session.add(Order(
+                product_id=1, vendor_id=1, quantity=1, payment_id=payment_id,
+                address_encrypted="enc", commission_xmr=Decimal("0"),
+                created_at=datetime.utcnow() - timedelta(days=age_days),
+            ))
+        session.commit()
+        order_ids = {o.payment_id: o.id for o in session.exec(select(Order))}
+        for payment_id in ("old1", "recent"):
+            session.add(Payout(
+                order_id=order_ids[payment_id], vendor_id=1, amount_xmr=Decimal("1"), status="SENT"
+            ))
+        session.commit()
+
+    orders.purge_old_orders()
+
+    remaining = orders.list_orders()
+    assert len(remaining) == 1
+    assert remaining[0].created_at > datetime.utcnow() - timedelta(days=30)
+    with db.session() as session:
+        payouts = list(session.exec(select(Payout)))
+    assert [p.order_id for p in payouts] == [order_ids["recent"]]
+
+    # A window ending 60 days from now also covers the recent order
+    orders.purge_old_orders(now=datetime.utcnow() + timedelta(days=60))
+    assert orders.list_orders() == []
+
+
+def test_purge_old_orders_keeps_unsettled_payouts(monkeypatch, tmp_path) -> None:
+    """Test purge keeps expired orders whose payouts are still PENDING or FAILED."""
+    from sqlmodel import select
+    from bot.models import Order, Payout
+
+    key = base64.b64encode(os.urandom(32)).decode()
+    settings = Settings(
+        telegram_token="123:ABC",
+        admin_ids="",
+        super_admin_ids="",
+        monero_rpc_url="url",
+        encryption_key=key,
+        data_retention_days=30,
+        default_commission_rate=0.05,
+        totp_secret=None,
+    )
+    monkeypatch.setattr("bot.config.get_settings", lambda: settings)
+    monkeypatch.setattr("bot.services.orders.get_settings", lambda: settings)
+
+    db = Database(url=f"sqlite:///{tmp_path/'test.db'}")
+    orders = OrderService(db, PaymentService(), CatalogService(db), VendorService(db))
+
+    statuses = {"pending": "PENDING", "failed": "FAILED", "confirmed": "CONFIRMED"}
+    with db.session() as session:
+        for payment_id in statuses:
+            session.add(Order(
+                product_id=1, vendor_id=1, quantity=1, payment_id=payment_id,
+                address_encrypted="enc", commission_xmr=Decimal("0"),
+                created_at=datetime.utcnow() - timedelta(days=40),
+            ))
+        session.commit()
+        order_ids = {o.payment_id: o.id for o in session.exec(select(Order))}
+        for payment_id, status in statuses.items():
+            session.add(Payout(
+                order_id=order_ids[payment_id], vendor_id=1, amount_xmr=Decimal("1"), status=status
+            ))
+        session.commit()
+
+    orders.purge_old_orders()
+
+    assert {o.id for o in orders.list_orders()} == {order_ids["pending"], order_ids["failed"]}
+    with db.session() as session:
+        payouts = list(session.exec(select(Payout)))
+    assert sorted(p.status for p in payouts) == ["FAILED", "PENDING"]
+
+
+def test_order_lookup_indexes(tmp_path) -> None:
+    """Order list and purge queries are backed by composite indexes."""
+    from sqlalchemy import inspect
+
+    db = Database(url=f"sqlite:///{tmp_path/'test.db'}")
+    indexes = {ix["name"]: ix["column_names"] for ix in inspect(db.engine).get_indexes("order")}
+
+    assert indexes["ix_orders_state_created"] == ["state", "created_at"]
+    assert indexes["ix_orders_vendor_created"] == ["vendor_id", "created_at"]
+    assert indexes["ix_orders_created"] == ["created_at"]
+
+
+def test_get_payment_info_single_query(monkeypatch, tmp_path) -> None:
+    """Order, product and vendor columns are loaded together in one SELECT."""
+    from sqlalchemy import event
+    from bot.models import Order
+
+    key = base64.b64encode(os.urandom(32)).decode()
+    settings = Settings(
+        telegram_token="123:ABC",
+        admin_ids="",
+        super_admin_ids="",
+        monero_rpc_url="url",
+        encryption_key=key,
+        data_retention_days=30,
+        default_commission_rate=0.05,
+        totp_secret=None,
+    )
+    monkeypatch.setattr("bot.config.get_settings", lambda: settings)
+    monkeypatch.setattr("bot.services.orders.get_settings", lambda: settings)
+
+    db = Database(url=f"sqlite:///{tmp_path/'test.db'}")
+    vendors = VendorService(db)
+    vendor = vendors.add_vendor(Vendor(telegram_id=1, name="vend", wallet_address="4ABC..."))
+    catalog = CatalogService(db)
+    orders = OrderService(db, PaymentService(), catalog, vendors)
+    product = catalog.add_product(
+        Product(name="p", description="", price_xmr=Decimal("2.5"), inventory=10, vendor_id=vendor.id)
+    )
+    with db.session() as session:
+        order = Order(
+            product_id=product.id, vendor_id=vendor.id, quantity=2, payment_id="pid",
+            address_encrypted="enc", commission_xmr=Decimal("0"),
+        )
+        session.add(order)
+        session.commit()
+        order_id = order.id
+
+    statements = []
+    event.listen(db.engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    payment_info = orders.get_payment_info(order_id, "BTC")
+
+    assert payment_info["amount"] == Decimal("5.0")
+    assert len([sql for sql in statements if sql.lstrip().upper().startswith("SELECT")]) == 1
+
+
+
+@pytest.mark.asyncio
+async def test_create_order_loads_entities_in_one_query(monkeypatch, tmp_path) -> None:
+    """Product, vendor and postage type are loaded together in one SELECT."""
+    from sqlalchemy import event
+    from bot.models import PostageType
+
+    key = base64.b64encode(os.urandom(32)).decode()
+    settings = Settings(
+        telegram_token="123:ABC",
+        admin_ids="",
+        super_admin_ids="",
+        monero_rpc_url="url",
+        encryption_key=key,
+        data_retention_days=30,
+        default_commission_rate=0.05,
+        totp_secret=None,
+    )
+    monkeypatch.setattr("bot.config.get_settings", lambda: settings)
+    monkeypatch.setattr("bot.services.orders.get_settings", lambda: settings)
+    monkeypatch.setattr(
+        "bot.services.orders.fiat_to_crypto", AsyncMock(return_value=Decimal("1"))
+    )
+
+    db = Database(url=f"sqlite:///{tmp_path/'test.db'}")
+    vendors = VendorService(db)
+    vendor = vendors.add_vendor(Vendor(telegram_id=1, name="vend", wallet_address="4ABC..."))
+    catalog = CatalogService(db)
+    orders = OrderService(db, PaymentService(), catalog, vendors)
+    product = catalog.add_product(
+        Product(name="p", description="", price_xmr=Decimal("1.0"), inventory=10, vendor_id=vendor.id)
+    )
+    with db.session() as session:
+        postage = PostageType(vendor_id=vendor.id, name="Std", price_fiat=Decimal("5"), currency="USD")
+        session.add(postage)
+        session.commit()
+        postage_id = postage.id
+
+    statements = []
+    event.listen(db.engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    order_data = await orders.create_order(product.id, 1, "addr", postage_type_id=postage_id)
+
+    assert order_data["postage_xmr"] == Decimal("1")
+    selects = [sql for sql in statements if sql.lstrip().upper().startswith("SELECT")]
+    # Only the load before the conversions; the inserted order is not re-read
+    assert len(selects) == 1
+
+
+
+def test_mark_paid_no_reload(monkeypatch, tmp_path) -> None:
+    """mark_paid loads the order once and does not re-read it after commit."""
+    from sqlalchemy import event
+    from bot.models import Order
+
+    key = base64.b64encode(os.urandom(32)).decode()
+    settings = Settings(
+        telegram_token="123:ABC",
+        admin_ids="",
+        super_admin_ids="",
+        monero_rpc_url="url",
+        encryption_key=key,
+        data_retention_days=30,
+        default_commission_rate=0.05,
+        totp_secret=None,
+    )
+    monkeypatch.setattr("bot.config.get_settings", lambda: settings)
+    monkeypatch.setattr("bot.services.orders.get_settings", lambda: settings)
+
+    db = Database(url=f"sqlite:///{tmp_path/'test.db'}")
+    vendors = VendorService(db)
+    vendor = vendors.add_vendor(Vendor(telegram_id=1, name="vend"))
+    catalog = CatalogService(db)
+    payments = PaymentService()
+    orders = OrderService(db, payments, catalog, vendors)
+    product = catalog.add_product(
+        Product(name="p", description="", price_xmr=Decimal("1.0"), inventory=10, vendor_id=vendor.id)
+    )
+    with db.session() as session:
+        order = Order(
+            product_id=product.id, vendor_id=vendor.id, quantity=1, payment_id="pid",
+            address_encrypted="enc", commission_xmr=Decimal("0"),
+        )
+        session.add(order)
+        session.commit()
+        order_id = order.id
+    monkeypatch.setattr(payments, "check_paid", lambda payment_id: True)
+
+    statements = []
+    event.listen(db.engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    updated = orders.mark_paid(order_id)
+
+    assert updated.state == "PAID"
+    assert orders.get_order(order_id).state == "PAID"
+    selects = [sql for sql in statements if sql.lstrip().upper().startswith("SELECT")]
+    # The joined load in mark_paid plus the get_order check above
+    assert len(selects) == 2
@@ -1,7 +1,7 @@
 """Tests for payment service factory."""
 
 import pytest
-from unittest.mock import patch
+from unittest.mock import AsyncMock, patch
 
 from bot.services.payment_factory import (
     PaymentServiceFactory,
@@ -69,6 +69,31 @@ class TestPaymentServiceFactory:
         service2 = PaymentServiceFactory.create("XMR")
         assert service1 is not service2  # Different instances
 
+    def test_concurrent_create_builds_one_instance(self):
+        """Test threads racing on create() share a single instance."""
+        import threading
+        import time
+        from concurrent.futures import ThreadPoolExecutor
+
+        barrier = threading.Barrier(8)
+        constructed = []
+
+        class SlowService:
+            def __init__(self):
+                time.sleep(0.01)
+                constructed.append(self)
+
+        def create():
+            barrier.wait()
+            return PaymentServiceFactory.create("XMR")
+
+        with patch('bot.services.payment_factory._SERVICE_CLASSES', {"XMR": SlowService}):
+            with ThreadPoolExecutor(max_workers=8) as pool:
+                services = list(pool.map(lambda _: create(), range(8)))
+
+        assert len(constructed) == 1
+        assert all(service is constructed[0] for service in services)
+
 
 class TestConfirmationThresholds:
     """Test confirmation threshold retrieval."""
@@ -123,6 +148,40 @@ class TestSupportedCurrencies:
         currencies = PaymentServiceFactory.get_supported_currencies()
         assert currencies == ["XMR", "BTC", "ETH"]
 
+    @pytest.mark.asyncio
+    async def test_close_all_closes_async_resources(self):
+        """Test close_all awaits close() on services that hold connections."""
+        PaymentServiceFactory.create("XMR")
+        with patch('bot.services.ethereum_payment.get_settings') as mock_settings:
+            mock_settings.return_value.etherscan_api_key = "test_key"
+            mock_settings.return_value.infura_project_id = None
+            eth_service = PaymentServiceFactory.create("ETH")
+
+        with patch.object(eth_service.api, 'close', new_callable=AsyncMock) as mock_close:
+            await PaymentServiceFactory.close_all()
+            mock_close.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_start_all_starts_block_watcher(self):
+        """Test start_all starts the ETH block watcher once at startup."""
+        with patch('bot.services.ethereum_payment.get_settings') as mock_settings:
+            mock_settings.return_value.etherscan_api_key = "test_key"
+            mock_settings.return_value.infura_project_id = "proj"
+            eth_service = PaymentServiceFactory.create("ETH")
+
+        with patch.object(eth_service.api, 'start_block_watcher') as mock_start:
+            await PaymentServiceFactory.start_all()
+            mock_start.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_start_all_skips_unconfigured_services(self):
+        """Test start_all does not fail when a service cannot be created."""
+        with patch('bot.services.ethereum_payment.get_settings') as mock_settings:
+            mock_settings.return_value.etherscan_api_key = None
+            await PaymentServiceFactory.start_all()
+
+        assert "ETH" not in PaymentServiceFactory._instances
+
 
 class TestConvenienceFunction:
     """Test convenience function."""
@@ -0,0 +1,36 @@
+"""Tests for the payment service protocol."""
+
+import pytest
+
+from bot.services.payment_protocol import PaymentServiceProtocol, validate_payment_service
+from bot.services.payments import MoneroPaymentService
+from bot.services.bitcoin_payment import BitcoinPaymentService
+from bot.services.ethereum_payment import EthereumPaymentService
+
+
+class TestValidatePaymentService:
+    """Test validate_payment_service."""
+
+    @pytest.mark.parametrize(
+        "service_cls", [MoneroPaymentService, BitcoinPaymentService, EthereumPaymentService]
+    )
+    def test_payment_services_are_valid(self, service_cls):
+        """Test every payment service passes validation."""
+        service = service_cls.__new__(service_cls)
+
+        assert validate_payment_service(service) is True
+        assert isinstance(service, PaymentServiceProtocol)
+
+    def test_missing_methods_are_named(self):
+        """Test the error lists the missing and non-callable methods."""
+        class Partial:
+            get_balance = None
+
+            def create_address(self):
+                pass
+
+            def check_paid(self):
+                pass
+
+        with pytest.raises(TypeError, match="Missing methods: get_confirmations, get_balance"):
+            validate_payment_service(Partial())
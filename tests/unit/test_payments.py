@@ -39,6 +39,7 @@ class TestMoneroPaymentService:
 
             assert address == "4A1234567890abcdef"
             assert len(payment_id) == 16  # 16 char payment ID for Monero
+            int(payment_id, 16)  # hex encoded
             mock_wallet.make_integrated_address.assert_called_once()
 
     def test_create_address_wallet_error(self, payment_service, mock_settings):
@@ -170,6 +171,39 @@ class TestMoneroPaymentService:
             with pytest.raises(RetryableError, match="Failed to check payment status"):
                 payment_service.check_paid("payment123")
 
+    def test_check_paid_bulk(self, payment_service, mock_settings):
+        """Test many payment IDs are checked with one wallet call."""
+        with patch.object(payment_service, '_get_wallet') as mock_get_wallet:
+            mock_wallet = MagicMock()
+            paid = MagicMock(payment_id="aaaa000000000001", amount=Decimal("1.0"))
+            short = MagicMock(payment_id="aaaa000000000002", amount=Decimal("0.2"))
+            mock_wallet.incoming.return_value = [paid, short]
+            mock_get_wallet.return_value = mock_wallet
+
+            result = payment_service.check_paid_bulk(
+                ["aaaa000000000001", "aaaa000000000002", "aaaa000000000003"],
+                expected_amounts={"aaaa000000000002": Decimal("1.0")}
+            )
+
+            assert result == {"aaaa000000000001"}
+            mock_wallet.incoming.assert_called_once_with(
+                payment_id=["aaaa000000000001", "aaaa000000000002", "aaaa000000000003"]
+            )
+
+    def test_check_paid_bulk_empty(self, payment_service, mock_settings):
+        """Test an empty batch makes no wallet call."""
+        with patch.object(payment_service, '_get_wallet') as mock_get_wallet:
+            assert payment_service.check_paid_bulk([]) == set()
+            mock_get_wallet.assert_not_called()
+
+    def test_check_paid_bulk_error_in_production(self, payment_service, mock_settings):
+        """Test bulk payment check with error in production raises."""
+        with patch.object(payment_service, '_get_wallet') as mock_get_wallet:
+            mock_get_wallet.side_effect = Exception("Connection failed")
+
+            with pytest.raises(RetryableError, match="Failed to check payment status"):
+                payment_service.check_paid_bulk(["payment123"])
+
     def test_get_balance_success(self, payment_service, mock_settings):
         """Test successful balance retrieval."""
         with patch.object(payment_service, '_get_wallet') as mock_get_wallet:
@@ -200,6 +234,85 @@ class TestMoneroPaymentService:
 
             assert balance == Decimal("0")
 
+    def test_get_balance_cached_within_ttl(self, payment_service, mock_settings):
+        """Test repeated balance lookups within the TTL share one RPC."""
+        with patch.object(payment_service, '_get_wallet') as mock_get_wallet, \
+                patch('bot.services.payments.time.monotonic') as mock_monotonic:
+            mock_wallet = MagicMock()
+            mock_wallet.balance.side_effect = [Decimal("10.5"), Decimal("7")]
+            mock_get_wallet.return_value = mock_wallet
+
+            mock_monotonic.return_value = 100.0
+            assert payment_service.get_balance() == Decimal("10.5")
+            mock_monotonic.return_value = 104.0
+            assert payment_service.get_balance() == Decimal("10.5")
+            assert mock_wallet.balance.call_count == 1
+
+            mock_monotonic.return_value = 106.0
+            assert payment_service.get_balance() == Decimal("7")
+            assert mock_wallet.balance.call_count == 2
+
+    def test_check_paid_and_confirmations_share_rpc(self, payment_service, mock_settings):
+        """Test a payment poll issues one incoming transfers RPC."""
+        with patch.object(payment_service, '_get_wallet') as mock_get_wallet, \
+                patch('bot.services.payments.time.monotonic') as mock_monotonic:
+            mock_wallet = MagicMock()
+            mock_transfer = MagicMock()
+            mock_transfer.amount = Decimal("1.5")
+            mock_transfer.transaction.confirmations = 4
+            mock_wallet.incoming.return_value = [mock_transfer]
+            mock_get_wallet.return_value = mock_wallet
+
+            mock_monotonic.return_value = 100.0
+            assert payment_service.check_paid("payment123") is True
+            assert payment_service.get_confirmations("payment123") == 4
+            mock_wallet.incoming.assert_called_once_with(payment_id="payment123")
+
+            # Expired entries are fetched again
+            mock_monotonic.return_value = 104.0
+            payment_service.get_confirmations("payment123")
+            assert mock_wallet.incoming.call_count == 2
+
+    def test_check_paid_remembers_verified_payments(self, payment_service, mock_settings):
+        """Test a verified payment is answered without another RPC."""
+        with patch.object(payment_service, '_get_wallet') as mock_get_wallet, \
+                patch('bot.services.payments.time.monotonic') as mock_monotonic:
+            mock_wallet = MagicMock()
+            mock_transfer = MagicMock()
+            mock_transfer.amount = Decimal("1.5")
+            mock_wallet.incoming.return_value = [mock_transfer]
+            mock_get_wallet.return_value = mock_wallet
+
+            mock_monotonic.return_value = 100.0
+            assert payment_service.check_paid("payment123", expected_amount=Decimal("1.0")) is True
+
+            # Long after the transfer cache expired
+            mock_monotonic.return_value = 1000.0
+            assert payment_service.check_paid("payment123", expected_amount=Decimal("1.5")) is True
+            assert payment_service.check_paid("payment123") is True
+            mock_wallet.incoming.assert_called_once()
+
+            # A larger expected amount is checked against the wallet again
+            assert payment_service.check_paid("payment123", expected_amount=Decimal("2.0")) is False
+            assert mock_wallet.incoming.call_count == 2
+
+    def test_check_paid_cache_evicts_least_recently_used(self, payment_service, mock_settings):
+        """Test the verified payment cache is bounded."""
+        payment_service.PAID_CACHE_SIZE = 2
+        with patch.object(payment_service, '_get_wallet') as mock_get_wallet:
+            mock_wallet = MagicMock()
+            mock_transfer = MagicMock()
+            mock_transfer.amount = Decimal("1")
+            mock_wallet.incoming.return_value = [mock_transfer]
+            mock_get_wallet.return_value = mock_wallet
+
+            payment_service.check_paid("a")
+            payment_service.check_paid("b")
+            payment_service.check_paid("a")  # Refreshes "a"
+            payment_service.check_paid("c")
+
+        assert list(payment_service._paid_cache) == ["a", "c"]
+
     def test_get_wallet_caching(self, mock_settings):
         """Test wallet connection caching."""
         with patch('bot.services.payments.get_settings') as settings_mock:
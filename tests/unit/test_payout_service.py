@@ -33,7 +33,7 @@ class TestPayoutService:
         mock_session = MagicMock()
         mock_session.__enter__ = MagicMock(return_value=mock_session)
         mock_session.__exit__ = MagicMock(return_value=None)
-        mock_session.exec = MagicMock(return_value=MagicMock(first=MagicMock(return_value=mock_setting)))
+        mock_session.exec = MagicMock(return_value=[("test_key", mock_setting.value)])
         mock_db.session = MagicMock(return_value=mock_session)
 
         result = payout_service.get_setting("test_key")
@@ -81,6 +81,69 @@ class TestPayoutService:
         assert mock_setting.value == "new_value"
         mock_session.commit.assert_called_once()
 
+    def test_get_setting_cached(self, payout_service, mock_db):
+        """Test reads of any key within the TTL use one query."""
+        mock_setting = MagicMock(spec=PlatformSettings)
+        mock_setting.value = "test_value"
+
+        mock_session = MagicMock()
+        mock_session.__enter__ = MagicMock(return_value=mock_session)
+        mock_session.__exit__ = MagicMock(return_value=None)
+        mock_session.exec = MagicMock(return_value=[("test_key", mock_setting.value)])
+        mock_db.session = MagicMock(return_value=mock_session)
+
+        assert payout_service.get_setting("test_key") == "test_value"
+        assert payout_service.get_setting("test_key") == "test_value"
+        assert payout_service.get_setting("missing", "dflt") == "dflt"
+
+        # Every key is served from the one load
+        assert mock_session.exec.call_count == 1
+
+    def test_get_setting_refetched_after_ttl(self, payout_service, mock_db):
+        """Test a cached setting is read again once the TTL has passed."""
+        mock_session = MagicMock()
+        mock_session.__enter__ = MagicMock(return_value=mock_session)
+        mock_session.__exit__ = MagicMock(return_value=None)
+        mock_session.exec = MagicMock(return_value=MagicMock(first=MagicMock(return_value=None)))
+        mock_db.session = MagicMock(return_value=mock_session)
+
+        with patch('bot.services.payout.time.monotonic', side_effect=[100.0, 200.0]):
+            assert payout_service.get_setting("key", "dflt") == "dflt"
+            assert payout_service.get_setting("key", "dflt") == "dflt"
+
+        assert mock_session.exec.call_count == 2
+
+    def test_settings_loaded_from_database(self, tmp_path):
+        """Test settings written by one service are read back by another."""
+        db = Database(url=f"sqlite:///{tmp_path/'settings.db'}")
+        with patch('bot.services.payout.get_settings'):
+            writer = PayoutService(db)
+            reader = PayoutService(db)
+
+        writer.set_platform_commission_rate(Decimal("0.07"))
+        writer.set_platform_wallet("4Awallet", "XMR")
+        writer.set_platform_wallet("bc1wallet", "BTC")
+
+        assert reader.get_platform_commission_rate() == Decimal("0.07")
+        assert reader.get_platform_wallet("XMR") == "4Awallet"
+        assert reader.get_platform_wallet("BTC") == "bc1wallet"
+        assert reader.get_platform_wallet("ETH") is None
+
+    def test_set_setting_updates_cache(self, payout_service, mock_db):
+        """Test a written setting is served without another query."""
+        mock_session = MagicMock()
+        mock_session.__enter__ = MagicMock(return_value=mock_session)
+        mock_session.__exit__ = MagicMock(return_value=None)
+        mock_session.exec = MagicMock(return_value=MagicMock(first=MagicMock(return_value=None)))
+        mock_db.session = MagicMock(return_value=mock_session)
+
+        assert payout_service.get_platform_commission_rate() == Decimal("0.05")
+        payout_service.set_platform_commission_rate(Decimal("0.08"))
+        mock_session.exec.reset_mock()
+
+        assert payout_service.get_platform_commission_rate() == Decimal("0.08")
+        mock_session.exec.assert_not_called()
+
     def test_get_platform_commission_rate_default(self, payout_service, mock_db):
         """Test getting default commission rate."""
         mock_session = MagicMock()
@@ -101,7 +164,7 @@ class TestPayoutService:
         mock_session = MagicMock()
         mock_session.__enter__ = MagicMock(return_value=mock_session)
         mock_session.__exit__ = MagicMock(return_value=None)
-        mock_session.exec = MagicMock(return_value=MagicMock(first=MagicMock(return_value=mock_setting)))
+        mock_session.exec = MagicMock(return_value=[("commission_rate", mock_setting.value)])
         mock_db.session = MagicMock(return_value=mock_session)
 
         result = payout_service.get_platform_commission_rate()
@@ -116,7 +179,7 @@ class TestPayoutService:
         mock_session = MagicMock()
         mock_session.__enter__ = MagicMock(return_value=mock_session)
         mock_session.__exit__ = MagicMock(return_value=None)
-        mock_session.exec = MagicMock(return_value=MagicMock(first=MagicMock(return_value=mock_setting)))
+        mock_session.exec = MagicMock(return_value=[("commission_rate", mock_setting.value)])
         mock_db.session = MagicMock(return_value=mock_session)
 
         result = payout_service.get_platform_commission_rate()
@@ -143,7 +206,7 @@ class TestPayoutService:
         mock_session = MagicMock()
         mock_session.__enter__ = MagicMock(return_value=mock_session)
         mock_session.__exit__ = MagicMock(return_value=None)
-        mock_session.exec = MagicMock(return_value=MagicMock(first=MagicMock(return_value=mock_setting)))
+        mock_session.exec = MagicMock(return_value=[("platform_xmr_wallet", mock_setting.value)])
         mock_db.session = MagicMock(return_value=mock_session)
 
         result = payout_service.get_platform_wallet()
@@ -276,6 +339,7 @@ class TestPayoutService:
         assert result.status == "SENT"
         assert result.tx_hash == "tx123hash"
         mock_session.commit.assert_called_once()
+        mock_session.refresh.assert_not_called()
 
     def test_mark_payout_sent_not_found(self, payout_service, mock_db):
         """Test marking nonexistent payout as sent."""
@@ -358,7 +422,7 @@ class TestPayoutService:
         mock_session.exec = MagicMock(return_value=[])
         mock_db.session = MagicMock(return_value=mock_session)
 
-        with patch('bot.services.payments.MoneroPaymentService'):
+        with patch('bot.services.payout.PaymentServiceFactory'):
             result = await payout_service.process_payouts()
 
         assert result['processed'] == 0
@@ -366,6 +430,28 @@ class TestPayoutService:
         assert result['failed'] == 0
         assert result['skipped'] == 0
 
+    @pytest.mark.asyncio
+    async def test_process_payouts_reuses_payment_service(self, payout_service, mock_db):
+        """Test repeated runs share one Monero payment service."""
+        from bot.services.payment_factory import PaymentServiceFactory
+
+        mock_session = MagicMock()
+        mock_session.__enter__ = MagicMock(return_value=mock_session)
+        mock_session.__exit__ = MagicMock(return_value=None)
+        mock_session.exec = MagicMock(return_value=[])
+        mock_db.session = MagicMock(return_value=mock_session)
+
+        mock_service_cls = MagicMock()
+        PaymentServiceFactory.clear_cache()
+        try:
+            with patch('bot.services.payment_factory._SERVICE_CLASSES', {"XMR": mock_service_cls}):
+                await payout_service.process_payouts()
+                await payout_service.process_payouts()
+        finally:
+            PaymentServiceFactory.clear_cache()
+
+        mock_service_cls.assert_called_once_with()
+
     @pytest.mark.asyncio
     async def test_process_payouts_no_vendor_wallet(self, payout_service, mock_db):
         """Test processing payout when vendor has no wallet."""
@@ -375,19 +461,26 @@ class TestPayoutService:
         mock_payout.status = "PENDING"
 
         mock_vendor = MagicMock(spec=Vendor)
+        mock_vendor.id = 1
         mock_vendor.wallet_address = None
 
+        call_count = 0
+
         def mock_session_factory():
+            nonlocal call_count
+            call_count += 1
             mock_session = MagicMock()
             mock_session.__enter__ = MagicMock(return_value=mock_session)
             mock_session.__exit__ = MagicMock(return_value=None)
-            mock_session.exec = MagicMock(return_value=[mock_payout])
-            mock_session.get = MagicMock(return_value=mock_vendor)
+            if call_count == 1:
+                mock_session.exec = MagicMock(return_value=[mock_payout])
+            else:
+                mock_session.exec = MagicMock(return_value=[mock_vendor])
             return mock_session
 
         mock_db.session = mock_session_factory
 
-        with patch('bot.services.payments.MoneroPaymentService'):
+        with patch('bot.services.payout.PaymentServiceFactory'):
             result = await payout_service.process_payouts()
 
         assert result['processed'] == 1
@@ -418,16 +511,16 @@ class TestPayoutService:
             if call_count == 1:
                 mock_session.exec = MagicMock(return_value=[mock_payout])
             else:
-                mock_session.get = MagicMock(return_value=mock_vendor)
+                mock_session.exec = MagicMock(return_value=[mock_vendor])
             return mock_session
 
         mock_db.session = mock_session_factory
 
-        with patch('bot.services.payments.MoneroPaymentService') as mock_payment_cls:
+        with patch('bot.services.payout.PaymentServiceFactory') as mock_factory:
             mock_payment = MagicMock()
             # Payment service's _get_wallet returns None
             mock_payment._get_wallet = MagicMock(return_value=None)
-            mock_payment_cls.return_value = mock_payment
+            mock_factory.create.return_value = mock_payment
 
             result = await payout_service.process_payouts()
 
@@ -460,13 +553,13 @@ class TestPayoutService:
                 # First call: get_pending_payouts
                 mock_session.exec = MagicMock(return_value=[mock_payout])
             else:
-                # Subsequent calls: get vendor
-                mock_session.get = MagicMock(return_value=mock_vendor)
+                # Second call: batch vendor lookup
+                mock_session.exec = MagicMock(return_value=[mock_vendor])
             return mock_session
 
         mock_db.session = mock_session_factory
 
-        with patch('bot.services.payments.MoneroPaymentService') as mock_payment_cls:
+        with patch('bot.services.payout.PaymentServiceFactory') as mock_factory:
             mock_wallet = MagicMock()
             mock_tx = MagicMock()
             mock_tx.hash = "tx123hash"
@@ -474,7 +567,7 @@ class TestPayoutService:
 
             mock_payment = MagicMock()
             mock_payment._get_wallet = MagicMock(return_value=mock_wallet)
-            mock_payment_cls.return_value = mock_payment
+            mock_factory.create.return_value = mock_payment
 
             # Mock mark_payout_sent to update payout
             def mark_sent(payout_id, tx_hash):
@@ -488,6 +581,123 @@ class TestPayoutService:
         assert result['processed'] == 1
         assert result['sent'] == 1
 
+    @pytest.mark.asyncio
+    async def test_process_payouts_loads_vendors_once(self, payout_service, mock_db):
+        """Test vendors for all pending payouts are loaded in one query."""
+        payouts = []
+        for payout_id, vendor_id in ((1, 1), (2, 2), (3, 1)):
+            payout = MagicMock(spec=Payout)
+            payout.id = payout_id
+            payout.vendor_id = vendor_id
+            payout.amount_xmr = Decimal("0.5")
+            payouts.append(payout)
+
+        vendors = []
+        for vendor_id in (1, 2):
+            vendor = MagicMock(spec=Vendor)
+            vendor.id = vendor_id
+            vendor.wallet_address = f"wallet{vendor_id}"
+            vendors.append(vendor)
+
+        sessions = []
+
+        def mock_session_factory():
+            mock_session = MagicMock()
+            mock_session.__enter__ = MagicMock(return_value=mock_session)
+            mock_session.__exit__ = MagicMock(return_value=None)
+            mock_session.exec = MagicMock(return_value=payouts if not sessions else vendors)
+            sessions.append(mock_session)
+            return mock_session
+
+        mock_db.session = mock_session_factory
+
+        with patch('bot.services.payout.PaymentServiceFactory') as mock_factory:
+            mock_wallet = MagicMock()
+            mock_wallet.transfer = MagicMock(return_value=MagicMock(hash="tx"))
+            mock_factory.create.return_value._get_wallet = MagicMock(return_value=mock_wallet)
+
+            with patch.object(payout_service, 'mark_payout_sent'):
+                result = await payout_service.process_payouts()
+
+        assert result['sent'] == 3
+        assert len(sessions) == 2
+        sessions[1].get.assert_not_called()
+        sent_to = [c.args[0] for c in mock_wallet.transfer.call_args_list]
+        assert sent_to == ["wallet1", "wallet2", "wallet1"]
+
+    @pytest.mark.asyncio
+    async def test_process_payouts_transfer_off_event_loop(self, payout_service, mock_db):
+        """Test the blocking wallet transfer runs in a worker thread."""
+        import threading
+
+        mock_payout = MagicMock(spec=Payout)
+        mock_payout.id = 1
+        mock_payout.vendor_id = 1
+        mock_payout.amount_xmr = Decimal("0.5")
+
+        mock_vendor = MagicMock(spec=Vendor)
+        mock_vendor.id = 1
+        mock_vendor.wallet_address = "wallet123"
+
+        call_count = 0
+
+        def mock_session_factory():
+            nonlocal call_count
+            call_count += 1
+            mock_session = MagicMock()
+            mock_session.__enter__ = MagicMock(return_value=mock_session)
+            mock_session.__exit__ = MagicMock(return_value=None)
+            mock_session.exec = MagicMock(return_value=[mock_payout] if call_count == 1 else [mock_vendor])
+            return mock_session
+
+        mock_db.session = mock_session_factory
+
+        transfer_threads = []
+
+        def transfer(address, amount):
+            transfer_threads.append(threading.current_thread())
+            return MagicMock(hash="tx")
+
+        with patch('bot.services.payout.PaymentServiceFactory') as mock_factory:
+            mock_wallet = MagicMock()
+            mock_wallet.transfer = MagicMock(side_effect=transfer)
+            mock_factory.create.return_value._get_wallet = MagicMock(return_value=mock_wallet)
+
+            with patch.object(payout_service, 'mark_payout_sent'):
+                result = await payout_service.process_payouts()
+
+        assert result['sent'] == 1
+        assert transfer_threads and transfer_threads[0] is not threading.main_thread()
+
+    @pytest.mark.asyncio
+    async def test_process_payouts_in_batches(self, tmp_path):
+        """Test a backlog larger than one batch is paged through by ID."""
+        db = Database(url=f"sqlite:///{tmp_path/'payouts.db'}")
+        with db.session() as session:
+            session.add(Vendor(telegram_id=1, name="Shop", wallet_address="wallet1"))
+            session.add(Vendor(telegram_id=2, name="No wallet"))
+            session.commit()
+            for vendor_id in (1, 2, 1, 1, 2):
+                session.add(Payout(order_id=1, vendor_id=vendor_id, amount_xmr=Decimal("0.1")))
+            session.commit()
+
+        with patch('bot.services.payout.get_settings'):
+            service = PayoutService(db)
+        service.PAYOUT_BATCH_SIZE = 2
+
+        with patch('bot.services.payout.PaymentServiceFactory') as mock_factory:
+            mock_wallet = MagicMock()
+            mock_wallet.transfer.return_value = MagicMock(hash="tx")
+            mock_factory.create.return_value._get_wallet = MagicMock(return_value=mock_wallet)
+
+            with patch.object(service, 'get_pending_payouts', wraps=service.get_pending_payouts) as get_pending:
+                result = await service.process_payouts()
+
+        assert result == {"processed": 5, "sent": 3, "failed": 0, "skipped": 2}
+        # Skipped payouts stay pending but are not picked up again in the run
+        assert [c.kwargs["after_id"] for c in get_pending.call_args_list] == [0, 2, 4]
+        assert [p.vendor_id for p in service.get_pending_payouts()] == [2, 2]
+
     @pytest.mark.asyncio
     async def test_process_payouts_transfer_error(self, payout_service, mock_db):
         """Test payout processing when transfer fails."""
@@ -513,18 +723,18 @@ class TestPayoutService:
             if call_count == 1:
                 mock_session.exec = MagicMock(return_value=[mock_payout])
             else:
-                mock_session.get = MagicMock(return_value=mock_vendor)
+                mock_session.exec = MagicMock(return_value=[mock_vendor])
             return mock_session
 
         mock_db.session = mock_session_factory
 
-        with patch('bot.services.payments.MoneroPaymentService') as mock_payment_cls:
+        with patch('bot.services.payout.PaymentServiceFactory') as mock_factory:
             mock_wallet = MagicMock()
             mock_wallet.transfer = MagicMock(side_effect=Exception("Insufficient funds"))
 
             mock_payment = MagicMock()
             mock_payment._get_wallet = MagicMock(return_value=mock_wallet)
-            mock_payment_cls.return_value = mock_payment
+            mock_factory.create.return_value = mock_payment
 
             def mark_failed(payout_id, error):
                 mock_payout.status = "FAILED"
@@ -540,42 +750,98 @@ class TestPayoutService:
 
     def test_get_platform_stats(self, payout_service, mock_db):
         """Test getting platform statistics."""
-        mock_order = MagicMock(spec=Order)
-        mock_order.state = "PAID"
-        mock_order.commission_xmr = Decimal("0.05")
-
-        mock_pending_payout = MagicMock(spec=Payout)
-        mock_pending_payout.status = "PENDING"
-        mock_pending_payout.amount_xmr = Decimal("0.5")
-
-        mock_sent_payout = MagicMock(spec=Payout)
-        mock_sent_payout.status = "SENT"
-        mock_sent_payout.amount_xmr = Decimal("0.3")
-
         mock_session = MagicMock()
         mock_session.__enter__ = MagicMock(return_value=mock_session)
         mock_session.__exit__ = MagicMock(return_value=None)
 
-        call_count = [0]
-
-        def mock_exec(stmt):
-            call_count[0] += 1
-            if call_count[0] == 1:
-                return [mock_order]
-            elif call_count[0] == 2:
-                return [mock_pending_payout]
-            else:
-                return [mock_sent_payout]
-
-        mock_session.exec = mock_exec
+        order_totals = MagicMock()
+        order_totals.one.return_value = (1, 1, Decimal("0.05"))
+        payout_totals = MagicMock()
+        payout_totals.one.return_value = (1, Decimal("0.5"), 1, Decimal("0.3"))
+        mock_session.exec = MagicMock(side_effect=[order_totals, payout_totals])
         mock_db.session = MagicMock(return_value=mock_session)
 
         # Mock the methods used internally
-        with patch.object(payout_service, 'get_platform_commission_rate', return_value=Decimal("0.05")):
-            with patch.object(payout_service, 'get_platform_wallet', return_value="wallet123"):
-                result = payout_service.get_platform_stats()
+        with patch.object(payout_service, 'get_platform_earnings', return_value={}):
+            with patch.object(payout_service, 'get_platform_commission_rate', return_value=Decimal("0.05")):
+                with patch.object(payout_service, 'get_platform_wallet', return_value="wallet123"):
+                    result = payout_service.get_platform_stats()
 
         assert result['total_orders'] == 1
         assert result['paid_orders'] == 1
+        assert result['total_commission_xmr'] == Decimal("0.05")
+        assert result['pending_payouts'] == 1
+        assert result['pending_payout_amount_xmr'] == Decimal("0.5")
+        assert result['completed_payouts'] == 1
+        assert result['completed_payout_amount_xmr'] == Decimal("0.3")
         assert result['commission_rate'] == Decimal("0.05")
-        assert result['platform_wallet'] == "wallet123"
+        assert result['platform_wallet_xmr'] == "wallet123"
+        assert mock_session.exec.call_count == 2
+
+    def test_get_platform_stats_aggregates_in_sql(self, tmp_path):
+        """Test platform statistics against a real database."""
+        db = Database(url=f"sqlite:///{tmp_path/'stats.db'}")
+        with db.session() as session:
+            for state, commission in (("NEW", "0.5"), ("PAID", "0.05"), ("COMPLETED", "0.02")):
+                session.add(Order(
+                    product_id=1, vendor_id=1, quantity=1, payment_id=state,
+                    address_encrypted="x", state=state, commission_xmr=Decimal(commission),
+                ))
+            for status, amount in (("PENDING", "0.5"), ("PENDING", "0.25"), ("SENT", "0.3"),
+                                   ("CONFIRMED", "0.1"), ("FAILED", "9")):
+                session.add(Payout(order_id=1, vendor_id=1, amount_xmr=Decimal(amount), status=status))
+            session.commit()
+
+        with patch('bot.services.payout.get_settings'):
+            service = PayoutService(db)
+        with patch.object(service, 'get_platform_wallet', return_value=""):
+            result = service.get_platform_stats()
+
+        assert result['total_orders'] == 3
+        assert result['paid_orders'] == 2
+        assert result['total_commission_xmr'] == Decimal("0.07")
+        assert result['pending_payouts'] == 2
+        assert result['pending_payout_amount_xmr'] == Decimal("0.75")
+        assert result['completed_payouts'] == 2
+        assert result['completed_payout_amount_xmr'] == Decimal("0.4")
+
+    def test_get_platform_earnings(self, tmp_path):
+        """Test commission earnings are summed per currency in SQL."""
+        db = Database(url=f"sqlite:///{tmp_path/'earnings.db'}")
+        with db.session() as session:
+            for state, currency, commission_crypto, commission_xmr in (
+                ("PAID", "XMR", "0", "0.05"),  # Legacy XMR order
+                ("COMPLETED", "XMR", "0.02", "0.02"),
+                ("SHIPPED", "BTC", "0.0001", "0"),
+                ("PAID", "ETH", "0.003", "0.9"),
+                ("NEW", "BTC", "1", "1"),  # Unpaid, not counted
+            ):
+                session.add(Order(
+                    product_id=1, vendor_id=1, quantity=1, payment_id=state,
+                    address_encrypted="x", state=state, payment_currency=currency,
+                    commission_crypto=Decimal(commission_crypto),
+                    commission_xmr=Decimal(commission_xmr),
+                ))
+            session.commit()
+
+        with patch('bot.services.payout.get_settings'):
+            service = PayoutService(db)
+
+        assert service.get_platform_earnings() == {
+            "XMR": Decimal("0.07"),
+            "BTC": Decimal("0.0001"),
+            "ETH": Decimal("0.003"),
+        }
+
+    def test_get_platform_stats_empty(self, tmp_path):
+        """Test platform statistics report zero totals with no data."""
+        db = Database(url=f"sqlite:///{tmp_path/'stats.db'}")
+        with patch('bot.services.payout.get_settings'):
+            service = PayoutService(db)
+        with patch.object(service, 'get_platform_wallet', return_value=""):
+            result = service.get_platform_stats()
+
+        assert result['total_orders'] == 0
+        assert result['total_commission_xmr'] == Decimal(0)
+        assert result['pending_payout_amount_xmr'] == Decimal(0)
+        assert result['completed_payout_amount_xmr'] == Decimal(0)
@@ -132,6 +132,28 @@ class TestPostageService:
         assert len(result) == 1
         mock_session.exec.assert_called_once()
 
+    def test_list_active_for_menu(self, tmp_path):
+        """Test the menu listing returns only active options and menu columns."""
+        from sqlalchemy import inspect
+
+        db = Database(url=f"sqlite:///{tmp_path/'test.db'}")
+        service = PostageService(db)
+        standard = service.add_postage_type(1, "Standard", Decimal("4.99"), description="3-5 days")
+        express = service.add_postage_type(1, "Express", Decimal("9.99"), currency="GBP")
+        service.toggle_active(express.id)
+        service.add_postage_type(2, "Other vendor", Decimal("1.00"))
+
+        rows = service.list_active_for_menu(1)
+
+        assert len(rows) == 1
+        row = rows[0]
+        assert (row.id, row.name, row.description) == (standard.id, "Standard", "3-5 days")
+        assert (row.price_fiat, row.currency, row.is_active) == (Decimal("4.99"), "USD", True)
+        assert "vendor_id" not in row._fields
+
+        indexes = {ix["name"]: ix["column_names"] for ix in inspect(db.engine).get_indexes("postagetype")}
+        assert indexes["ix_postage_vendor_active"] == ["vendor_id", "is_active"]
+
     def test_update_postage_type(self, postage_service, mock_db):
         """Test updating a postage type."""
         mock_postage = MagicMock(spec=PostageType)
@@ -154,6 +176,7 @@ class TestPostageService:
         mock_session.add.assert_called_once()
         mock_session.commit.assert_called_once()
         assert result == mock_postage
+        mock_session.refresh.assert_not_called()
 
     def test_update_postage_type_not_found(self, postage_service, mock_db):
         """Test updating a nonexistent postage type."""
@@ -6,8 +6,10 @@ from datetime import datetime, timedelta
 from decimal import Decimal
 from unittest.mock import MagicMock, patch, AsyncMock
 
+from sqlmodel import select
+
 from bot.tasks import cleanup_old_orders, start_background_tasks, check_pending_payments, process_vendor_payouts
-from bot.models import Database, Order, Product
+from bot.models import Database, Order, Payout, Product
 
 
 class TestTasks:
@@ -18,49 +20,71 @@ class TestTasks:
         """Create mock database."""
         return MagicMock(spec=Database)
 
+    @staticmethod
+    def _add_order(db, age_days, payout_status=None):
+        """Add an order created age_days ago, with an optional payout."""
+        with db.session() as session:
+            order = Order(
+                product_id=1, vendor_id=1, quantity=1, payment_id=f"pid{age_days}{payout_status}",
+                address_encrypted="enc", commission_xmr=Decimal("0"),
+                created_at=datetime.utcnow() - timedelta(days=age_days),
+            )
+            session.add(order)
+            session.commit()
+            if payout_status:
+                session.add(Payout(
+                    order_id=order.id, vendor_id=1, amount_xmr=Decimal("1"), status=payout_status
+                ))
+                session.commit()
+            return order.id
+
     @pytest.mark.asyncio
-    async def test_cleanup_old_orders_with_orders(self, mock_db):
-        """Test cleanup of old orders."""
-        # Create mock old orders
-        old_order1 = MagicMock(spec=Order)
-        old_order1.created_at = datetime.utcnow() - timedelta(days=40)
-        old_order2 = MagicMock(spec=Order)
-        old_order2.created_at = datetime.utcnow() - timedelta(days=35)
-
-        # Mock session and query
-        mock_session = MagicMock()
-        mock_session.__enter__ = MagicMock(return_value=mock_session)
-        mock_session.__exit__ = MagicMock(return_value=None)
-        mock_session.exec = MagicMock(return_value=MagicMock(all=MagicMock(return_value=[old_order1, old_order2])))
-        mock_session.commit = MagicMock()
-        mock_db.session = MagicMock(return_value=mock_session)
+    async def test_cleanup_old_orders_with_orders(self, tmp_path):
+        """Test cleanup deletes only orders older than the retention period."""
+        db = Database(url=f"sqlite:///{tmp_path/'test.db'}")
+        self._add_order(db, 40, "CONFIRMED")
+        self._add_order(db, 35)
+        recent = self._add_order(db, 1)
 
         with patch('bot.tasks.get_settings') as mock_settings:
             mock_settings.return_value.data_retention_days = 30
 
-            await cleanup_old_orders(mock_db)
+            await cleanup_old_orders(db)
+
+        with db.session() as session:
+            assert [o.id for o in session.exec(select(Order))] == [recent]
+            assert list(session.exec(select(Payout))) == []
+
+    @pytest.mark.asyncio
+    async def test_cleanup_old_orders_keeps_unsettled_payouts(self, tmp_path):
+        """Test cleanup keeps expired orders whose payouts are PENDING or FAILED."""
+        db = Database(url=f"sqlite:///{tmp_path/'test.db'}")
+        pending = self._add_order(db, 40, "PENDING")
+        failed = self._add_order(db, 40, "FAILED")
+        self._add_order(db, 40, "SENT")
+
+        with patch('bot.tasks.get_settings') as mock_settings:
+            mock_settings.return_value.data_retention_days = 30
 
-            # Verify orders were deleted
-            assert mock_session.exec.call_count == 2  # One for select, one for delete
-            mock_session.commit.assert_called_once()
+            await cleanup_old_orders(db)
+
+        with db.session() as session:
+            assert sorted(o.id for o in session.exec(select(Order))) == [pending, failed]
+            assert sorted(p.status for p in session.exec(select(Payout))) == ["FAILED", "PENDING"]
 
     @pytest.mark.asyncio
-    async def test_cleanup_old_orders_no_orders(self, mock_db):
+    async def test_cleanup_old_orders_no_orders(self, tmp_path):
         """Test cleanup when no old orders exist."""
-        # Mock session with no results
-        mock_session = MagicMock()
-        mock_session.__enter__ = MagicMock(return_value=mock_session)
-        mock_session.__exit__ = MagicMock(return_value=None)
-        mock_session.exec = MagicMock(return_value=MagicMock(all=MagicMock(return_value=[])))
-        mock_db.session = MagicMock(return_value=mock_session)
+        db = Database(url=f"sqlite:///{tmp_path/'test.db'}")
+        recent = self._add_order(db, 1)
 
         with patch('bot.tasks.get_settings') as mock_settings:
             mock_settings.return_value.data_retention_days = 30
 
-            await cleanup_old_orders(mock_db)
+            await cleanup_old_orders(db)
 
-            # Verify no delete was attempted
-            assert mock_session.exec.call_count == 1  # Only select query
+        with db.session() as session:
+            assert [o.id for o in session.exec(select(Order))] == [recent]
 
     @pytest.mark.asyncio
     async def test_cleanup_old_orders_error(self, mock_db):
@@ -298,6 +322,47 @@ class TestTasks:
                 # Should not raise, just continue
                 await check_pending_payments(mock_db)
 
+    @pytest.mark.asyncio
+    async def test_check_pending_payments_xmr_bulk(self, mock_db):
+        """Test XMR orders are checked with one bulk call against expected amounts."""
+        orders = []
+        for order_id, payment_id in ((1, "paid"), (2, "unpaid")):
+            order = MagicMock(spec=Order)
+            order.id = order_id
+            order.vendor_id = 1
+            order.payment_id = payment_id
+            order.payment_currency = "XMR"
+            order.payment_amount_crypto = Decimal("0.5")
+            order.commission_crypto = Decimal("0.05")
+            order.crypto_confirmations = 0
+            order.state = "NEW"
+            orders.append(order)
+
+        mock_session = MagicMock()
+        mock_session.__enter__ = MagicMock(return_value=mock_session)
+        mock_session.__exit__ = MagicMock(return_value=None)
+        mock_session.exec = MagicMock(return_value=orders)
+        mock_db.session = MagicMock(return_value=mock_session)
+
+        mock_payment = MagicMock()
+        mock_payment.check_paid_bulk.return_value = {"paid"}
+        mock_payment.get_confirmations.return_value = 10
+
+        with patch('bot.tasks.PaymentServiceFactory.create', return_value=mock_payment), \
+                patch('bot.tasks.PayoutService') as mock_payout_cls:
+            await check_pending_payments(mock_db)
+
+        mock_payment.check_paid_bulk.assert_called_once_with(
+            ["paid", "unpaid"],
+            expected_amounts={"paid": Decimal("0.5"), "unpaid": Decimal("0.5")}
+        )
+        mock_payment.check_paid.assert_not_called()
+        mock_payment.get_confirmations.assert_called_once_with("paid")
+        assert [order.state for order in orders] == ["PAID", "NEW"]
+        mock_payout_cls.return_value.create_payout.assert_called_once_with(
+            1, 1, Decimal("0.45"), currency="XMR"
+        )
+
     @pytest.mark.asyncio
     async def test_process_vendor_payouts_no_pending(self, mock_db):
         """Test payout processing with no pending payouts."""